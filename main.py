@@ -24,7 +24,7 @@ def cmd_web(host: str = "127.0.0.1", port: int = 5000):
     start_web(host=host, port=port, with_scheduler=True)
 
 
-def cmd_run_now(sources: list[str] = None):
+def cmd_run_now(sources: list[str] = None, workers: int = None):
     from src.pipeline.lead_pipeline import LeadPipeline
     keywords = [k.strip() for k in os.getenv("FINN_KEYWORDS", "seafood").split(",")]
     snov_list_id = os.getenv("SNOV_LIST_ID")
@@ -36,7 +36,7 @@ def cmd_run_now(sources: list[str] = None):
     print(f"\nRunning pipeline with sources: {', '.join(sources)}")
     print(f"Keywords: {', '.join(keywords)}\n")
 
-    pipeline = LeadPipeline(snov_list_id=snov_list_id, sources=sources)
+    pipeline = LeadPipeline(snov_list_id=snov_list_id, sources=sources, workers=workers)
     stats = pipeline.run(keywords)
     print("\n--- Run complete ---")
     for k, v in stats.items():
@@ -108,6 +108,7 @@ if __name__ == "__main__":
     parser.add_argument("--now", action="store_true", help="Run pipeline immediately")
     parser.add_argument("--status", action="store_true", help="Show status and account info")
     parser.add_argument("--sources", nargs="+", choices=["finn", "nav", "karrierestart", "jobbnorge"], help="Sources to scrape (default: finn nav)")
+    parser.add_argument("--workers", type=int, help="Postings processed in parallel with --now (default: PIPELINE_WORKERS or 4; 1 = one shared browser)")
     parser.add_argument("--host", default="127.0.0.1", help="Web server host (default: 127.0.0.1)")
     parser.add_argument("--port", type=int, default=5000, help="Web server port (default: 5000)")
     args = parser.parse_args()
@@ -115,7 +116,7 @@ if __name__ == "__main__":
     if args.status:
         cmd_status()
     elif args.now:
-        cmd_run_now(sources=args.sources)
+        cmd_run_now(sources=args.sources, workers=args.workers)
     elif args.cli:
         cmd_scheduler()
     else:
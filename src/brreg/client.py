@@ -173,6 +173,20 @@ class BRREGClient:
             logger.error("Error fetching company %s: %s", org_number, exc)
             return None
 
+    def search_companies_by_name(self, name: str, size: int = 1) -> list[dict]:
+        """
+        Search companies by name over this client's keep-alive session.
+
+        Args:
+            name: Company name (legal suffixes already stripped)
+            size: Max results
+
+        Returns:
+            List of company entities (empty if none matched)
+        """
+        result = self._get("/enheter", params={"navn": name, "size": size})
+        return result.get("_embedded", {}).get("enheter", [])
+
     def get_company_roles(self, org_number: str) -> list[dict]:
         """
         Get board members and management roles for a company.
@@ -3,258 +3,737 @@ Database module — SQLite for local dev, PostgreSQL-ready for VPS migration.
 Tracks all prospects, job postings, outreach status, email drafts, and pipeline runs.
 """
 
+import atexit
+import queue
 import sqlite3
 import logging
+import threading
+import time
+import weakref
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent.parent / "leads.db"
 
+# Read-only connections kept open for readers (see _ReaderPool)
+_READER_POOL_SIZE = 4
+# Seconds to wait for a pooled reader before opening a temporary one (a
+# streamed export holds its reader until the download finishes)
+_READER_WAIT_SECONDS = 2.0
+
+# Prepared statements kept per connection (sqlite3's default is 128). The
+# shared connections are long-lived, so hot inserts/updates are only
+# parsed and planned once.
+_STATEMENT_CACHE_SIZE = 256
+
+# Rows pulled per fetchmany() call when streaming large result sets
+_FETCH_SIZE = 500
+
+# COUNT(*) OVER () needs window function support (SQLite 3.25+)
+_HAS_WINDOW_FUNCTIONS = sqlite3.sqlite_version_info >= (3, 25, 0)
+
 
 def _now() -> str:
     return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
 
 
+def _days_ago(days: int) -> str:
+    """UTC date N days back as 'YYYY-MM-DD' (same value as SQLite's DATE('now', '-N days'))."""
+    return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+
+# Per-connection tuning. WAL + synchronous=NORMAL only fsyncs at checkpoints,
+# not on every commit; the rest trade a little memory for fewer page reads.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",  # 1 GiB
+    "PRAGMA cache_size=-65536",     # 64 MiB
+    "PRAGMA busy_timeout=5000",
+)
+
+# Database files already switched to WAL (journal_mode is stored in the file)
+_wal_enabled: set[str] = set()
+_wal_lock = threading.Lock()
+
+
+def _configure(conn: sqlite3.Connection, path: str, readonly: bool = False) -> None:
+    """Apply the per-connection PRAGMAs, and enable WAL once per database file."""
+    if not readonly and path != ":memory:" and path not in _wal_enabled:
+        with _wal_lock:
+            if path not in _wal_enabled:
+                conn.execute("PRAGMA journal_mode=WAL")
+                _wal_enabled.add(path)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
+class _ThreadConnection:
+    """Holder for a thread's standalone connection (weak-referenceable)."""
+
+    __slots__ = ("path", "conn", "__weakref__")
+
+    def __init__(self, path: str, conn: sqlite3.Connection):
+        self.path = path
+        self.conn = conn
+
+
+# Every live per-thread holder, so close_all_connections() can reach them.
+# Entries vanish when their thread exits and its threading.local is freed.
+_thread_connections: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+
+
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    """
+    Return this thread's standalone connection — for scripts and ad-hoc queries.
+
+    It is opened on first use and then reused (reopened if DB_PATH changes),
+    so PRAGMAs are applied once and the statement cache stays warm.
+    ``with get_connection() as conn:`` commits or rolls back without closing.
+    The helpers in this module use the shared writer / reader pool instead.
+    """
+    path = str(DB_PATH)
+    holder = getattr(_local, "standalone", None)
+    if holder is not None:
+        if holder.path == path:
+            try:
+                holder.conn.in_transaction  # raises once a caller has closed it
+                return holder.conn
+            except sqlite3.ProgrammingError:
+                pass
+        else:
+            holder.conn.close()
+        _thread_connections.discard(holder)
+
+    # check_same_thread=False only so close_all_connections() can close it
+    conn = sqlite3.connect(
+        path, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    _configure(conn, path)
+    holder = _ThreadConnection(path, conn)
+    _local.standalone = holder
+    _thread_connections.add(holder)
     return conn
 
 
-def _migrate(conn: sqlite3.Connection) -> None:
+def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    """Build result rows straight into dicts (no sqlite3.Row → dict copy)."""
+    return dict(zip([col[0] for col in cursor.description], row))
+
+
+def _scalar(conn: sqlite3.Connection, sql: str, params=()):
+    """Return the first column of the first row (or None), skipping the row factory."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    row = cur.execute(sql, params).fetchone()
+    return row[0] if row else None
+
+
+def _insert_id(conn: sqlite3.Connection, sql: str, params=()) -> Optional[int]:
+    """
+    Run an ``INSERT ... RETURNING id`` and return the new id, or None when
+    OR IGNORE skipped the row. The result is drained so the statement has
+    finished before the surrounding COMMIT.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    rows = cur.execute(sql, params).fetchall()
+    return rows[0][0] if rows else None
+
+
+# ------------------------------------------------------------------
+# Shared connections
+# ------------------------------------------------------------------
+# WAL only lets readers and a writer run side by side when they are on
+# separate connections. All writes go through one shared connection
+# (SQLite allows a single writer anyway); reads draw from a small pool of
+# read-only connections, so dashboard queries never wait on a pipeline write.
+
+class _WriterConnection:
+    """The process-wide write connection, serialised by a lock."""
+
+    def __init__(self, path: str):
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        self.conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        self.conn.row_factory = _dict_factory
+        _configure(self.conn, path)
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class _ReaderPool:
     """
-    Apply incremental migrations to existing databases.
-    Each ALTER TABLE is wrapped so it's safe to run multiple times.
+    Up to ``size`` read-only connections, opened on demand and reused. When
+    all are busy for longer than _READER_WAIT_SECONDS, a temporary one is
+    opened, and closed on release if the pool is already full.
     """
-    migrations = [
-        # v2: add source + external_id + org_number to job_postings
-        "ALTER TABLE job_postings ADD COLUMN source TEXT DEFAULT 'finn'",
-        "ALTER TABLE job_postings ADD COLUMN external_id TEXT",
-        "ALTER TABLE job_postings ADD COLUMN org_number TEXT",
-        # v2: back-fill external_id from finn_id where blank
-        "UPDATE job_postings SET external_id = finn_id WHERE external_id IS NULL AND finn_id IS NOT NULL",
-        # v3: ERA Group PDF extraction tables
-        "ALTER TABLE era_pdf_uploads ADD COLUMN status TEXT DEFAULT 'pending'",
-        "ALTER TABLE era_pdf_uploads ADD COLUMN error_message TEXT",
-    ]
-    for sql in migrations:
+
+    def __init__(self, path: str, size: int = _READER_POOL_SIZE):
+        self._path = path
+        self._uri = Path(path).resolve().as_uri() + "?mode=ro"
+        self._size = size
+        self._created = 0
+        self._lock = threading.Lock()
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+
+    def acquire(self) -> sqlite3.Connection:
         try:
-            conn.execute(sql)
-        except Exception:
-            pass  # column already exists or table doesn't have finn_id — skip
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self._size
+            if create:
+                self._created += 1
+        if create:
+            return self._open()
+        # Pool exhausted — wait briefly for another reader to finish. Long
+        # holders (streamed exports, or this thread's own open generator)
+        # must not stall every other read.
+        try:
+            return self._idle.get(timeout=_READER_WAIT_SECONDS)
+        except queue.Empty:
+            logger.debug("Reader pool busy, opening a temporary read connection")
+            return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._uri, uri=True, check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = _dict_factory
+        _configure(conn, self._path, readonly=True)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            # A temporary connection beyond the pool size
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_shared_lock = threading.Lock()
+_shared_path: Optional[str] = None
+_writer: Optional[_WriterConnection] = None
+_readers: Optional[_ReaderPool] = None
+
+
+def _shared() -> tuple[_WriterConnection, _ReaderPool]:
+    """Return the writer and reader pool for the current DB_PATH."""
+    global _shared_path, _writer, _readers
+    path = str(DB_PATH)
+    with _shared_lock:
+        if path != _shared_path:
+            # DB_PATH was repointed (tests) — drop connections to the old file
+            if _writer is not None:
+                _writer.close()
+                _readers.close()
+            # Writer first: it creates the file the read-only pool opens
+            _writer = _WriterConnection(path)
+            _readers = _ReaderPool(path)
+            _shared_path = path
+        return _writer, _readers
+
+
+# Thread-local marker for the transaction() block the current thread is in
+_local = threading.local()
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run a block on the shared writer inside BEGIN IMMEDIATE ... COMMIT.
+
+    Every write helper in this module goes through here, and calls made
+    while the current thread is already inside transaction() join it
+    instead of committing on their own — so callers can batch many inserts
+    into one commit:
+
+        with db.transaction():
+            for posting in postings:
+                db.insert_job_posting(posting)
+
+    Reads issued inside the block use the writer connection too, so they
+    see the block's own uncommitted rows. Taking the write lock up front
+    (IMMEDIATE) avoids SQLITE_BUSY on a read→write upgrade.
+    """
+    writer, _ = _shared()
+    if getattr(_local, "conn", None) is writer.conn:
+        # Nested — the outer block owns BEGIN/COMMIT
+        yield writer.conn
+        return
+
+    with writer.lock:
+        conn = writer.conn
+        conn.execute("BEGIN IMMEDIATE")
+        _local.conn = conn
+        try:
+            yield conn
+            conn.execute("COMMIT")
+            if getattr(_local, "keywords_dirty", False):
+                _clear_keyword_cache()
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            _local.conn = None
+            _local.keywords_dirty = False
+
+
+@contextmanager
+def _read() -> Iterator[sqlite3.Connection]:
+    """Borrow a read-only connection from the pool for the duration of the block."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        # Inside transaction() — read through the writer to see pending rows
+        yield conn
+        return
+
+    _, readers = _shared()
+    conn = readers.acquire()
+    try:
+        yield conn
+    finally:
+        readers.release(conn)
+
+
+def _iter_rows(sql: str, params=(), columns: Optional[list[str]] = None) -> Iterator:
+    """
+    Stream a query's rows in fetchmany() batches instead of fetchall().
+
+    Yields dicts by default. When ``columns`` is given, the query is wrapped
+    in ``SELECT <columns> FROM (...)`` and plain tuples are yielded in that
+    order, ready for ``csv.writer.writerows`` without building a dict per row.
+    The pooled reader is held until the generator is exhausted or closed.
+    """
+    if columns:
+        projection = ", ".join(f'"{c}"' for c in columns)
+        sql = f"SELECT {projection} FROM ({sql})"
+    with _read() as conn:
+        cur = conn.cursor()
+        if columns:
+            # Plain tuples for the CSV writer
+            cur.row_factory = None
+        cur.arraysize = _FETCH_SIZE
+        cur.execute(sql, params)
+        try:
+            while True:
+                rows = cur.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # Reset the statement before the connection goes back to the pool
+            cur.close()
+
+
+def _fetch_page(
+    conn: sqlite3.Connection,
+    select_sql: str,
+    count_sql: str,
+    params: list,
+    limit: int,
+    offset: int,
+) -> tuple[list[dict], int]:
+    """
+    Run a paginated SELECT and return (rows, total).
+
+    The total rides along with the page rows as a ``COUNT(*) OVER ()`` column,
+    so a listing costs one query instead of COUNT + SELECT. ``select_sql`` must
+    contain a ``{total}`` placeholder in its column list and end just before
+    ``LIMIT``. ``count_sql`` is only used on old SQLite builds or when the
+    requested page lies past the last row.
+    """
+    if not _HAS_WINDOW_FUNCTIONS:
+        total = _scalar(conn, count_sql, params)
+        rows = conn.execute(
+            select_sql.format(total="") + " LIMIT ? OFFSET ?", params + [limit, offset]
+        ).fetchall()
+        return rows, total
+
+    rows = conn.execute(
+        select_sql.format(total=", COUNT(*) OVER () AS _total") + " LIMIT ? OFFSET ?",
+        params + [limit, offset],
+    ).fetchall()
+    if not rows:
+        # An empty page says nothing about the total unless it is the first one
+        total = _scalar(conn, count_sql, params) if offset else 0
+        return [], total
+
+    for r in rows:
+        total = r.pop("_total")
+    return rows, total
+
+
+# Bump whenever _SCHEMA_SQL or _COLUMN_MIGRATIONS change so existing
+# databases pick the new DDL up on the next init_db().
+SCHEMA_VERSION = 8
+
+# (table, column, column definition) added after the table first shipped
+_COLUMN_MIGRATIONS = [
+    # v2: add source + external_id + org_number to job_postings
+    ("job_postings", "source", "TEXT DEFAULT 'finn'"),
+    ("job_postings", "external_id", "TEXT"),
+    ("job_postings", "org_number", "TEXT"),
+    # v3: ERA Group PDF extraction tables
+    ("era_pdf_uploads", "status", "TEXT DEFAULT 'pending'"),
+    ("era_pdf_uploads", "error_message", "TEXT"),
+    # v4: integer copy of scraped_at for range scans / newest-first ordering
+    ("job_postings", "scraped_at_epoch", "INTEGER"),
+    # v6: stored sort key so get_company_roles reads in index order
+    ("company_roles", "role_priority", "INTEGER DEFAULT 5"),
+    # v8: set once the pipeline has processed a posting (NULL = still to do)
+    ("job_postings", "processed_at", "TEXT"),
+]
+
+# Display order of BRREG role codes (daglig leder, chair, deputy, member);
+# anything else sorts last
+_ROLE_PRIORITIES = {"DAGL": 1, "LEDE": 2, "NEST": 3, "MEDL": 4}
+_DEFAULT_ROLE_PRIORITY = 5
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS job_postings (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        source          TEXT DEFAULT 'finn',
+        external_id     TEXT NOT NULL,
+        title           TEXT,
+        company_name    TEXT,
+        company_domain  TEXT,
+        org_number      TEXT,
+        location        TEXT,
+        url             TEXT,
+        keyword_matched TEXT,
+        published_at    TEXT,
+        scraped_at      TEXT NOT NULL,
+        scraped_at_epoch INTEGER,
+        processed_at    TEXT,
+        UNIQUE(source, external_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS prospects (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_posting_id  INTEGER REFERENCES job_postings(id),
+        first_name      TEXT,
+        last_name       TEXT,
+        full_name       TEXT,
+        email           TEXT UNIQUE,
+        email_status    TEXT,
+        position        TEXT,
+        company_name    TEXT,
+        company_domain  TEXT,
+        linkedin_url    TEXT,
+        snov_prospect_id TEXT,
+        snov_list_id    TEXT,
+        created_at      TEXT NOT NULL,
+        enriched_at     TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS outreach_log (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        prospect_id     INTEGER REFERENCES prospects(id),
+        campaign_id     TEXT,
+        status          TEXT,
+        sent_at         TEXT,
+        opened_at       TEXT,
+        replied_at      TEXT,
+        notes           TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS email_drafts (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        prospect_id     INTEGER NOT NULL REFERENCES prospects(id),
+        job_posting_id  INTEGER REFERENCES job_postings(id),
+        template_name   TEXT NOT NULL,
+        subject         TEXT NOT NULL,
+        body            TEXT NOT NULL,
+        status          TEXT NOT NULL DEFAULT 'draft',
+        created_at      TEXT NOT NULL,
+        approved_at     TEXT,
+        sent_at         TEXT,
+        opened_at       TEXT,
+        replied_at      TEXT,
+        notes           TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS pipeline_runs (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at      TEXT NOT NULL,
+        finished_at     TEXT,
+        status          TEXT NOT NULL DEFAULT 'running',
+        postings_scraped    INTEGER DEFAULT 0,
+        postings_new        INTEGER DEFAULT 0,
+        domains_resolved    INTEGER DEFAULT 0,
+        prospects_found     INTEGER DEFAULT 0,
+        emails_found        INTEGER DEFAULT 0,
+        emails_verified     INTEGER DEFAULT 0,
+        prospects_added     INTEGER DEFAULT 0,
+        drafts_created      INTEGER DEFAULT 0,
+        csv_path            TEXT,
+        errors              INTEGER DEFAULT 0,
+        error_message       TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS companies (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        org_number      TEXT UNIQUE NOT NULL,
+        name            TEXT NOT NULL,
+        website         TEXT,
+        address         TEXT,
+        postal_code     TEXT,
+        city            TEXT,
+        employee_count  INTEGER,
+        nace_code       TEXT,
+        nace_description TEXT,
+        legal_form      TEXT,
+        source          TEXT DEFAULT 'brreg',
+        created_at      TEXT NOT NULL,
+        updated_at      TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS company_roles (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id      INTEGER REFERENCES companies(id),
+        org_number      TEXT NOT NULL,
+        person_name     TEXT NOT NULL,
+        role_code       TEXT NOT NULL,
+        role_description TEXT,
+        birth_date      TEXT,
+        created_at      TEXT NOT NULL,
+        role_priority   INTEGER DEFAULT 5,
+        UNIQUE(org_number, person_name, role_code)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_prospects_email
+        ON prospects(email);
+    CREATE INDEX IF NOT EXISTS idx_job_postings_external_id
+        ON job_postings(external_id);
+    CREATE INDEX IF NOT EXISTS idx_job_postings_source
+        ON job_postings(source);
+    CREATE INDEX IF NOT EXISTS idx_job_postings_org_number
+        ON job_postings(org_number);
+    CREATE INDEX IF NOT EXISTS idx_job_postings_company
+        ON job_postings(company_name);
+    CREATE INDEX IF NOT EXISTS idx_job_postings_unprocessed
+        ON job_postings(id) WHERE processed_at IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_email_drafts_prospect
+        ON email_drafts(prospect_id);
+    CREATE INDEX IF NOT EXISTS idx_email_drafts_status
+        ON email_drafts(status);
+    CREATE INDEX IF NOT EXISTS idx_email_drafts_job_posting
+        ON email_drafts(job_posting_id);
+    CREATE INDEX IF NOT EXISTS idx_companies_org_number
+        ON companies(org_number);
+    -- Superseded by the (nace_code, employee_count) index below
+    DROP INDEX IF EXISTS idx_companies_nace;
+    CREATE INDEX IF NOT EXISTS idx_companies_nace_employees
+        ON companies(nace_code, employee_count DESC);
+    -- Case-insensitive exact name lookups (get_org_numbers_by_names)
+    CREATE INDEX IF NOT EXISTS idx_companies_name_lower
+        ON companies(LOWER(name));
+    -- Superseded by the (org_number, role_priority) index below
+    DROP INDEX IF EXISTS idx_company_roles_org;
+    CREATE INDEX IF NOT EXISTS idx_company_roles_org_priority
+        ON company_roles(org_number, role_priority);
+    CREATE INDEX IF NOT EXISTS idx_company_roles_company
+        ON company_roles(company_id);
+
+    -- Filter + sort indexes for the paginated listings, so a filtered page
+    -- is read in index order instead of being sorted after the scan
+    CREATE INDEX IF NOT EXISTS idx_job_postings_kw_scraped
+        ON job_postings(keyword_matched, scraped_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_prospects_status_created
+        ON prospects(email_status, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_email_drafts_status_created
+        ON email_drafts(status, created_at DESC);
+
+    -- Day-bucket expression indexes for the dashboard charts; must match
+    -- the substr() used in get_postings_by_day / get_prospects_by_day
+    CREATE INDEX IF NOT EXISTS idx_job_postings_scraped_day
+        ON job_postings(substr(scraped_at, 1, 10));
+    CREATE INDEX IF NOT EXISTS idx_prospects_created_day
+        ON prospects(substr(created_at, 1, 10));
+    CREATE INDEX IF NOT EXISTS idx_job_postings_scraped_epoch
+        ON job_postings(scraped_at_epoch DESC);
+
+    CREATE TABLE IF NOT EXISTS keywords (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword     TEXT UNIQUE NOT NULL,
+        active      INTEGER DEFAULT 1,
+        created_at  TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS era_pdf_uploads (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename        TEXT NOT NULL,
+        file_size       INTEGER,
+        upload_date     TEXT NOT NULL,
+        status          TEXT DEFAULT 'pending',
+        error_message   TEXT,
+        processing_time INTEGER,
+        UNIQUE(filename, upload_date)
+    );
+
+    CREATE TABLE IF NOT EXISTS era_extractions (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        pdf_id          INTEGER NOT NULL REFERENCES era_pdf_uploads(id),
+        extraction_type TEXT NOT NULL,
+        extracted_data  TEXT NOT NULL,
+        confidence_score REAL DEFAULT 0.0,
+        extraction_date TEXT NOT NULL,
+        page_number     INTEGER,
+        field_count     INTEGER DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS era_extraction_templates (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        template_name   TEXT UNIQUE NOT NULL,
+        pattern_type    TEXT NOT NULL,
+        field_mapping   TEXT,
+        created_date    TEXT NOT NULL,
+        updated_date    TEXT,
+        active          INTEGER DEFAULT 1
+    );
+
+    CREATE TABLE IF NOT EXISTS era_corrections (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        extraction_id   INTEGER NOT NULL REFERENCES era_extractions(id),
+        field_name      TEXT NOT NULL,
+        original_value  TEXT,
+        corrected_value TEXT NOT NULL,
+        correction_date TEXT NOT NULL,
+        used_for_training INTEGER DEFAULT 0
+    );
+
+    -- Superseded by the (status, upload_date) index below
+    DROP INDEX IF EXISTS idx_era_uploads_status;
+    CREATE INDEX IF NOT EXISTS idx_era_uploads_status_date
+        ON era_pdf_uploads(status, upload_date DESC);
+    CREATE INDEX IF NOT EXISTS idx_era_extractions_date
+        ON era_extractions(extraction_date DESC);
+    CREATE INDEX IF NOT EXISTS idx_era_extractions_pdf
+        ON era_extractions(pdf_id);
+    CREATE INDEX IF NOT EXISTS idx_era_extractions_type
+        ON era_extractions(extraction_type);
+    CREATE INDEX IF NOT EXISTS idx_era_corrections_extraction
+        ON era_corrections(extraction_id);
+
+    CREATE TABLE IF NOT EXISTS website_cache (
+        domain      TEXT UNIQUE NOT NULL,
+        contacts_json TEXT NOT NULL,
+        cached_at   TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_website_cache_domain
+        ON website_cache(domain);
+"""
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    """Return the column names of a table (empty if the table doesn't exist)."""
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _migrate(conn: sqlite3.Connection) -> list[str]:
+    """
+    Return the statements needed to bring an existing database up to date.
+    Columns are probed first, so only missing ones are added — no
+    ALTER TABLE is attempted (and rolled back) on an up-to-date schema.
+    """
+    statements = []
+    columns: dict[str, set[str]] = {}
+    for table, column, definition in _COLUMN_MIGRATIONS:
+        if table not in columns:
+            columns[table] = _table_columns(conn, table)
+        # Fresh databases get the column from CREATE TABLE instead
+        if columns[table] and column not in columns[table]:
+            statements.append(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    # v2: back-fill external_id from finn_id where blank
+    if "finn_id" in columns.get("job_postings", set()):
+        statements.append(
+            "UPDATE job_postings SET external_id = finn_id "
+            "WHERE external_id IS NULL AND finn_id IS NOT NULL"
+        )
+    # v4: back-fill scraped_at_epoch for rows stored before the column existed
+    if columns.get("job_postings") and "scraped_at_epoch" not in columns["job_postings"]:
+        statements.append(
+            "UPDATE job_postings SET scraped_at_epoch = CAST(strftime('%s', scraped_at) AS INTEGER)"
+        )
+    # v6: back-fill role_priority from role_code
+    if columns.get("company_roles") and "role_priority" not in columns["company_roles"]:
+        cases = " ".join(f"WHEN '{code}' THEN {prio}" for code, prio in _ROLE_PRIORITIES.items())
+        statements.append(
+            f"UPDATE company_roles SET role_priority = "
+            f"CASE role_code {cases} ELSE {_DEFAULT_ROLE_PRIORITY} END"
+        )
+    # v8: postings stored before the column existed were processed then
+    if columns.get("job_postings") and "processed_at" not in columns["job_postings"]:
+        statements.append("UPDATE job_postings SET processed_at = scraped_at")
+    return statements
 
 
 def init_db() -> None:
-    """Create all tables if they don't exist."""
-    with get_connection() as conn:
+    """
+    Create all tables if they don't exist.
+
+    A no-op when PRAGMA user_version already matches SCHEMA_VERSION; otherwise
+    migrations, DDL and the version bump are applied in a single transaction.
+    """
+    writer, _ = _shared()
+    with writer.lock:
+        conn = writer.conn
+        if _scalar(conn, "PRAGMA user_version") == SCHEMA_VERSION:
+            return
+
         # Run schema migrations first so new indexes don't fail
-        _migrate(conn)
-
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS job_postings (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                source          TEXT DEFAULT 'finn',
-                external_id     TEXT NOT NULL,
-                title           TEXT,
-                company_name    TEXT,
-                company_domain  TEXT,
-                org_number      TEXT,
-                location        TEXT,
-                url             TEXT,
-                keyword_matched TEXT,
-                published_at    TEXT,
-                scraped_at      TEXT NOT NULL,
-                UNIQUE(source, external_id)
-            );
-
-            CREATE TABLE IF NOT EXISTS prospects (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_posting_id  INTEGER REFERENCES job_postings(id),
-                first_name      TEXT,
-                last_name       TEXT,
-                full_name       TEXT,
-                email           TEXT UNIQUE,
-                email_status    TEXT,
-                position        TEXT,
-                company_name    TEXT,
-                company_domain  TEXT,
-                linkedin_url    TEXT,
-                snov_prospect_id TEXT,
-                snov_list_id    TEXT,
-                created_at      TEXT NOT NULL,
-                enriched_at     TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS outreach_log (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                prospect_id     INTEGER REFERENCES prospects(id),
-                campaign_id     TEXT,
-                status          TEXT,
-                sent_at         TEXT,
-                opened_at       TEXT,
-                replied_at      TEXT,
-                notes           TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS email_drafts (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                prospect_id     INTEGER NOT NULL REFERENCES prospects(id),
-                job_posting_id  INTEGER REFERENCES job_postings(id),
-                template_name   TEXT NOT NULL,
-                subject         TEXT NOT NULL,
-                body            TEXT NOT NULL,
-                status          TEXT NOT NULL DEFAULT 'draft',
-                created_at      TEXT NOT NULL,
-                approved_at     TEXT,
-                sent_at         TEXT,
-                opened_at       TEXT,
-                replied_at      TEXT,
-                notes           TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS pipeline_runs (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                started_at      TEXT NOT NULL,
-                finished_at     TEXT,
-                status          TEXT NOT NULL DEFAULT 'running',
-                postings_scraped    INTEGER DEFAULT 0,
-                postings_new        INTEGER DEFAULT 0,
-                domains_resolved    INTEGER DEFAULT 0,
-                prospects_found     INTEGER DEFAULT 0,
-                emails_found        INTEGER DEFAULT 0,
-                emails_verified     INTEGER DEFAULT 0,
-                prospects_added     INTEGER DEFAULT 0,
-                drafts_created      INTEGER DEFAULT 0,
-                csv_path            TEXT,
-                errors              INTEGER DEFAULT 0,
-                error_message       TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS companies (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                org_number      TEXT UNIQUE NOT NULL,
-                name            TEXT NOT NULL,
-                website         TEXT,
-                address         TEXT,
-                postal_code     TEXT,
-                city            TEXT,
-                employee_count  INTEGER,
-                nace_code       TEXT,
-                nace_description TEXT,
-                legal_form      TEXT,
-                source          TEXT DEFAULT 'brreg',
-                created_at      TEXT NOT NULL,
-                updated_at      TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS company_roles (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_id      INTEGER REFERENCES companies(id),
-                org_number      TEXT NOT NULL,
-                person_name     TEXT NOT NULL,
-                role_code       TEXT NOT NULL,
-                role_description TEXT,
-                birth_date      TEXT,
-                created_at      TEXT NOT NULL,
-                UNIQUE(org_number, person_name, role_code)
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_prospects_email
-                ON prospects(email);
-            CREATE INDEX IF NOT EXISTS idx_job_postings_external_id
-                ON job_postings(external_id);
-            CREATE INDEX IF NOT EXISTS idx_job_postings_source
-                ON job_postings(source);
-            CREATE INDEX IF NOT EXISTS idx_job_postings_org_number
-                ON job_postings(org_number);
-            CREATE INDEX IF NOT EXISTS idx_job_postings_company
-                ON job_postings(company_name);
-            CREATE INDEX IF NOT EXISTS idx_email_drafts_prospect
-                ON email_drafts(prospect_id);
-            CREATE INDEX IF NOT EXISTS idx_email_drafts_status
-                ON email_drafts(status);
-            CREATE INDEX IF NOT EXISTS idx_email_drafts_job_posting
-                ON email_drafts(job_posting_id);
-            CREATE INDEX IF NOT EXISTS idx_companies_org_number
-                ON companies(org_number);
-            CREATE INDEX IF NOT EXISTS idx_companies_nace
-                ON companies(nace_code);
-            CREATE INDEX IF NOT EXISTS idx_company_roles_org
-                ON company_roles(org_number);
-            CREATE INDEX IF NOT EXISTS idx_company_roles_company
-                ON company_roles(company_id);
-
-            CREATE TABLE IF NOT EXISTS keywords (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword     TEXT UNIQUE NOT NULL,
-                active      INTEGER DEFAULT 1,
-                created_at  TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS era_pdf_uploads (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                filename        TEXT NOT NULL,
-                file_size       INTEGER,
-                upload_date     TEXT NOT NULL,
-                status          TEXT DEFAULT 'pending',
-                error_message   TEXT,
-                processing_time INTEGER,
-                UNIQUE(filename, upload_date)
-            );
-
-            CREATE TABLE IF NOT EXISTS era_extractions (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                pdf_id          INTEGER NOT NULL REFERENCES era_pdf_uploads(id),
-                extraction_type TEXT NOT NULL,
-                extracted_data  TEXT NOT NULL,
-                confidence_score REAL DEFAULT 0.0,
-                extraction_date TEXT NOT NULL,
-                page_number     INTEGER,
-                field_count     INTEGER DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS era_extraction_templates (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                template_name   TEXT UNIQUE NOT NULL,
-                pattern_type    TEXT NOT NULL,
-                field_mapping   TEXT,
-                created_date    TEXT NOT NULL,
-                updated_date    TEXT,
-                active          INTEGER DEFAULT 1
-            );
-
-            CREATE TABLE IF NOT EXISTS era_corrections (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                extraction_id   INTEGER NOT NULL REFERENCES era_extractions(id),
-                field_name      TEXT NOT NULL,
-                original_value  TEXT,
-                corrected_value TEXT NOT NULL,
-                correction_date TEXT NOT NULL,
-                used_for_training INTEGER DEFAULT 0
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_era_uploads_status
-                ON era_pdf_uploads(status);
-            CREATE INDEX IF NOT EXISTS idx_era_extractions_pdf
-                ON era_extractions(pdf_id);
-            CREATE INDEX IF NOT EXISTS idx_era_extractions_type
-                ON era_extractions(extraction_type);
-            CREATE INDEX IF NOT EXISTS idx_era_corrections_extraction
-                ON era_corrections(extraction_id);
-
-            CREATE TABLE IF NOT EXISTS website_cache (
-                domain      TEXT UNIQUE NOT NULL,
-                contacts_json TEXT NOT NULL,
-                cached_at   TEXT NOT NULL
-            );
-            CREATE INDEX IF NOT EXISTS idx_website_cache_domain
-                ON website_cache(domain);
-        """)
-    logger.info("Database initialised at %s", DB_PATH)
+        migrations = "".join(f"{sql};\n" for sql in _migrate(conn))
+        try:
+            conn.executescript(
+                "BEGIN IMMEDIATE;\n"
+                + migrations
+                + _SCHEMA_SQL
+                # Fresh stats so the planner picks up any new indexes
+                + "ANALYZE;\n"
+                + f"PRAGMA user_version = {SCHEMA_VERSION};\n"
+                + "COMMIT;"
+            )
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    optimize()
+    logger.info("Database initialised at %s (schema v%d)", DB_PATH, SCHEMA_VERSION)
+
+
+def optimize() -> None:
+    """
+    Refresh the query planner's statistics via PRAGMA optimize.
+    Only tables whose stats are stale get re-analysed, so this is cheap to
+    call after bulk writes and before a long-running process exits.
+    """
+    with transaction() as conn:
+        conn.execute("PRAGMA optimize")
 
 
 # ------------------------------------------------------------------
@@ -280,10 +759,12 @@ def insert_job_posting(data: dict) -> Optional[int]:
     sql = """
         INSERT OR IGNORE INTO job_postings
             (source, external_id, title, company_name, company_domain, org_number,
-             location, url, keyword_matched, published_at, scraped_at)
+             location, url, keyword_matched, published_at, scraped_at, scraped_at_epoch)
         VALUES
             (:source, :external_id, :title, :company_name, :company_domain, :org_number,
-             :location, :url, :keyword_matched, :published_at, :scraped_at)
+             :location, :url, :keyword_matched, :published_at, :scraped_at,
+             CAST(strftime('%s', :scraped_at) AS INTEGER))
+        RETURNING id
     """
     data.setdefault("source", "finn")
     data.setdefault("org_number", None)
@@ -295,16 +776,15 @@ def insert_job_posting(data: dict) -> Optional[int]:
     data.setdefault("keyword_matched", None)
     data.setdefault("published_at", None)
     data.setdefault("scraped_at", _now())
-    with get_connection() as conn:
-        cur = conn.execute(sql, data)
-        if cur.lastrowid and cur.rowcount:
-            logger.debug(
-                "Inserted job posting source=%s external_id=%s",
-                data.get("source"),
-                data.get("external_id"),
-            )
-            return cur.lastrowid
-    return None
+    with transaction() as conn:
+        row_id = _insert_id(conn, sql, data)
+    if row_id:
+        logger.debug(
+            "Inserted job posting source=%s external_id=%s",
+            data.get("source"),
+            data.get("external_id"),
+        )
+    return row_id
 
 
 def get_job_postings(
@@ -326,42 +806,71 @@ def get_job_postings(
 
     where = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-    with get_connection() as conn:
-        total = conn.execute(
-            f"SELECT COUNT(*) FROM job_postings {where}", params
-        ).fetchone()[0]
-
-        rows = conn.execute(
-            f"SELECT * FROM job_postings {where} ORDER BY scraped_at DESC LIMIT ? OFFSET ?",
-            params + [limit, offset],
-        ).fetchall()
-
-    return [dict(r) for r in rows], total
+    with _read() as conn:
+        return _fetch_page(
+            conn,
+            f"SELECT *{{total}} FROM job_postings {where} ORDER BY scraped_at DESC",
+            f"SELECT COUNT(*) FROM job_postings {where}",
+            params,
+            limit,
+            offset,
+        )
 
 
 def get_all_keywords() -> list[str]:
-    with get_connection() as conn:
-        rows = conn.execute(
+    with _read() as conn:
+        cur = conn.execute(
             "SELECT DISTINCT keyword_matched FROM job_postings WHERE keyword_matched != '' ORDER BY keyword_matched"
-        ).fetchall()
-    return [r[0] for r in rows if r[0]]
+        )
+        return [r["keyword_matched"] for r in cur if r["keyword_matched"]]
+
+
+def iter_postings_for_export(columns: Optional[list[str]] = None) -> Iterator:
+    """Stream all job postings, newest first (see _iter_rows for ``columns``)."""
+    return _iter_rows("SELECT * FROM job_postings ORDER BY scraped_at DESC", columns=columns)
 
 
 def get_postings_for_export() -> list[dict]:
-    with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT * FROM job_postings ORDER BY scraped_at DESC"
+    return list(iter_postings_for_export())
+
+
+def update_posting_enrichment_many(updates: list[tuple]) -> None:
+    """Set company_domain and org_number from (company_domain, org_number, id) tuples, in one commit."""
+    if not updates:
+        return
+    with transaction() as conn:
+        conn.executemany(
+            "UPDATE job_postings SET company_domain = ?, org_number = ? WHERE id = ?",
+            updates,
+        )
+
+
+def mark_postings_processed(rows: list[tuple]) -> None:
+    """Set processed_at from (processed_at, id) tuples, in one commit."""
+    if not rows:
+        return
+    with transaction() as conn:
+        conn.executemany("UPDATE job_postings SET processed_at = ? WHERE id = ?", rows)
+
+
+def get_unprocessed_postings() -> list[dict]:
+    """
+    Postings stored but never processed (processed_at IS NULL), oldest
+    first — left behind when a pipeline run was interrupted.
+    """
+    with _read() as conn:
+        return conn.execute(
+            "SELECT * FROM job_postings WHERE processed_at IS NULL ORDER BY id"
         ).fetchall()
-    return [dict(r) for r in rows]
 
 
 def get_existing_external_ids(source: str) -> set:
     """Return set of external_id values already in DB for a given source."""
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(
             "SELECT external_id FROM job_postings WHERE source = ?", (source,)
         ).fetchall()
-    return {row[0] for row in rows if row[0]}
+    return {row["external_id"] for row in rows if row["external_id"]}
 
 
 # ------------------------------------------------------------------
@@ -381,38 +890,46 @@ def insert_prospect(data: dict) -> Optional[int]:
              :email, :email_status, :position, :company_name,
              :company_domain, :linkedin_url, :snov_prospect_id,
              :snov_list_id, :created_at)
+        RETURNING id
     """
     data.setdefault("created_at", _now())
-    with get_connection() as conn:
-        cur = conn.execute(sql, data)
-        if cur.lastrowid and cur.rowcount:
-            logger.debug("Inserted prospect email=%s", data.get("email"))
-            return cur.lastrowid
-    return None
+    with transaction() as conn:
+        row_id = _insert_id(conn, sql, data)
+    if row_id:
+        logger.debug("Inserted prospect email=%s", data.get("email"))
+    return row_id
 
 
 def email_exists(email: str) -> bool:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT 1 FROM prospects WHERE email = ?", (email,)
         ).fetchone()
         return row is not None
 
 
+def get_prospect_emails() -> set:
+    """Return the set of every prospect email, for bulk email_exists checks."""
+    with _read() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return {email for email, in cur.execute("SELECT email FROM prospects")}
+
+
 def get_prospect_by_email(email: str) -> Optional[dict]:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT * FROM prospects WHERE email = ?", (email,)
         ).fetchone()
-        return dict(row) if row else None
+        return row
 
 
 def get_prospect_by_id(prospect_id: int) -> Optional[dict]:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT * FROM prospects WHERE id = ?", (prospect_id,)
         ).fetchone()
-        return dict(row) if row else None
+        return row
 
 
 def get_prospects_filtered(
@@ -440,63 +957,80 @@ def get_prospects_filtered(
 
     where = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-    with get_connection() as conn:
-        total = conn.execute(
-            f"SELECT COUNT(*) FROM prospects {where}", params
-        ).fetchone()[0]
-
-        rows = conn.execute(
+    with _read() as conn:
+        return _fetch_page(
+            conn,
             f"""SELECT p.*, jp.title as job_title,
-                       jp.external_id as finn_id
+                       jp.external_id as finn_id{{total}}
                 FROM prospects p
                 LEFT JOIN job_postings jp ON p.job_posting_id = jp.id
                 {where.replace('full_name', 'p.full_name').replace('email LIKE', 'p.email LIKE').replace('company_name', 'p.company_name').replace('email_status', 'p.email_status').replace('position', 'p.position')}
-                ORDER BY p.created_at DESC LIMIT ? OFFSET ?""",
-            params + [limit, offset],
-        ).fetchall()
+                ORDER BY p.created_at DESC""",
+            f"SELECT COUNT(*) FROM prospects {where}",
+            params,
+            limit,
+            offset,
+        )
+
+
+_PROSPECT_EXPORT_SQL = """
+    SELECT
+        p.created_at as date,
+        p.company_name, p.company_domain,
+        p.full_name as contact_name, p.email,
+        p.position as title,
+        jp.title as job_posting_title,
+        jp.keyword_matched as keyword,
+        p.email_status,
+        COALESCE(
+            (SELECT ed.status FROM email_drafts ed
+             WHERE ed.prospect_id = p.id
+             ORDER BY ed.created_at DESC LIMIT 1),
+            'no_draft'
+        ) as outreach_status
+    FROM prospects p
+    LEFT JOIN job_postings jp ON p.job_posting_id = jp.id
+    ORDER BY p.created_at DESC
+"""
 
-    return [dict(r) for r in rows], total
+
+def iter_prospects_for_export(columns: Optional[list[str]] = None) -> Iterator:
+    """Stream all prospects joined with job postings (see _iter_rows for ``columns``)."""
+    return _iter_rows(_PROSPECT_EXPORT_SQL, columns=columns)
 
 
 def get_prospects_for_export() -> list[dict]:
     """Return all prospects joined with job postings for CSV export."""
-    with get_connection() as conn:
-        rows = conn.execute("""
-            SELECT
-                p.created_at as date,
-                p.company_name, p.company_domain,
-                p.full_name as contact_name, p.email,
-                p.position as title,
-                jp.title as job_posting_title,
-                jp.keyword_matched as keyword,
-                p.email_status,
-                COALESCE(
-                    (SELECT ed.status FROM email_drafts ed
-                     WHERE ed.prospect_id = p.id
-                     ORDER BY ed.created_at DESC LIMIT 1),
-                    'no_draft'
-                ) as outreach_status
-            FROM prospects p
-            LEFT JOIN job_postings jp ON p.job_posting_id = jp.id
-            ORDER BY p.created_at DESC
-        """).fetchall()
-    return [dict(r) for r in rows]
+    return list(iter_prospects_for_export())
 
 
 # ------------------------------------------------------------------
 # Outreach log
 # ------------------------------------------------------------------
 
+_SQL_INSERT_OUTREACH = """
+    INSERT INTO outreach_log
+        (prospect_id, campaign_id, status, sent_at, notes)
+    VALUES
+        (:prospect_id, :campaign_id, :status, :sent_at, :notes)
+"""
+
+
 def log_outreach(data: dict) -> None:
-    sql = """
-        INSERT INTO outreach_log
-            (prospect_id, campaign_id, status, sent_at, notes)
-        VALUES
-            (:prospect_id, :campaign_id, :status, :sent_at, :notes)
-    """
     data.setdefault("sent_at", _now())
-    with get_connection() as conn:
-        conn.execute(sql, data)
+    with transaction() as conn:
+        conn.execute(_SQL_INSERT_OUTREACH, data)
+
+
+def log_outreach_many(entries: list[dict]) -> None:
+    """log_outreach for a batch of entries: one executemany, one commit."""
+    if not entries:
+        return
+    now = _now()
+    for data in entries:
+        data.setdefault("sent_at", now)
+    with transaction() as conn:
+        conn.executemany(_SQL_INSERT_OUTREACH, entries)
 
 
 # ------------------------------------------------------------------
@@ -511,12 +1045,12 @@ def insert_email_draft(data: dict) -> Optional[int]:
         VALUES
             (:prospect_id, :job_posting_id, :template_name,
              :subject, :body, :status, :created_at)
+        RETURNING id
     """
     data.setdefault("status", "draft")
     data.setdefault("created_at", _now())
-    with get_connection() as conn:
-        cur = conn.execute(sql, data)
-        return cur.lastrowid if cur.lastrowid else None
+    with transaction() as conn:
+        return _insert_id(conn, sql, data)
 
 
 def get_email_drafts(
@@ -534,30 +1068,27 @@ def get_email_drafts(
 
     where = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-    with get_connection() as conn:
-        total = conn.execute(
-            f"SELECT COUNT(*) FROM email_drafts ed {where}", params
-        ).fetchone()[0]
-
-        rows = conn.execute(
+    with _read() as conn:
+        return _fetch_page(
+            conn,
             f"""SELECT ed.*,
                        p.full_name as prospect_name, p.email as prospect_email,
                        p.company_name, p.position as prospect_title,
-                       jp.title as job_title, jp.location as job_location
+                       jp.title as job_title, jp.location as job_location{{total}}
                 FROM email_drafts ed
                 JOIN prospects p ON ed.prospect_id = p.id
                 LEFT JOIN job_postings jp ON ed.job_posting_id = jp.id
                 {where}
-                ORDER BY ed.created_at DESC
-                LIMIT ? OFFSET ?""",
-            params + [limit, offset],
-        ).fetchall()
-
-    return [dict(r) for r in rows], total
+                ORDER BY ed.created_at DESC""",
+            f"SELECT COUNT(*) FROM email_drafts ed {where}",
+            params,
+            limit,
+            offset,
+        )
 
 
 def get_email_draft_by_id(draft_id: int) -> Optional[dict]:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             """SELECT ed.*,
                       p.full_name as prospect_name, p.email as prospect_email,
@@ -569,7 +1100,7 @@ def get_email_draft_by_id(draft_id: int) -> Optional[dict]:
                WHERE ed.id = ?""",
             (draft_id,),
         ).fetchone()
-        return dict(row) if row else None
+        return row
 
 
 def update_email_draft(draft_id: int, data: dict) -> None:
@@ -581,14 +1112,14 @@ def update_email_draft(draft_id: int, data: dict) -> None:
         params.append(val)
     params.append(draft_id)
 
-    with get_connection() as conn:
+    with transaction() as conn:
         conn.execute(
             f"UPDATE email_drafts SET {', '.join(sets)} WHERE id = ?", params
         )
 
 
 def draft_exists_for_prospect(prospect_id: int) -> bool:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT 1 FROM email_drafts WHERE prospect_id = ?", (prospect_id,)
         ).fetchone()
@@ -603,12 +1134,12 @@ def insert_pipeline_run(data: dict = None) -> int:
     data = data or {}
     data.setdefault("started_at", _now())
     data.setdefault("status", "running")
-    with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO pipeline_runs (started_at, status) VALUES (:started_at, :status)",
+    with transaction() as conn:
+        return _insert_id(
+            conn,
+            "INSERT INTO pipeline_runs (started_at, status) VALUES (:started_at, :status) RETURNING id",
             data,
         )
-        return cur.lastrowid
 
 
 def update_pipeline_run(run_id: int, data: dict) -> None:
@@ -618,23 +1149,109 @@ def update_pipeline_run(run_id: int, data: dict) -> None:
         sets.append(f"{key} = ?")
         params.append(val)
     params.append(run_id)
-    with get_connection() as conn:
+    with transaction() as conn:
         conn.execute(
             f"UPDATE pipeline_runs SET {', '.join(sets)} WHERE id = ?", params
         )
 
 
+@dataclass
+class PipelineRunStats:
+    """Final counters of a pipeline run, one field per pipeline_runs column."""
+    postings_scraped: int = 0
+    postings_new: int = 0
+    domains_resolved: int = 0
+    prospects_found: int = 0
+    emails_found: int = 0
+    emails_verified: int = 0
+    prospects_added: int = 0
+    drafts_created: int = 0
+    errors: int = 0
+
+
+def finish_pipeline_run(
+    run_id: int,
+    status: str,
+    stats: PipelineRunStats,
+    csv_path: str = None,
+    error_message: str = None,
+) -> None:
+    """
+    Write a run's final status and counters in a single UPDATE, then
+    checkpoint the WAL so it doesn't keep growing across long runs.
+    """
+    params = asdict(stats)
+    params.update(
+        id=run_id,
+        finished_at=_now(),
+        status=status,
+        csv_path=csv_path,
+        error_message=error_message,
+    )
+    with transaction() as conn:
+        conn.execute(
+            """UPDATE pipeline_runs SET
+                   finished_at = :finished_at,
+                   status = :status,
+                   postings_scraped = :postings_scraped,
+                   postings_new = :postings_new,
+                   domains_resolved = :domains_resolved,
+                   prospects_found = :prospects_found,
+                   emails_found = :emails_found,
+                   emails_verified = :emails_verified,
+                   prospects_added = :prospects_added,
+                   drafts_created = :drafts_created,
+                   errors = :errors,
+                   csv_path = COALESCE(:csv_path, csv_path),
+                   error_message = COALESCE(:error_message, error_message)
+               WHERE id = :id""",
+            params,
+        )
+    checkpoint()
+
+
+def checkpoint() -> None:
+    """Fold the WAL back into the database file and truncate it."""
+    writer, _ = _shared()
+    with writer.lock:
+        writer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def close_all_connections() -> None:
+    """
+    Run PRAGMA optimize and close every connection this module opened.
+    Registered with atexit; safe to call more than once.
+    """
+    global _shared_path, _writer, _readers
+    with _shared_lock:
+        if _writer is not None:
+            try:
+                with _writer.lock:
+                    _writer.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as exc:
+                logger.debug("PRAGMA optimize on close failed: %s", exc)
+            _writer.close()
+            _readers.close()
+        _shared_path = _writer = _readers = None
+    for holder in list(_thread_connections):
+        holder.conn.close()
+        _thread_connections.discard(holder)
+
+
+atexit.register(close_all_connections)
+
+
 def get_recent_pipeline_runs(limit: int = 10) -> list[dict]:
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(
             "SELECT * FROM pipeline_runs ORDER BY started_at DESC LIMIT ?", (limit,)
         ).fetchall()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_pipeline_run_trends(days: int = 30) -> list[dict]:
     """Return daily aggregated pipeline stats over last N days."""
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(
             """SELECT
                 DATE(started_at) as day,
@@ -648,7 +1265,7 @@ def get_pipeline_run_trends(days: int = 30) -> list[dict]:
             ORDER BY day""",
             (f"-{days} days",),
         ).fetchall()
-    return [dict(r) for r in rows]
+    return rows
 
 
 # ------------------------------------------------------------------
@@ -656,29 +1273,30 @@ def get_pipeline_run_trends(days: int = 30) -> list[dict]:
 # ------------------------------------------------------------------
 
 def get_dashboard_stats() -> dict:
-    with get_connection() as conn:
-        total_postings = conn.execute("SELECT COUNT(*) FROM job_postings").fetchone()[0]
-        total_prospects = conn.execute("SELECT COUNT(*) FROM prospects").fetchone()[0]
-        verified_emails = conn.execute(
-            "SELECT COUNT(*) FROM prospects WHERE email_status = 'valid'"
-        ).fetchone()[0]
-        total_drafts = conn.execute("SELECT COUNT(*) FROM email_drafts").fetchone()[0]
-        drafts_sent = conn.execute(
-            "SELECT COUNT(*) FROM email_drafts WHERE status = 'sent'"
-        ).fetchone()[0]
-        drafts_replied = conn.execute(
-            "SELECT COUNT(*) FROM email_drafts WHERE status = 'replied'"
-        ).fetchone()[0]
-
-        today = datetime.now(timezone.utc).replace(tzinfo=None).strftime("%Y-%m-%d")
-        new_postings_today = conn.execute(
-            "SELECT COUNT(*) FROM job_postings WHERE scraped_at LIKE ?",
-            (f"{today}%",),
-        ).fetchone()[0]
-        new_prospects_today = conn.execute(
-            "SELECT COUNT(*) FROM prospects WHERE created_at LIKE ?",
-            (f"{today}%",),
-        ).fetchone()[0]
+    with _read() as conn:
+        total_postings = _scalar(conn, "SELECT COUNT(*) FROM job_postings")
+        total_prospects = _scalar(conn, "SELECT COUNT(*) FROM prospects")
+        verified_emails = _scalar(
+            conn, "SELECT COUNT(*) FROM prospects WHERE email_status = 'valid'"
+        )
+        total_drafts = _scalar(conn, "SELECT COUNT(*) FROM email_drafts")
+        drafts_sent = _scalar(
+            conn, "SELECT COUNT(*) FROM email_drafts WHERE status = 'sent'"
+        )
+        drafts_replied = _scalar(
+            conn, "SELECT COUNT(*) FROM email_drafts WHERE status = 'replied'"
+        )
+
+        # Index range scans instead of LIKE over every timestamp string
+        midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        new_postings_today = _scalar(
+            conn, "SELECT COUNT(*) FROM job_postings WHERE scraped_at_epoch >= ?",
+            (int(midnight.timestamp()),),
+        )
+        new_prospects_today = _scalar(
+            conn, "SELECT COUNT(*) FROM prospects WHERE substr(created_at, 1, 10) = ?",
+            (midnight.date().isoformat(),),
+        )
 
     response_rate = (drafts_replied / drafts_sent * 100) if drafts_sent > 0 else 0.0
 
@@ -697,7 +1315,7 @@ def get_dashboard_stats() -> dict:
 
 def get_recent_activity(limit: int = 20) -> list[dict]:
     """Return recent activity across all tables, newest first."""
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(
             """
             SELECT * FROM (
@@ -705,7 +1323,7 @@ def get_recent_activity(limit: int = 20) -> list[dict]:
                        'Scraped: ' || title as description,
                        scraped_at as timestamp
                 FROM job_postings
-                ORDER BY scraped_at DESC LIMIT 10
+                ORDER BY scraped_at_epoch DESC LIMIT 10
             )
             UNION ALL
             SELECT * FROM (
@@ -727,43 +1345,45 @@ def get_recent_activity(limit: int = 20) -> list[dict]:
             """,
             (limit,),
         ).fetchall()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def get_postings_by_day(days: int = 30) -> list[dict]:
     """Daily count of postings over last N days."""
-    with get_connection() as conn:
-        rows = conn.execute(
-            """SELECT DATE(scraped_at) as day, COUNT(*) as count
+    # ISO timestamps start with YYYY-MM-DD, so substr() gives the day and
+    # is served straight from idx_job_postings_scraped_day
+    with _read() as conn:
+        cur = conn.execute(
+            """SELECT substr(scraped_at, 1, 10) as day, COUNT(*) as count
                FROM job_postings
-               WHERE scraped_at >= DATE('now', ?)
-               GROUP BY DATE(scraped_at)
+               WHERE substr(scraped_at, 1, 10) >= ?
+               GROUP BY substr(scraped_at, 1, 10)
                ORDER BY day""",
-            (f"-{days} days",),
-        ).fetchall()
-    return [dict(r) for r in rows]
+            (_days_ago(days),),
+        )
+        return cur.fetchall()
 
 
 def get_prospects_by_day(days: int = 30) -> list[dict]:
     """Daily count of prospects over last N days."""
-    with get_connection() as conn:
-        rows = conn.execute(
-            """SELECT DATE(created_at) as day, COUNT(*) as count
+    with _read() as conn:
+        cur = conn.execute(
+            """SELECT substr(created_at, 1, 10) as day, COUNT(*) as count
                FROM prospects
-               WHERE created_at >= DATE('now', ?)
-               GROUP BY DATE(created_at)
+               WHERE substr(created_at, 1, 10) >= ?
+               GROUP BY substr(created_at, 1, 10)
                ORDER BY day""",
-            (f"-{days} days",),
-        ).fetchall()
-    return [dict(r) for r in rows]
+            (_days_ago(days),),
+        )
+        return cur.fetchall()
 
 
 def get_job_posting_by_id(posting_id: int) -> Optional[dict]:
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT * FROM job_postings WHERE id = ?", (posting_id,)
         ).fetchone()
-        return dict(row) if row else None
+        return row
 
 
 # ------------------------------------------------------------------
@@ -791,36 +1411,81 @@ def insert_company(data: dict) -> Optional[int]:
             (:org_number, :name, :website, :address, :postal_code, :city,
              :employee_count, :nace_code, :nace_description, :legal_form,
              :source, :created_at, :updated_at)
+        RETURNING id
     """
     data.setdefault("source", "brreg")
     data.setdefault("created_at", _now())
     data.setdefault("updated_at", _now())
-    with get_connection() as conn:
-        cur = conn.execute(sql, data)
-        if cur.lastrowid and cur.rowcount:
-            logger.debug("Inserted company org=%s name=%s", data["org_number"], data["name"])
-            return cur.lastrowid
-    return None
+    with transaction() as conn:
+        row_id = _insert_id(conn, sql, data)
+    if row_id:
+        logger.debug("Inserted company org=%s name=%s", data["org_number"], data["name"])
+    return row_id
 
 
 def get_company_by_org_number(org_number: str) -> Optional[dict]:
     """Get company by organization number."""
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT * FROM companies WHERE org_number = ?", (org_number,)
         ).fetchone()
-        return dict(row) if row else None
+        return row
 
 
 def company_exists(org_number: str) -> bool:
     """Check if company already exists in database."""
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT 1 FROM companies WHERE org_number = ?", (org_number,)
         ).fetchone()
         return row is not None
 
 
+def get_company_org_numbers() -> dict[str, str]:
+    """Map every company name to its org_number (for fuzzy name matching)."""
+    with _read() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return dict(cur.execute("SELECT name, org_number FROM companies"))
+
+
+# Bound parameters per query, below SQLite's historical 999 limit
+_MAX_SQL_PARAMS = 900
+
+
+def get_org_numbers_by_names(names: Iterable[str]) -> dict[str, str]:
+    """
+    Map each of ``names`` that matches a company (case-insensitively, as
+    SQLite's LOWER() folds) to its org_number. One query per 900 names
+    instead of one per name; names without a match are left out.
+    """
+    names = list(dict.fromkeys(names))
+    found = {}
+    with _read() as conn:
+        for start in range(0, len(names), _MAX_SQL_PARAMS):
+            chunk = names[start:start + _MAX_SQL_PARAMS]
+            rows = conn.execute(
+                f"""WITH wanted(name) AS (VALUES {", ".join(["(?)"] * len(chunk))})
+                    SELECT wanted.name AS wanted, c.org_number, MIN(c.id)
+                    FROM wanted JOIN companies c ON LOWER(c.name) = LOWER(wanted.name)
+                    GROUP BY wanted.name""",
+                chunk,
+            ).fetchall()
+            found.update((row["wanted"], row["org_number"]) for row in rows)
+    return found
+
+
+_SQL_INSERT_ROLE = """
+    INSERT OR IGNORE INTO company_roles
+        (company_id, org_number, person_name, role_code,
+         role_description, birth_date, created_at, role_priority)
+    VALUES
+        (:company_id, :org_number, :person_name, :role_code,
+         :role_description, :birth_date, :created_at, :role_priority)
+    RETURNING id
+"""
+
+
 def insert_company_role(data: dict) -> Optional[int]:
     """
     Insert a company role (board member, CEO, etc.).
@@ -833,45 +1498,30 @@ def insert_company_role(data: dict) -> Optional[int]:
             - role_description
             - birth_date
     """
-    sql = """
-        INSERT OR IGNORE INTO company_roles
-            (company_id, org_number, person_name, role_code,
-             role_description, birth_date, created_at)
-        VALUES
-            (:company_id, :org_number, :person_name, :role_code,
-             :role_description, :birth_date, :created_at)
-    """
     data.setdefault("created_at", _now())
-    with get_connection() as conn:
-        cur = conn.execute(sql, data)
-        if cur.lastrowid and cur.rowcount:
-            logger.debug(
-                "Inserted role: %s as %s for org %s",
-                data["person_name"],
-                data["role_code"],
-                data.get("org_number", ""),
-            )
-            return cur.lastrowid
-    return None
+    data.setdefault("role_priority", _ROLE_PRIORITIES.get(data.get("role_code"), _DEFAULT_ROLE_PRIORITY))
+    with transaction() as conn:
+        row_id = _insert_id(conn, _SQL_INSERT_ROLE, data)
+    if row_id:
+        logger.debug(
+            "Inserted role: %s as %s for org %s",
+            data["person_name"],
+            data["role_code"],
+            data.get("org_number", ""),
+        )
+    return row_id
 
 
 def get_company_roles(org_number: str) -> list[dict]:
     """Get all roles (board members, management) for a company."""
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(
             """SELECT * FROM company_roles
                WHERE org_number = ?
-               ORDER BY
-                   CASE role_code
-                       WHEN 'DAGL' THEN 1
-                       WHEN 'LEDE' THEN 2
-                       WHEN 'NEST' THEN 3
-                       WHEN 'MEDL' THEN 4
-                       ELSE 5
-                   END""",
+               ORDER BY role_priority""",
             (org_number,),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return rows
 
 
 def get_companies_by_nace(nace_code: str, limit: int = 100) -> list[dict]:
@@ -879,15 +1529,17 @@ def get_companies_by_nace(nace_code: str, limit: int = 100) -> list[dict]:
     Get companies by NACE code (supports prefix matching).
     E.g. nace_code='03.2' will match 03.2, 03.21, 03.211, etc.
     """
-    with get_connection() as conn:
+    # GLOB is case-sensitive, so unlike LIKE the prefix match can be
+    # answered from idx_companies_nace_employees (NACE codes are digits/dots)
+    with _read() as conn:
         rows = conn.execute(
             """SELECT * FROM companies
-               WHERE nace_code LIKE ?
+               WHERE nace_code GLOB ?
                ORDER BY employee_count DESC
                LIMIT ?""",
-            (f"{nace_code}%", limit),
+            (f"{nace_code}*", limit),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return rows
 
 
 # ------------------------------------------------------------------
@@ -897,7 +1549,7 @@ def get_companies_by_nace(nace_code: str, limit: int = 100) -> list[dict]:
 def get_cached_contacts(domain: str, ttl_days: int = 7) -> Optional[list]:
     """Return cached contacts for domain, or None if expired/missing."""
     import json
-    with get_connection() as conn:
+    with _read() as conn:
         row = conn.execute(
             "SELECT contacts_json, cached_at FROM website_cache WHERE domain = ?",
             (domain,)
@@ -914,7 +1566,7 @@ def get_cached_contacts(domain: str, ttl_days: int = 7) -> Optional[list]:
 def cache_contacts(domain: str, contacts: list) -> None:
     """Store or update cached contacts for a domain."""
     import json
-    with get_connection() as conn:
+    with transaction() as conn:
         conn.execute(
             "INSERT OR REPLACE INTO website_cache (domain, contacts_json, cached_at) VALUES (?, ?, ?)",
             (domain, json.dumps(contacts), _now()),
@@ -927,7 +1579,7 @@ def cache_contacts(domain: str, contacts: list) -> None:
 
 def get_keywords(active_only: bool = True) -> list[dict]:
     """Return all keywords (or only active ones)."""
-    with get_connection() as conn:
+    with _read() as conn:
         if active_only:
             rows = conn.execute(
                 "SELECT * FROM keywords WHERE active = 1 ORDER BY keyword"
@@ -936,45 +1588,80 @@ def get_keywords(active_only: bool = True) -> list[dict]:
             rows = conn.execute(
                 "SELECT * FROM keywords ORDER BY keyword"
             ).fetchall()
-    return [dict(r) for r in rows]
+    return rows
+
+
+# Active keywords change rarely; cache them per database for a short TTL.
+# Keyword writers invalidate once their transaction commits, and the TTL
+# covers edits made by another process.
+_KEYWORD_CACHE_TTL = 60.0
+_keyword_cache: Optional[tuple[str, tuple[str, ...], float]] = None  # (db path, keywords, loaded at)
+_keyword_generation = 0
+_keyword_cache_lock = threading.Lock()
+
+
+def _clear_keyword_cache() -> None:
+    global _keyword_cache, _keyword_generation
+    with _keyword_cache_lock:
+        _keyword_cache = None
+        _keyword_generation += 1
+
+
+def _invalidate_keyword_cache() -> None:
+    """Drop the keyword cache now, or at COMMIT when called inside transaction()."""
+    if getattr(_local, "conn", None) is not None:
+        _local.keywords_dirty = True
+    else:
+        _clear_keyword_cache()
 
 
 def get_keyword_list() -> list[str]:
     """Return a plain list of active keyword strings."""
-    return [kw["keyword"] for kw in get_keywords(active_only=True)]
+    global _keyword_cache
+    if getattr(_local, "conn", None) is not None:
+        # Inside a transaction: may see uncommitted rows, so never cache
+        return [kw["keyword"] for kw in get_keywords(active_only=True)]
+
+    path = str(DB_PATH)
+    with _keyword_cache_lock:
+        cached = _keyword_cache
+        if cached and cached[0] == path and time.monotonic() - cached[2] < _KEYWORD_CACHE_TTL:
+            return list(cached[1])
+        generation = _keyword_generation
+    keywords = tuple(kw["keyword"] for kw in get_keywords(active_only=True))
+    with _keyword_cache_lock:
+        # Don't store a result that raced with a commit
+        if generation == _keyword_generation:
+            _keyword_cache = (path, keywords, time.monotonic())
+    return list(keywords)
+
+
+_SQL_UPSERT_KEYWORD = """
+    INSERT INTO keywords (keyword, active, created_at) VALUES (?, 1, ?)
+    ON CONFLICT(keyword) DO UPDATE SET active = 1
+    RETURNING id
+"""
 
 
 def add_keyword(keyword: str) -> Optional[int]:
-    """Add a new keyword. Returns id or None if it already exists."""
+    """Add a keyword, or re-activate it if it already exists. Returns its id."""
     keyword = keyword.strip().lower()
     if not keyword:
         return None
-    with get_connection() as conn:
-        # Re-activate if it exists but was deactivated
-        existing = conn.execute(
-            "SELECT id, active FROM keywords WHERE keyword = ?", (keyword,)
-        ).fetchone()
-        if existing:
-            if not existing["active"]:
-                conn.execute(
-                    "UPDATE keywords SET active = 1 WHERE id = ?", (existing["id"],)
-                )
-                logger.info("Re-activated keyword: %s", keyword)
-            return existing["id"]
-        cur = conn.execute(
-            "INSERT INTO keywords (keyword, active, created_at) VALUES (?, 1, ?)",
-            (keyword, _now()),
-        )
-        logger.info("Added keyword: %s", keyword)
-        return cur.lastrowid
+    with transaction() as conn:
+        keyword_id = _insert_id(conn, _SQL_UPSERT_KEYWORD, (keyword, _now()))
+        _invalidate_keyword_cache()
+    logger.info("Added keyword: %s", keyword)
+    return keyword_id
 
 
 def remove_keyword(keyword_id: int) -> bool:
     """Delete a keyword by id. Returns True if deleted."""
-    with get_connection() as conn:
+    with transaction() as conn:
         cur = conn.execute("DELETE FROM keywords WHERE id = ?", (keyword_id,))
         deleted = cur.rowcount > 0
         if deleted:
+            _invalidate_keyword_cache()
             logger.info("Removed keyword id=%d", keyword_id)
         return deleted
 
@@ -984,109 +1671,151 @@ def seed_keywords_from_env(env_keywords: list[str]) -> int:
     existing = get_keywords(active_only=False)
     if existing:
         return 0
-    count = 0
-    for kw in env_keywords:
-        kw = kw.strip()
-        if kw and add_keyword(kw):
-            count += 1
+    now = _now()
+    rows = [(kw.strip().lower(), now) for kw in env_keywords if kw.strip()]
+    with transaction() as conn:
+        cur = conn.executemany(
+            "INSERT OR IGNORE INTO keywords (keyword, active, created_at) VALUES (?, 1, ?)",
+            rows,
+        )
+        count = cur.rowcount
+    _invalidate_keyword_cache()
     logger.info("Seeded %d keywords from .env", count)
+    return count
 
 
 # ------------------------------------------------------------------
 # ERA Group PDF Extraction
 # ------------------------------------------------------------------
 
+_SQL_INSERT_PDF_UPLOAD = """
+    INSERT OR IGNORE INTO era_pdf_uploads (filename, file_size, upload_date, status)
+    VALUES (?, ?, ?, ?)
+    RETURNING id
+"""
+
+
 def insert_pdf_upload(filename: str, file_size: int, status: str = "pending") -> Optional[int]:
     """Insert a new PDF upload record. Returns upload_id or None if duplicate."""
-    sql = """
-        INSERT OR IGNORE INTO era_pdf_uploads (filename, file_size, upload_date, status)
-        VALUES (?, ?, ?, ?)
-    """
-    with get_connection() as conn:
-        cur = conn.execute(sql, (filename, file_size, _now(), status))
-        if cur.lastrowid and cur.rowcount:
-            logger.info("Inserted PDF upload: %s (size=%d bytes)", filename, file_size)
-            return cur.lastrowid
-    return None
+    with transaction() as conn:
+        upload_id = _insert_id(conn, _SQL_INSERT_PDF_UPLOAD, (filename, file_size, _now(), status))
+    if upload_id:
+        logger.info("Inserted PDF upload: %s (size=%d bytes)", filename, file_size)
+    return upload_id
+
+
+_SQL_UPDATE_PDF_STATUS = """
+    UPDATE era_pdf_uploads
+    SET status = ?, error_message = ?, processing_time = ?
+    WHERE id = ?
+"""
 
 
 def update_pdf_status(pdf_id: int, status: str, error_message: str = None, processing_time: int = None) -> bool:
     """Update PDF upload status. Returns True if updated."""
-    sql = """
-        UPDATE era_pdf_uploads
-        SET status = ?, error_message = ?, processing_time = ?
-        WHERE id = ?
-    """
-    with get_connection() as conn:
-        cur = conn.execute(sql, (status, error_message, processing_time, pdf_id))
+    with transaction() as conn:
+        cur = conn.execute(_SQL_UPDATE_PDF_STATUS, (status, error_message, processing_time, pdf_id))
         updated = cur.rowcount > 0
         if updated:
             logger.info("Updated PDF %d status to %s", pdf_id, status)
         return updated
 
 
+# extracted_data payloads above this many bytes are stored zlib-compressed,
+# as a BLOB prefixed with _COMPRESSED_MAGIC so readers can tell them apart
+_COMPRESS_MIN_BYTES = 2048
+_COMPRESSED_MAGIC = b"\x1f"
+
+
+def _maybe_compress(data: str):
+    """Return ``data`` unchanged, or as a compressed BLOB when it is large."""
+    raw = data.encode("utf-8")
+    if len(raw) <= _COMPRESS_MIN_BYTES:
+        return data
+    return _COMPRESSED_MAGIC + zlib.compress(raw)
+
+
+def _maybe_decompress(value):
+    """Inverse of _maybe_compress(); plain TEXT values pass through."""
+    if isinstance(value, bytes):
+        if value[:1] == _COMPRESSED_MAGIC:
+            value = zlib.decompress(value[1:])
+        return value.decode("utf-8")
+    return value
+
+
+_SQL_INSERT_EXTRACTION = """
+    INSERT INTO era_extractions (pdf_id, extraction_type, extracted_data, confidence_score, extraction_date, page_number, field_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+"""
+
+
 def insert_extraction(pdf_id: int, extraction_type: str, extracted_data: str, confidence_score: float = 0.0, page_number: int = None, field_count: int = 0) -> Optional[int]:
     """Insert extracted data. Returns extraction_id or None."""
-    sql = """
-        INSERT INTO era_extractions (pdf_id, extraction_type, extracted_data, confidence_score, extraction_date, page_number, field_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """
-    with get_connection() as conn:
-        cur = conn.execute(sql, (pdf_id, extraction_type, extracted_data, confidence_score, _now(), page_number, field_count))
-        if cur.lastrowid:
-            logger.info("Inserted extraction id=%d from PDF id=%d", cur.lastrowid, pdf_id)
-            return cur.lastrowid
-    return None
+    extracted_data = _maybe_compress(extracted_data)
+    with transaction() as conn:
+        extraction_id = _insert_id(conn, _SQL_INSERT_EXTRACTION, (pdf_id, extraction_type, extracted_data, confidence_score, _now(), page_number, field_count))
+    if extraction_id:
+        logger.info("Inserted extraction id=%d from PDF id=%d", extraction_id, pdf_id)
+    return extraction_id
 
 
 def get_era_dashboard_stats() -> dict:
     """Get ERA Group dashboard statistics."""
-    with get_connection() as conn:
-        # Count uploads by status
-        uploads = conn.execute("SELECT COUNT(*) as total FROM era_pdf_uploads").fetchone()
-        completed = conn.execute("SELECT COUNT(*) as total FROM era_pdf_uploads WHERE status = 'completed'").fetchone()
-        processing = conn.execute("SELECT COUNT(*) as total FROM era_pdf_uploads WHERE status = 'pending' OR status = 'processing'").fetchone()
-        failed = conn.execute("SELECT COUNT(*) as total FROM era_pdf_uploads WHERE status = 'error'").fetchone()
+    with _read() as conn:
+        # One pass over each table, aggregating all counters at once
+        uploads = conn.execute("""
+            SELECT COUNT(*) as total,
+                   COALESCE(SUM(status = 'completed'), 0) as completed,
+                   COALESCE(SUM(status IN ('pending', 'processing')), 0) as processing,
+                   COALESCE(SUM(status = 'error'), 0) as failed,
+                   AVG(processing_time) as avg_time
+            FROM era_pdf_uploads
+        """).fetchone()
+        extractions = conn.execute("""
+            SELECT COUNT(*) as total, AVG(confidence_score) as avg_confidence
+            FROM era_extractions
+        """).fetchone()
 
-        # Count extractions
-        extractions = conn.execute("SELECT COUNT(*) as total FROM era_extractions").fetchone()
+    return {
+        "total_uploads": uploads["total"],
+        "completed_uploads": uploads["completed"],
+        "processing_uploads": uploads["processing"],
+        "failed_uploads": uploads["failed"],
+        "total_extractions": extractions["total"],
+        "avg_confidence": round((extractions["avg_confidence"] or 0) * 100, 1),
+        "avg_processing_time": round(uploads["avg_time"] or 0, 1),
+    }
 
-        # Average confidence
-        avg_confidence = conn.execute("SELECT AVG(confidence_score) as avg FROM era_extractions").fetchone()
 
-        # Avg processing time
-        avg_time = conn.execute("SELECT AVG(processing_time) as avg FROM era_pdf_uploads WHERE processing_time IS NOT NULL").fetchone()
+_EXTRACTION_EXPORT_SQL = """
+    SELECT
+        ee.id,
+        eu.filename,
+        eu.upload_date,
+        ee.extraction_type,
+        ee.extracted_data,
+        ee.confidence_score,
+        ee.extraction_date,
+        ee.page_number,
+        ee.field_count
+    FROM era_extractions ee
+    LEFT JOIN era_pdf_uploads eu ON ee.pdf_id = eu.id
+    ORDER BY ee.extraction_date DESC
+"""
 
-    return {
-        "total_uploads": uploads[0] if uploads else 0,
-        "completed_uploads": completed[0] if completed else 0,
-        "processing_uploads": processing[0] if processing else 0,
-        "failed_uploads": failed[0] if failed else 0,
-        "total_extractions": extractions[0] if extractions else 0,
-        "avg_confidence": round((avg_confidence[0] or 0) * 100, 1),
-        "avg_processing_time": round(avg_time[0] or 0, 1),
-    }
+
+def iter_extractions_for_export() -> Iterator:
+    """Stream all extractions for CSV/Excel export, newest first."""
+    for row in _iter_rows(_EXTRACTION_EXPORT_SQL):
+        row["extracted_data"] = _maybe_decompress(row["extracted_data"])
+        yield row
 
 
 def get_all_extractions_for_export() -> list[dict]:
     """Get all extractions for CSV/Excel export."""
-    with get_connection() as conn:
-        rows = conn.execute("""
-            SELECT
-                ee.id,
-                eu.filename,
-                eu.upload_date,
-                ee.extraction_type,
-                ee.extracted_data,
-                ee.confidence_score,
-                ee.extraction_date,
-                ee.page_number,
-                ee.field_count
-            FROM era_extractions ee
-            LEFT JOIN era_pdf_uploads eu ON ee.pdf_id = eu.id
-            ORDER BY ee.extraction_date DESC
-        """).fetchall()
-    return [dict(row) for row in rows]
+    return list(iter_extractions_for_export())
 
 
 def get_pdf_uploads(status: str = None, limit: int = 50) -> list[dict]:
@@ -1099,21 +1828,22 @@ def get_pdf_uploads(status: str = None, limit: int = 50) -> list[dict]:
     query += " ORDER BY upload_date DESC LIMIT ?"
     params.append(limit)
 
-    with get_connection() as conn:
+    with _read() as conn:
         rows = conn.execute(query, params).fetchall()
-    return [dict(row) for row in rows]
+    return rows
+
+
+_SQL_LOG_CORRECTION = """
+    INSERT INTO era_corrections (extraction_id, field_name, original_value, corrected_value, correction_date)
+    VALUES (?, ?, ?, ?, ?)
+    RETURNING id
+"""
 
 
 def log_correction(extraction_id: int, field_name: str, original_value: str, corrected_value: str) -> Optional[int]:
     """Log a user correction for model training. Returns correction_id."""
-    sql = """
-        INSERT INTO era_corrections (extraction_id, field_name, original_value, corrected_value, correction_date)
-        VALUES (?, ?, ?, ?, ?)
-    """
-    with get_connection() as conn:
-        cur = conn.execute(sql, (extraction_id, field_name, original_value, corrected_value, _now()))
-        if cur.lastrowid:
-            logger.info("Logged correction for extraction %d field %s", extraction_id, field_name)
-            return cur.lastrowid
-    return None
-    return count
+    with transaction() as conn:
+        correction_id = _insert_id(conn, _SQL_LOG_CORRECTION, (extraction_id, field_name, original_value, corrected_value, _now()))
+    if correction_id:
+        logger.info("Logged correction for extraction %d field %s", extraction_id, field_name)
+    return correction_id
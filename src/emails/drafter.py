@@ -8,6 +8,7 @@ status='draft' and must be reviewed + approved before sending.
 
 import logging
 import os
+import re
 from typing import Optional
 
 from src.database import db
@@ -19,6 +20,26 @@ logger = logging.getLogger(__name__)
 # Default template to use for auto-drafting
 DEFAULT_TEMPLATE = "formal_outreach"
 
+# Position keywords, matched as plain substrings of the lowercased title
+_EXECUTIVE_KEYWORDS = (
+    "ceo", "cto", "cfo", "coo", "director", "direktoer",
+    "daglig leder", "adm.dir", "administrerende",
+    "managing", "partner", "founder", "grunder", "eier",
+)
+_HR_KEYWORDS = (
+    "hr", "human resources", "personal", "rekruttering",
+    "recruitment", "talent", "people",
+)
+# Both groups in one anchored match: the executive lookahead is tried first,
+# so "HR director" still gets the executive template. Group names are the
+# template names. Substring (not word) matching keeps Norwegian compounds
+# like "personalsjef" or "rekrutteringsansvarlig" working.
+_TEMPLATE_RE = re.compile(
+    "(?=.*?(?P<value_proposition>" + "|".join(map(re.escape, _EXECUTIVE_KEYWORDS)) + "))"
+    "|(?=.*?(?P<short_intro>" + "|".join(map(re.escape, _HR_KEYWORDS)) + "))",
+    re.DOTALL,
+)
+
 
 def auto_draft_for_new_prospect(
     prospect_id: int,
@@ -104,26 +125,8 @@ def _pick_template(prospect: dict) -> str:
     """
     position = (prospect.get("position") or "").lower()
 
-    # Decision-makers get the value proposition
-    executive_keywords = [
-        "ceo", "cto", "cfo", "coo", "director", "direktoer",
-        "daglig leder", "adm.dir", "administrerende",
-        "managing", "partner", "founder", "grunder", "eier",
-    ]
-    for kw in executive_keywords:
-        if kw in position:
-            return "value_proposition"
-
-    # HR / recruitment get the short intro
-    hr_keywords = [
-        "hr", "human resources", "personal", "rekruttering",
-        "recruitment", "talent", "people",
-    ]
-    for kw in hr_keywords:
-        if kw in position:
-            return "short_intro"
-
-    return DEFAULT_TEMPLATE
+    match = _TEMPLATE_RE.match(position)
+    return match.lastgroup if match else DEFAULT_TEMPLATE
 
 
 def regenerate_draft(
@@ -14,15 +14,20 @@ Features:
 """
 
 import logging
+import functools
 import json
+import multiprocessing
+import os
 import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Iterator, Optional
 
-import pdfplumber
-import pandas as pd
-from PIL import Image
+# pdfplumber (and pdfminer under it) is imported inside the functions that
+# open a PDF, so importing this module stays cheap for the web app
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +46,7 @@ def _get_ml_model():
             from transformers import AutoModelForTokenClassification, AutoProcessor
 
             _device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(f"Loading LayoutLM model on device: {_device}")
+            logger.info("Loading LayoutLM model on device: %s", _device)
 
             model_name = "microsoft/layoutlm-base"
             _processor = AutoProcessor.from_pretrained(model_name)
@@ -52,7 +57,7 @@ def _get_ml_model():
             logger.warning("PyTorch/Transformers not installed. Using fallback extraction.")
             return None
         except Exception as exc:
-            logger.error(f"Failed to load LayoutLM: {exc}. Using fallback extraction.")
+            logger.error("Failed to load LayoutLM: %s. Using fallback extraction.", exc)
             return None
     return _model
 
@@ -83,13 +88,141 @@ DATE_PATTERNS = [
     # Compact: 15Jan2025
     r"(\d{1,2}\s*\w{3}\s*\d{4})",
 ]
+# Compiled once; the raw strings above are still spliced into label patterns
+DATE_RES = [re.compile(p) for p in DATE_PATTERNS]
+
+# Amount labels, in priority order per field
+SUBTOTAL_LABELS = ("subtotal", "sub total", "netto", "net amount", "sum before tax", "grunnlag")
+TAX_AMOUNT_LABELS = ("tax", "vat", "mva", "gst", "sales tax", "merverdiavgift", "moms")
+TOTAL_AMOUNT_LABELS = ("total", "grand total", "amount due", "totalt", "sum", "balance due",
+                       "total amount", "invoice total", "å betale")
+AMOUNT_DUE_LABELS = ("amount due", "balance due", "å betale", "til betaling", "outstanding")
+SUMMARY_AMOUNT_LABELS = ("total", "net income", "balance", "sum", "totalt", "resultat")
+
+# Generic-document auto-detection
+GENERIC_AMOUNT_RE = re.compile(r"(?:[$€£]|kr\.?|NOK|USD|EUR)\s*[\d,.\s]+\d", re.IGNORECASE)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w.-]+\.\w{2,}")
+PHONE_RE = re.compile(r"(?:\+\d{1,3}[\s-]?)?\(?\d{2,4}\)?[\s.-]?\d{3,4}[\s.-]?\d{3,4}")
+URL_RE = re.compile(r"https?://[^\s<>\"']+|www\.[^\s<>\"']+")
+
+CURRENCY_CODES = ["NOK", "USD", "EUR", "GBP", "SEK", "DKK", "CHF"]
+_CURRENCY_SYMBOLS_LOWER = [(symbol.lower(), code) for symbol, code in CURRENCY_SYMBOLS.items()]
+# All codes in one alternation so the text is scanned once, not once per code
+CURRENCY_CODE_RE = re.compile(rf"\b({'|'.join(CURRENCY_CODES)})\b", re.IGNORECASE)
+_CURRENCY_CODE_KEYS = {code.casefold(): code for code in CURRENCY_CODES}
+
+
+# ==================================================================
+# Page reading
+# ==================================================================
+
+def _read_page(page, with_tables: bool = True) -> tuple[str, list]:
+    """
+    Extract text and (optionally) tables from a single pdfplumber page.
+
+    Both extractors work off the page's cached char/edge objects, so the
+    content stream is only parsed once per page. The cache is flushed
+    afterwards so long PDFs don't keep every page's layout in memory.
+    """
+    try:
+        text = page.extract_text() or ""
+        tables = (page.extract_tables() or []) if with_tables else []
+    finally:
+        page.close()
+    return text, tables
+
+
+def _table_rows(table: list) -> tuple[list, list]:
+    """
+    Turn a pdfplumber table (header row + data rows) into (headers, rows).
+
+    Rows are plain lists of cell strings aligned with ``headers`` rather
+    than one dict per row, which keeps large statements small in memory
+    and in the stored JSON. Blank headers become Col_<i>, the header row is
+    extended the same way for rows wider than it, and short rows are padded
+    with "" so every row has one cell per header.
+    """
+    headers = [str(h).strip() if h else f"Col_{i}" for i, h in enumerate(table[0])]
+    rows = [[str(cell).strip() if cell else "" for cell in row] for row in table[1:]]
+    width = max(len(headers), max((len(row) for row in rows), default=0))
+    headers.extend(f"Col_{i}" for i in range(len(headers), width))
+    for row in rows:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+    return headers, rows
+
+
+# Below this page count, worker start-up costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 3
+# Upper bounds on page workers and on the pages each worker reads per task
+MAX_PAGE_WORKERS = 8
+PAGE_BLOCK_SIZE = 10
+
+
+def _parse_page_block(pdf_path: str, first: int, last: int, with_tables: bool = True) -> list[tuple[str, list]]:
+    """Open the PDF in a worker process and read pages first..last (1-based, inclusive)."""
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return [_read_page(page, with_tables) for page in pdf.pages[first - 1:last]]
+
+
+def _read_pages(pdf_path: str, pdf, with_tables: bool = True) -> Iterator[tuple[str, list]]:
+    """
+    Yield (text, tables) for every page of an open PDF, in page order.
+    Pages are independent, so multi-page documents are parsed across CPU
+    cores; short ones are read serially from the already-open handle.
+    Each worker task covers a block of consecutive pages so the PDF is
+    opened once per block rather than once per page. Workers are spawned,
+    not forked: this runs on a thread of the multi-threaded web app, and a
+    forked child could inherit a lock (logging, sqlite) held by another thread.
+    """
+    page_count = len(pdf.pages)
+    workers = min(os.cpu_count() or 1, page_count, MAX_PAGE_WORKERS)
+    if page_count < PARALLEL_PAGE_THRESHOLD or workers < 2:
+        for page in pdf.pages:
+            yield _read_page(page, with_tables)
+        return
+
+    block = min(PAGE_BLOCK_SIZE, -(-page_count // workers))
+    firsts = range(1, page_count + 1, block)
+    lasts = [min(first + block - 1, page_count) for first in firsts]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for pages in executor.map(
+            _parse_page_block, repeat(str(pdf_path)), firsts, lasts, repeat(with_tables),
+        ):
+            yield from pages
+
+
+# Parsed documents kept in memory, so re-extracting an unchanged file is free
+PDF_CACHE_SIZE = 8
+
+
+def load_pdf_pages(pdf_path: str, with_tables: bool = True) -> tuple[tuple[str, list], ...]:
+    """
+    Read (text, tables) for every page of a PDF, reusing the last parse of
+    an unchanged file. Callers that read the text before extracting (e.g.
+    to pick a document type) can pass the result to the extract_*_ml
+    functions as ``pages`` so the file is only parsed once. The cache key
+    includes the file's mtime and size, so an edited or replaced file is
+    parsed again. Treat the returned tables as read-only; they are shared
+    between calls.
+    """
+    stat = os.stat(pdf_path)
+    return _load_pages_cached(os.fspath(pdf_path), stat.st_mtime_ns, stat.st_size, with_tables)
+
+
+@functools.lru_cache(maxsize=PDF_CACHE_SIZE)
+def _load_pages_cached(pdf_path: str, mtime_ns: int, size: int, with_tables: bool) -> tuple:
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return tuple(_read_pages(pdf_path, pdf, with_tables))
 
 
 # ==================================================================
 # INVOICE Extraction
 # ==================================================================
 
-def extract_invoice_data_ml(pdf_path: str, use_fine_tuned: bool = False) -> dict:
+def extract_invoice_data_ml(pdf_path: str, use_fine_tuned: bool = False, pages: tuple = None) -> dict:
     """
     Extract comprehensive invoice data including header fields and line items.
 
@@ -119,150 +252,144 @@ def extract_invoice_data_ml(pdf_path: str, use_fine_tuned: bool = False) -> dict
             "processing_time": float,
         }
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Gather text and tables from all pages
-            all_text = ""
-            all_tables = []
-            page_texts = []
-
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                all_text += text + "\n"
-                page_texts.append({"page": page_num, "text": text})
-
-                # Extract tables from each page
-                tables = page.extract_tables()
-                for t_idx, table in enumerate(tables):
-                    if table and len(table) > 1:
-                        all_tables.append({
-                            "page": page_num,
-                            "table_index": t_idx,
-                            "raw": table,
-                        })
-
-            if not all_text.strip():
-                return _error_result("No text could be extracted from this PDF", start_time)
-
-            # --- Extract header-level fields ---
-            fields = {}
-            field_confidences = {}
-
-            # Invoice Number
-            fields["invoice_number"], field_confidences["invoice_number"] = _extract_invoice_number(all_text)
-
-            # Dates
-            fields["invoice_date"], field_confidences["invoice_date"] = _extract_labeled_date(
-                all_text, ["invoice date", "fakturadato", "date", "dato", "issued", "invoice"]
-            )
-            fields["due_date"], field_confidences["due_date"] = _extract_labeled_date(
-                all_text, ["due date", "forfallsdato", "payment due", "due", "forfall", "betalingsfrist"]
-            )
-
-            # Vendor / Supplier
-            fields["vendor_name"], field_confidences["vendor_name"] = _extract_entity_name(
-                all_text, ["from", "vendor", "supplier", "seller", "fra", "leverandør", "selger"]
-            )
-            fields["vendor_address"], field_confidences["vendor_address"] = _extract_address(
-                all_text, "vendor"
-            )
-            fields["vendor_tax_id"], field_confidences["vendor_tax_id"] = _extract_tax_id(
-                all_text, ["org.nr", "org nr", "vat", "tax id", "ein", "gst", "mva"]
-            )
-
-            # Buyer / Customer
-            fields["buyer_name"], field_confidences["buyer_name"] = _extract_entity_name(
-                all_text, ["to", "bill to", "buyer", "customer", "client", "til", "kjøper", "kunde"]
-            )
-            fields["buyer_address"], field_confidences["buyer_address"] = _extract_address(
-                all_text, "buyer"
-            )
-            fields["buyer_tax_id"], field_confidences["buyer_tax_id"] = _extract_tax_id(
-                all_text, ["customer vat", "buyer tax", "kundens org"]
-            )
-
-            # Currency detection
-            fields["currency"], field_confidences["currency"] = _detect_currency(all_text)
-
-            # Amounts
-            fields["subtotal"], field_confidences["subtotal"] = _extract_labeled_amount(
-                all_text, ["subtotal", "sub total", "netto", "net amount", "sum before tax", "grunnlag"]
-            )
-            fields["tax_amount"], field_confidences["tax_amount"] = _extract_labeled_amount(
-                all_text, ["tax", "vat", "mva", "gst", "sales tax", "merverdiavgift", "moms"]
-            )
-            fields["tax_rate"], field_confidences["tax_rate"] = _extract_tax_rate(all_text)
-            fields["total_amount"], field_confidences["total_amount"] = _extract_labeled_amount(
-                all_text, ["total", "grand total", "amount due", "totalt", "sum", "balance due",
-                           "total amount", "invoice total", "å betale"]
-            )
-            fields["amount_due"], field_confidences["amount_due"] = _extract_labeled_amount(
-                all_text, ["amount due", "balance due", "å betale", "til betaling", "outstanding"]
-            )
-
-            # Payment terms & references
-            fields["payment_terms"], field_confidences["payment_terms"] = _extract_payment_terms(all_text)
-            fields["purchase_order"], field_confidences["purchase_order"] = _extract_labeled_value(
-                all_text, ["po number", "purchase order", "po#", "p.o.", "bestillingsnr", "innkjøpsordre"]
-            )
-            fields["reference"], field_confidences["reference"] = _extract_labeled_value(
-                all_text, ["reference", "ref", "referanse", "your ref", "vår ref", "our ref"]
-            )
-
-            # Bank / payment info
-            fields["bank_account"], field_confidences["bank_account"] = _extract_bank_info(all_text)
-
-            # --- Extract LINE ITEMS from tables ---
-            line_items = _extract_line_items(all_tables, all_text)
-            fields["line_items"] = line_items
-
-            # Store tables for export
-            parsed_tables = []
-            for t in all_tables:
-                raw = t["raw"]
-                if raw and len(raw) > 1:
-                    headers = [str(h).strip() if h else f"Col_{i}" for i, h in enumerate(raw[0])]
-                    rows = []
-                    for row in raw[1:]:
-                        row_dict = {}
-                        for i, cell in enumerate(row):
-                            key = headers[i] if i < len(headers) else f"Col_{i}"
-                            row_dict[key] = str(cell).strip() if cell else ""
-                        rows.append(row_dict)
-                    parsed_tables.append({
-                        "page": t["page"],
-                        "headers": headers,
-                        "rows": rows,
-                        "row_count": len(rows),
+        if pages is None:
+            pages = load_pdf_pages(pdf_path)
+        # Gather text and tables from all pages
+        text_parts = []
+        all_tables = []
+
+        for page_num, (text, tables) in enumerate(pages, 1):
+            text_parts.append(text)
+
+            # Keep tables with at least a header and one row
+            for t_idx, table in enumerate(tables):
+                if table and len(table) > 1:
+                    all_tables.append({
+                        "page": page_num,
+                        "table_index": t_idx,
+                        "raw": table,
                     })
-            fields["tables"] = parsed_tables
-            fields["pages_processed"] = len(pdf.pages)
-            fields["raw_text"] = all_text
-
-            # --- Calculate overall confidence ---
-            key_fields = ["invoice_number", "invoice_date", "vendor_name", "total_amount"]
-            overall_confidence = _calculate_weighted_confidence(field_confidences, key_fields)
-
-            # Warnings
-            warnings = _validate_invoice_fields(fields)
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-
-            return {
-                "success": True,
-                "data": fields,
-                "confidence": round(overall_confidence, 2),
-                "field_confidences": {k: round(v, 2) for k, v in field_confidences.items()},
-                "error": None,
-                "warnings": warnings,
-                "requires_review": overall_confidence < 0.60,
-                "processing_time": round(processing_time, 2),
-            }
+        all_text = "\n".join(text_parts) + "\n"
+
+        if not all_text.strip():
+            return _error_result("No text could be extracted from this PDF", start_time)
+
+        # --- Extract header-level fields ---
+        fields = {}
+        field_confidences = {}
+        # One scanner per document so every labeled field shares its label searches
+        scanner = LabelScanner(all_text)
+
+        # Invoice Number
+        fields["invoice_number"], field_confidences["invoice_number"] = _extract_invoice_number(all_text)
+
+        # Dates
+        fields["invoice_date"], field_confidences["invoice_date"] = _extract_labeled_date(
+            all_text, ["invoice date", "fakturadato", "date", "dato", "issued", "invoice"], scanner
+        )
+        fields["due_date"], field_confidences["due_date"] = _extract_labeled_date(
+            all_text, ["due date", "forfallsdato", "payment due", "due", "forfall", "betalingsfrist"],
+            scanner,
+        )
+
+        # Vendor / Supplier
+        fields["vendor_name"], field_confidences["vendor_name"] = _extract_entity_name(
+            all_text, ["from", "vendor", "supplier", "seller", "fra", "leverandør", "selger"], scanner
+        )
+        fields["vendor_address"], field_confidences["vendor_address"] = _extract_address(
+            all_text, "vendor"
+        )
+        fields["vendor_tax_id"], field_confidences["vendor_tax_id"] = _extract_tax_id(
+            all_text, ["org.nr", "org nr", "vat", "tax id", "ein", "gst", "mva"], scanner
+        )
+
+        # Buyer / Customer
+        fields["buyer_name"], field_confidences["buyer_name"] = _extract_entity_name(
+            all_text, ["to", "bill to", "buyer", "customer", "client", "til", "kjøper", "kunde"], scanner
+        )
+        fields["buyer_address"], field_confidences["buyer_address"] = _extract_address(
+            all_text, "buyer"
+        )
+        fields["buyer_tax_id"], field_confidences["buyer_tax_id"] = _extract_tax_id(
+            all_text, ["customer vat", "buyer tax", "kundens org"], scanner
+        )
+
+        # Currency detection
+        fields["currency"], field_confidences["currency"] = _detect_currency(all_text, scanner.lowered)
+
+        # Amounts
+        fields["subtotal"], field_confidences["subtotal"] = _extract_labeled_amount(
+            all_text, SUBTOTAL_LABELS, scanner
+        )
+        fields["tax_amount"], field_confidences["tax_amount"] = _extract_labeled_amount(
+            all_text, TAX_AMOUNT_LABELS, scanner
+        )
+        fields["tax_rate"], field_confidences["tax_rate"] = _extract_tax_rate(all_text)
+        fields["total_amount"], field_confidences["total_amount"] = _extract_labeled_amount(
+            all_text, TOTAL_AMOUNT_LABELS, scanner
+        )
+        fields["amount_due"], field_confidences["amount_due"] = _extract_labeled_amount(
+            all_text, AMOUNT_DUE_LABELS, scanner
+        )
+
+        # Payment terms & references
+        fields["payment_terms"], field_confidences["payment_terms"] = _extract_payment_terms(all_text)
+        fields["purchase_order"], field_confidences["purchase_order"] = _extract_labeled_value(
+            all_text, ["po number", "purchase order", "po#", "p.o.", "bestillingsnr", "innkjøpsordre"],
+            scanner,
+        )
+        fields["reference"], field_confidences["reference"] = _extract_labeled_value(
+            all_text, ["reference", "ref", "referanse", "your ref", "vår ref", "our ref"], scanner
+        )
+
+        # Bank / payment info
+        fields["bank_account"], field_confidences["bank_account"] = _extract_bank_info(all_text)
+
+        # --- Extract LINE ITEMS from tables ---
+        line_items = _extract_line_items(all_tables, all_text)
+        fields["line_items"] = line_items
+
+        # Store tables for export
+        parsed_tables = []
+        for t in all_tables:
+            raw = t["raw"]
+            if raw and len(raw) > 1:
+                headers, rows = _table_rows(raw)
+                parsed_tables.append({
+                    "page": t["page"],
+                    "headers": headers,
+                    "rows": rows,
+                    "row_count": len(rows),
+                })
+        fields["tables"] = parsed_tables
+        fields["pages_processed"] = len(pages)
+        fields["raw_text"] = all_text
+
+        # --- Calculate overall confidence ---
+        key_fields = ["invoice_number", "invoice_date", "vendor_name", "total_amount"]
+        overall_confidence = _calculate_weighted_confidence(field_confidences, key_fields)
+
+        # Warnings
+        warnings = _validate_invoice_fields(fields)
+
+        processing_time = time.perf_counter() - start_time
+
+        return {
+            "success": True,
+            "data": fields,
+            "confidence": round(overall_confidence, 2),
+            "field_confidences": {k: round(v, 2) for k, v in field_confidences.items()},
+            "error": None,
+            "warnings": warnings,
+            "requires_review": overall_confidence < 0.60,
+            "processing_time": round(processing_time, 2),
+        }
 
     except Exception as exc:
-        logger.error(f"Error extracting invoice from {pdf_path}: {exc}", exc_info=True)
+        logger.error("Error extracting invoice from %s: %s", pdf_path, exc, exc_info=True)
         return _error_result(str(exc), start_time)
 
 
@@ -270,82 +397,84 @@ def extract_invoice_data_ml(pdf_path: str, use_fine_tuned: bool = False) -> dict
 # CONTRACT Extraction
 # ==================================================================
 
-def extract_contract_data_ml(pdf_path: str) -> dict:
+def extract_contract_data_ml(pdf_path: str, pages: tuple = None) -> dict:
     """Extract contract key terms, parties, dates, and clauses."""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            all_text = ""
-            page_texts = []
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                all_text += text + "\n"
-                page_texts.append({"page": page_num, "text": text})
-
-            if not all_text.strip():
-                return _error_result("No text could be extracted", start_time)
-
-            fields = {}
-            field_confidences = {}
-
-            # Parties
-            fields["parties"], field_confidences["parties"] = _extract_contract_parties(all_text)
-
-            # Contract type
-            fields["contract_type"], field_confidences["contract_type"] = _detect_contract_type(all_text)
-
-            # Dates
-            fields["effective_date"], field_confidences["effective_date"] = _extract_labeled_date(
-                all_text, ["effective date", "commencement", "start date", "ikrafttredelse", "fra dato"]
-            )
-            fields["expiration_date"], field_confidences["expiration_date"] = _extract_labeled_date(
-                all_text, ["expiration", "termination", "end date", "expiry", "utløpsdato", "til dato"]
-            )
-            fields["signing_date"], field_confidences["signing_date"] = _extract_labeled_date(
-                all_text, ["signed", "executed", "dated", "signature date", "signert"]
-            )
-
-            # Key terms
-            fields["governing_law"], field_confidences["governing_law"] = _extract_labeled_value(
-                all_text, ["governing law", "jurisdiction", "applicable law", "lovvalg"]
-            )
-            fields["payment_terms"], field_confidences["payment_terms"] = _extract_payment_terms(all_text)
-            fields["termination_clause"], field_confidences["termination_clause"] = _extract_clause(
-                all_text, ["termination", "oppsigelse"]
-            )
-            fields["liability"], field_confidences["liability"] = _extract_clause(
-                all_text, ["liability", "ansvar", "indemnification"]
-            )
-            fields["confidentiality"], field_confidences["confidentiality"] = _extract_clause(
-                all_text, ["confidential", "konfidensialitet", "non-disclosure", "nda"]
-            )
-
-            # Amounts
-            fields["contract_value"], field_confidences["contract_value"] = _extract_labeled_amount(
-                all_text, ["total value", "contract value", "amount", "consideration", "price", "pris"]
-            )
-            fields["currency"], field_confidences["currency"] = _detect_currency(all_text)
-
-            fields["pages_processed"] = len(pdf.pages)
-
-            key_fields = ["parties", "effective_date", "contract_type"]
-            overall_confidence = _calculate_weighted_confidence(field_confidences, key_fields)
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-
-            return {
-                "success": True,
-                "data": fields,
-                "confidence": round(overall_confidence, 2),
-                "field_confidences": {k: round(v, 2) for k, v in field_confidences.items()},
-                "error": None,
-                "warnings": [],
-                "requires_review": overall_confidence < 0.60,
-                "processing_time": round(processing_time, 2),
-            }
+        if pages is None:
+            pages = load_pdf_pages(pdf_path, with_tables=False)
+        text_parts = [text for text, _ in pages]
+        all_text = "\n".join(text_parts) + "\n"
+
+        if not all_text.strip():
+            return _error_result("No text could be extracted", start_time)
+
+        fields = {}
+        field_confidences = {}
+
+        scanner = LabelScanner(all_text)
+
+        # Parties
+        fields["parties"], field_confidences["parties"] = _extract_contract_parties(all_text)
+
+        # Contract type
+        fields["contract_type"], field_confidences["contract_type"] = _detect_contract_type(all_text, scanner.lowered)
+
+        # Dates
+        fields["effective_date"], field_confidences["effective_date"] = _extract_labeled_date(
+            all_text, ["effective date", "commencement", "start date", "ikrafttredelse", "fra dato"],
+            scanner,
+        )
+        fields["expiration_date"], field_confidences["expiration_date"] = _extract_labeled_date(
+            all_text, ["expiration", "termination", "end date", "expiry", "utløpsdato", "til dato"],
+            scanner,
+        )
+        fields["signing_date"], field_confidences["signing_date"] = _extract_labeled_date(
+            all_text, ["signed", "executed", "dated", "signature date", "signert"], scanner
+        )
+
+        # Key terms
+        fields["governing_law"], field_confidences["governing_law"] = _extract_labeled_value(
+            all_text, ["governing law", "jurisdiction", "applicable law", "lovvalg"], scanner
+        )
+        fields["payment_terms"], field_confidences["payment_terms"] = _extract_payment_terms(all_text)
+        fields["termination_clause"], field_confidences["termination_clause"] = _extract_clause(
+            all_text, ["termination", "oppsigelse"], scanner
+        )
+        fields["liability"], field_confidences["liability"] = _extract_clause(
+            all_text, ["liability", "ansvar", "indemnification"], scanner
+        )
+        fields["confidentiality"], field_confidences["confidentiality"] = _extract_clause(
+            all_text, ["confidential", "konfidensialitet", "non-disclosure", "nda"], scanner
+        )
+
+        # Amounts
+        fields["contract_value"], field_confidences["contract_value"] = _extract_labeled_amount(
+            all_text, ["total value", "contract value", "amount", "consideration", "price", "pris"],
+            scanner,
+        )
+        fields["currency"], field_confidences["currency"] = _detect_currency(all_text, scanner.lowered)
+
+        fields["pages_processed"] = len(pages)
+
+        key_fields = ["parties", "effective_date", "contract_type"]
+        overall_confidence = _calculate_weighted_confidence(field_confidences, key_fields)
+
+        processing_time = time.perf_counter() - start_time
+
+        return {
+            "success": True,
+            "data": fields,
+            "confidence": round(overall_confidence, 2),
+            "field_confidences": {k: round(v, 2) for k, v in field_confidences.items()},
+            "error": None,
+            "warnings": [],
+            "requires_review": overall_confidence < 0.60,
+            "processing_time": round(processing_time, 2),
+        }
 
     except Exception as exc:
-        logger.error(f"Error extracting contract from {pdf_path}: {exc}", exc_info=True)
+        logger.error("Error extracting contract from %s: %s", pdf_path, exc, exc_info=True)
         return _error_result(str(exc), start_time)
 
 
@@ -353,86 +482,80 @@ def extract_contract_data_ml(pdf_path: str) -> dict:
 # FINANCIAL STATEMENT Extraction
 # ==================================================================
 
-def extract_financial_statement_ml(pdf_path: str) -> dict:
+def extract_financial_statement_ml(pdf_path: str, pages: tuple = None) -> dict:
     """Extract financial statement tables, totals, and structure."""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            all_text = ""
-            all_tables = []
-
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                all_text += text + "\n"
-
-                tables = page.extract_tables()
-                for t_idx, table in enumerate(tables):
-                    if table and len(table) > 1:
-                        headers = [str(h).strip() if h else f"Col_{i}" for i, h in enumerate(table[0])]
-                        rows = []
-                        for row in table[1:]:
-                            row_dict = {}
-                            for i, cell in enumerate(row):
-                                key = headers[i] if i < len(headers) else f"Col_{i}"
-                                row_dict[key] = str(cell).strip() if cell else ""
-                            rows.append(row_dict)
-                        all_tables.append({
-                            "page": page_num,
-                            "table_index": t_idx,
-                            "headers": headers,
-                            "rows": rows,
-                            "row_count": len(rows),
-                            "column_count": len(headers),
-                        })
-
-            if not all_tables:
-                # Try to parse text as structured data
-                fields = _extract_statement_from_text(all_text)
-                if fields:
-                    processing_time = (datetime.now() - start_time).total_seconds()
-                    return {
-                        "success": True,
-                        "data": fields,
-                        "confidence": 0.65,
-                        "field_confidences": {},
-                        "error": None,
-                        "warnings": ["No tables detected - extracted from text layout"],
-                        "requires_review": True,
-                        "processing_time": round(processing_time, 2),
-                    }
-                return _error_result("No tables found in financial statement", start_time)
-
-            fields = {
-                "statement_type": _detect_statement_type(all_text),
-                "period": _extract_period(all_text),
-                "currency": _detect_currency(all_text)[0],
-                "tables": all_tables,
-                "total_tables": len(all_tables),
-                "total_rows": sum(t["row_count"] for t in all_tables),
-                "pages_processed": len(pdf.pages),
-            }
-
-            # Try to find summary totals
-            for label in ["total", "net income", "balance", "sum", "totalt", "resultat"]:
-                amount, conf = _extract_labeled_amount(all_text, [label])
-                if amount:
-                    fields[f"summary_{label.replace(' ', '_')}"] = amount
-                    break
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-            return {
-                "success": True,
-                "data": fields,
-                "confidence": 0.82,
-                "field_confidences": {},
-                "error": None,
-                "warnings": [],
-                "requires_review": False,
-                "processing_time": round(processing_time, 2),
-            }
+        if pages is None:
+            pages = load_pdf_pages(pdf_path)
+        text_parts = []
+        all_tables = []
+
+        for page_num, (text, tables) in enumerate(pages, 1):
+            text_parts.append(text)
+
+            for t_idx, table in enumerate(tables):
+                if table and len(table) > 1:
+                    headers, rows = _table_rows(table)
+                    all_tables.append({
+                        "page": page_num,
+                        "table_index": t_idx,
+                        "headers": headers,
+                        "rows": rows,
+                        "row_count": len(rows),
+                        "column_count": len(headers),
+                    })
+        all_text = "\n".join(text_parts) + "\n"
+
+        if not all_tables:
+            # Try to parse text as structured data
+            fields = _extract_statement_from_text(all_text)
+            if fields:
+                processing_time = time.perf_counter() - start_time
+                return {
+                    "success": True,
+                    "data": fields,
+                    "confidence": 0.65,
+                    "field_confidences": {},
+                    "error": None,
+                    "warnings": ["No tables detected - extracted from text layout"],
+                    "requires_review": True,
+                    "processing_time": round(processing_time, 2),
+                }
+            return _error_result("No tables found in financial statement", start_time)
+
+        scanner = LabelScanner(all_text)
+        fields = {
+            "statement_type": _detect_statement_type(all_text, scanner.lowered),
+            "period": _extract_period(all_text),
+            "currency": _detect_currency(all_text, scanner.lowered)[0],
+            "tables": all_tables,
+            "total_tables": len(all_tables),
+            "total_rows": sum(t["row_count"] for t in all_tables),
+            "pages_processed": len(pages),
+        }
+
+        # Try to find summary totals
+        for label in SUMMARY_AMOUNT_LABELS:
+            amount, conf = _extract_labeled_amount(all_text, [label], scanner)
+            if amount:
+                fields[f"summary_{label.replace(' ', '_')}"] = amount
+                break
+
+        processing_time = time.perf_counter() - start_time
+        return {
+            "success": True,
+            "data": fields,
+            "confidence": 0.82,
+            "field_confidences": {},
+            "error": None,
+            "warnings": [],
+            "requires_review": False,
+            "processing_time": round(processing_time, 2),
+        }
 
     except Exception as exc:
-        logger.error(f"Error extracting financial statement from {pdf_path}: {exc}", exc_info=True)
+        logger.error("Error extracting financial statement from %s: %s", pdf_path, exc, exc_info=True)
         return _error_result(str(exc), start_time)
 
 
@@ -440,101 +563,90 @@ def extract_financial_statement_ml(pdf_path: str) -> dict:
 # GENERIC Extraction
 # ==================================================================
 
-def extract_generic_data_ml(pdf_path: str) -> dict:
+def extract_generic_data_ml(pdf_path: str, pages: tuple = None) -> dict:
     """Generic extraction for any PDF — extracts all text, tables, dates, amounts, entities."""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            all_text = ""
-            text_blocks = []
-            tables = []
-
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                all_text += text + "\n"
-                if text.strip():
-                    text_blocks.append({"page": page_num, "text": text})
-
-                for t_idx, table in enumerate(page.extract_tables() or []):
-                    if table and len(table) > 1:
-                        headers = [str(h).strip() if h else f"Col_{i}" for i, h in enumerate(table[0])]
-                        rows = []
-                        for row in table[1:]:
-                            row_dict = {}
-                            for i, cell in enumerate(row):
-                                key = headers[i] if i < len(headers) else f"Col_{i}"
-                                row_dict[key] = str(cell).strip() if cell else ""
-                            rows.append(row_dict)
-                        tables.append({
-                            "page": page_num,
-                            "headers": headers,
-                            "rows": rows,
-                            "row_count": len(rows),
-                        })
-
-            # Extract whatever we can find
-            fields = {
-                "pages_processed": len(pdf.pages),
-                "total_characters": len(all_text),
-                "text_blocks": text_blocks,
-                "tables": tables,
-                "total_tables": len(tables),
-                "total_rows": sum(t["row_count"] for t in tables),
-            }
-
-            # Auto-detect dates
-            all_dates = []
-            for pattern in DATE_PATTERNS:
-                all_dates.extend(re.findall(pattern, all_text))
-            if all_dates:
-                fields["dates_found"] = list(set(all_dates[:20]))
-
-            # Auto-detect amounts
-            amounts = re.findall(
-                r"(?:[$€£]|kr\.?|NOK|USD|EUR)\s*[\d,.\s]+\d",
-                all_text, re.IGNORECASE
-            )
-            if amounts:
-                fields["amounts_found"] = list(set(a.strip() for a in amounts[:20]))
-
-            # Detect currency
-            fields["currency"] = _detect_currency(all_text)[0]
-
-            # Auto-detect emails
-            emails = re.findall(r"[\w.+-]+@[\w.-]+\.\w{2,}", all_text)
-            if emails:
-                fields["emails_found"] = list(set(emails))
-
-            # Auto-detect phone numbers
-            phones = re.findall(r"(?:\+\d{1,3}[\s-]?)?\(?\d{2,4}\)?[\s.-]?\d{3,4}[\s.-]?\d{3,4}", all_text)
-            if phones:
-                fields["phones_found"] = list(set(p.strip() for p in phones[:10]))
-
-            # Auto-detect URLs
-            urls = re.findall(r"https?://[^\s<>\"']+|www\.[^\s<>\"']+", all_text)
-            if urls:
-                fields["urls_found"] = list(set(urls))
-
-            confidence = 0.75
-            if tables:
-                confidence = 0.80
-            if len(all_text) < 100:
-                confidence = 0.50
-
-            processing_time = (datetime.now() - start_time).total_seconds()
-            return {
-                "success": True,
-                "data": fields,
-                "confidence": confidence,
-                "field_confidences": {},
-                "error": None,
-                "warnings": ["Generic extraction — specific document type may yield better results"],
-                "requires_review": False,
-                "processing_time": round(processing_time, 2),
-            }
+        if pages is None:
+            pages = load_pdf_pages(pdf_path)
+        text_parts = []
+        text_blocks = []
+        tables = []
+
+        for page_num, (text, page_tables) in enumerate(pages, 1):
+            text_parts.append(text)
+            if text.strip():
+                text_blocks.append({"page": page_num, "text": text})
+
+            for t_idx, table in enumerate(page_tables):
+                if table and len(table) > 1:
+                    headers, rows = _table_rows(table)
+                    tables.append({
+                        "page": page_num,
+                        "headers": headers,
+                        "rows": rows,
+                        "row_count": len(rows),
+                    })
+        all_text = "\n".join(text_parts) + "\n"
+
+        # Extract whatever we can find
+        fields = {
+            "pages_processed": len(pages),
+            "total_characters": len(all_text),
+            "text_blocks": text_blocks,
+            "tables": tables,
+            "total_tables": len(tables),
+            "total_rows": sum(t["row_count"] for t in tables),
+        }
+
+        # Auto-detect dates
+        all_dates = _first_matches(DATE_RES, all_text, 20)
+        if all_dates:
+            fields["dates_found"] = list(dict.fromkeys(all_dates))
+
+        # Auto-detect amounts
+        amounts = _first_matches([GENERIC_AMOUNT_RE], all_text, 20)
+        if amounts:
+            fields["amounts_found"] = list(dict.fromkeys(a.strip() for a in amounts))
+
+        # Detect currency
+        fields["currency"] = _detect_currency(all_text)[0]
+
+        # Auto-detect emails
+        emails = _find_emails(all_text)
+        if emails:
+            fields["emails_found"] = list(dict.fromkeys(emails))
+
+        # Auto-detect phone numbers
+        phones = _first_matches([PHONE_RE], all_text, 10)
+        if phones:
+            fields["phones_found"] = list(dict.fromkeys(p.strip() for p in phones))
+
+        # Auto-detect URLs
+        urls = URL_RE.findall(all_text)
+        if urls:
+            fields["urls_found"] = list(dict.fromkeys(urls))
+
+        confidence = 0.75
+        if tables:
+            confidence = 0.80
+        if len(all_text) < 100:
+            confidence = 0.50
+
+        processing_time = time.perf_counter() - start_time
+        return {
+            "success": True,
+            "data": fields,
+            "confidence": confidence,
+            "field_confidences": {},
+            "error": None,
+            "warnings": ["Generic extraction — specific document type may yield better results"],
+            "requires_review": False,
+            "processing_time": round(processing_time, 2),
+        }
 
     except Exception as exc:
-        logger.error(f"Error in generic extraction from {pdf_path}: {exc}", exc_info=True)
+        logger.error("Error in generic extraction from %s: %s", pdf_path, exc, exc_info=True)
         return _error_result(str(exc), start_time)
 
 
@@ -542,19 +654,41 @@ def extract_generic_data_ml(pdf_path: str) -> dict:
 # Field Extraction Helpers
 # ==================================================================
 
+def _find_emails(text: str) -> list:
+    """
+    EMAIL_RE.findall(text), scanning only whitespace-separated tokens that
+    contain an "@". An address can't span whitespace, so this yields the
+    same matches without trying the pattern at every offset of the text.
+    """
+    return [m for token in text.split() if "@" in token for m in EMAIL_RE.findall(token)]
+
+
+def _first_matches(patterns: list, text: str, limit: int) -> list:
+    """
+    The first ``limit`` items of each pattern's findall() results, chained
+    in pattern order — without scanning the rest of the text once enough
+    have been found. Patterns have at most one capture group.
+    """
+    matches = (m.group(1 if p.groups else 0) for p in patterns for m in p.finditer(text))
+    return list(islice(matches, limit))
+
+
+# (pattern, confidence) pairs, most specific first
+_INVOICE_NUMBER_RES = [(re.compile(p, re.IGNORECASE), conf) for p, conf in [
+    # Norwegian: "Fakturanr: INV-2024-0042" — no newline crossing, colon required
+    (r"(?:Fakturanr|Fakturanummer|Faktura\s*nr)\.?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.95),
+    # English: "Invoice No: 1234", "Inv. #5678" — use [ \t] not \s to avoid newlines
+    (r"(?:Invoice|Inv|Faktura)[ \t.#:]*(?:No\.?|Number|Nr\.?|#)?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.93),
+    (r"(?:Invoice|Faktura)[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.90),
+    (r"(?:Inv|INV)[ \t.#-]*(\d[\w\-/]{2,15})", 0.85),
+    (r"(?:Document|Doc)[ \t.#:]*(?:No\.?|Number|Nr\.?)?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.70),
+]]
+
+
 def _extract_invoice_number(text: str) -> tuple:
     """Extract invoice number with confidence."""
-    patterns = [
-        # Norwegian: "Fakturanr: INV-2024-0042" — no newline crossing, colon required
-        (r"(?:Fakturanr|Fakturanummer|Faktura\s*nr)\.?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.95),
-        # English: "Invoice No: 1234", "Inv. #5678" — use [ \t] not \s to avoid newlines
-        (r"(?:Invoice|Inv|Faktura)[ \t.#:]*(?:No\.?|Number|Nr\.?|#)?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.93),
-        (r"(?:Invoice|Faktura)[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.90),
-        (r"(?:Inv|INV)[ \t.#-]*(\d[\w\-/]{2,15})", 0.85),
-        (r"(?:Document|Doc)[ \t.#:]*(?:No\.?|Number|Nr\.?)?[ \t]*[:#][ \t]*([A-Z0-9][\w\-/]{2,20})", 0.70),
-    ]
-    for pattern, conf in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, conf in _INVOICE_NUMBER_RES:
+        match = pattern.search(text)
         if match:
             value = match.group(1).strip()
             # Filter out obvious non-invoice values
@@ -563,55 +697,157 @@ def _extract_invoice_number(text: str) -> tuple:
     return None, 0.0
 
 
-def _extract_labeled_date(text: str, labels: list) -> tuple:
+# What may follow a label, per kind of value; group 1 captures the value
+_LABEL_TAILS = {
+    # "<label>: [25%:] [currency] <amount>"
+    "amount": (
+        r"\s*[:\s]\s*"
+        r"(?:\d+[\.,]?\d*\s*%\s*[:\s]?\s*)?"  # skip optional rate "25%:"
+        r"(?:[$€£¥₹]|kr\.?|NOK|SEK|DKK|USD|EUR|GBP|CHF)?\s*"
+        r"([\d]{1,3}(?:[,.\s]?\d{3})*(?:[.,]\d{1,2})?)"
+    ),
+    "value": r"\s*[:\s]\s*(.{2,60}?)(?:\n|$)",
+    "entity": r"\s*[:\s]\s*(.+?)(?:\n|$)",
+    # Allow "." separator (e.g. "Org.nr. 932 814 569") and optional "NO" prefix
+    "tax_id": r"\s*[.:\s]{0,3}\s*((?:NO\s*)?\d[\d\s\-]{5,15}\d)",
+    # Section heading "<label>:" then a 20-300 char body up to a blank line or
+    # the next numbered section (the body may span lines)
+    "clause": r"[:\s.]*\n((?s:.{20,300}?))(?:\n\n|\n\d+\.)",
+    # "Label: date_value" or "Label date_value", one kind per DATE_PATTERNS entry
+    **{f"date{i}": rf"\s*[:\s]\s*{pat}" for i, pat in enumerate(DATE_PATTERNS)},
+}
+_DATE_KINDS = [f"date{i}" for i in range(len(DATE_PATTERNS))]
+
+_NEARBY_AMOUNT_RE = re.compile(
+    r"(?:[$€£]|kr\.?|NOK|USD|EUR)?\s*([\d]{1,3}(?:[,.\s]?\d{3})*(?:[.,]\d{1,2}))",
+    re.IGNORECASE,
+)
+_COMPANY_SUFFIX_RE = re.compile(r"\s*(AS|A/S|Ltd|LLC|Inc|GmbH|AB|Oy|ApS)\s*$", re.IGNORECASE)
+_LEADING_DIGIT_RE = re.compile(r"\d")
+
+
+# Entity labels are short words ("to", "fra"), so require word boundaries
+_LABEL_TAIL_RES = {
+    kind: re.compile((r"\b" if kind == "entity" else "") + tail, re.IGNORECASE)
+    for kind, tail in _LABEL_TAILS.items()
+}
+_WORD_BOUNDARY_RE = re.compile(r"\b")
+
+
+@functools.lru_cache(maxsize=512)
+def _label_re(kind: str, label: str) -> re.Pattern:
+    """Compiled "<label><tail>" pattern, for texts whose offsets change when lowercased."""
+    head = re.escape(label)
+    head = rf"\b{head}" if kind == "entity" else f"(?:{head})"
+    return re.compile(head + _LABEL_TAIL_RES[kind].pattern, re.IGNORECASE)
+
+
+class LabelScanner:
+    """
+    Per-document memo of (kind, label) → first captured value (or None).
+
+    All the labeled-field helpers for one document share an instance, so
+    the text is lowercased once, each label's occurrences are located once
+    (whichever kinds and fallbacks then look at them), and each (kind,
+    label) pattern is tried at most once. A case-insensitive regex scan
+    can't use the engine's literal prefix search, so occurrences are found
+    with str.find on the lowercased text, and only the part of the pattern
+    after the label is matched, right where the label ends.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lowered = None
+        self._found = {}
+        self._positions = {}
+
+    @property
+    def lowered(self) -> str:
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return self._lowered
+
+    def positions(self, label: str) -> list[int]:
+        """Offsets of every occurrence of ``label`` in the lowercased text."""
+        needle = label.lower()
+        offsets = self._positions.get(needle)
+        if offsets is None:
+            lowered = self.lowered
+            offsets = []
+            pos = lowered.find(needle)
+            while pos >= 0:
+                offsets.append(pos)
+                pos = lowered.find(needle, pos + 1)
+            self._positions[needle] = offsets
+        return offsets
+
+    def get(self, kind: str, label: str) -> Optional[str]:
+        key = (kind, label)
+        if key not in self._found:
+            self._found[key] = self._search(kind, label)
+        return self._found[key]
+
+    def _search(self, kind: str, label: str) -> Optional[str]:
+        text = self.text
+        if len(self.lowered) != len(text):
+            # Lowercasing changed offsets (rare non-ASCII), scan directly
+            match = _label_re(kind, label).search(text)
+            return match.group(1) if match else None
+        tail_re = _LABEL_TAIL_RES[kind]
+        for pos in self.positions(label):
+            if kind == "entity" and not _WORD_BOUNDARY_RE.match(text, pos):
+                continue
+            match = tail_re.match(text, pos + len(label.lower()))
+            if match:
+                return match.group(1)
+        return None
+
+
+def _extract_labeled_date(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
     """Extract a date value near a specific label."""
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
-        # Look for "Label: date_value" or "Label date_value"
-        for date_pat in DATE_PATTERNS:
-            pattern = rf"(?:{re.escape(label)})\s*[:\s]\s*{date_pat}"
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip(), 0.90
+        for kind in _DATE_KINDS:
+            value = scanner.get(kind, label)
+            if value is not None:
+                return value.strip(), 0.90
 
     # Fallback: find any date in the first 500 chars near the labels
     for label in labels:
-        label_pos = text.lower().find(label.lower())
-        if label_pos >= 0:
-            nearby = text[label_pos:label_pos + 100]
-            for date_pat in DATE_PATTERNS:
-                match = re.search(date_pat, nearby)
+        offsets = scanner.positions(label)
+        if offsets:
+            nearby = text[offsets[0]:offsets[0] + 100]
+            for date_re in DATE_RES:
+                match = date_re.search(nearby)
                 if match:
                     return match.group(1).strip(), 0.70
 
     return None, 0.0
 
 
-def _extract_labeled_amount(text: str, labels: list) -> tuple:
-    """Extract a monetary amount near a label."""
+def _extract_labeled_amount(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
+    """
+    Extract a monetary amount near a label.
+
+    Labels are tried in priority order. Pass a LabelScanner for ``text``
+    to share label searches between calls on the same document.
+    """
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
-        # Pattern: label followed by optional tax-rate like "25%:", then currency/amount
-        pattern = (
-            rf"(?:{re.escape(label)})\s*[:\s]\s*"
-            r"(?:\d+[\.,]?\d*\s*%\s*[:\s]?\s*)?"  # skip optional rate "25%:"
-            r"(?:[$€£¥₹]|kr\.?|NOK|SEK|DKK|USD|EUR|GBP|CHF)?\s*"
-            r"([\d]{1,3}(?:[,.\s]?\d{3})*(?:[.,]\d{1,2})?)"
-        )
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            raw = match.group(1).strip()
-            normalized = _normalize_amount(raw)
+        raw = scanner.get("amount", label)
+        if raw:
+            normalized = _normalize_amount(raw.strip())
             if normalized:
                 return normalized, 0.90
 
     # Fallback: look near label position
     for label in labels:
-        label_pos = text.lower().find(label.lower())
-        if label_pos >= 0:
-            nearby = text[label_pos:label_pos + 80]
-            amounts = re.findall(
-                r"(?:[$€£]|kr\.?|NOK|USD|EUR)?\s*([\d]{1,3}(?:[,.\s]?\d{3})*(?:[.,]\d{1,2}))",
-                nearby, re.IGNORECASE,
-            )
+        offsets = scanner.positions(label)
+        if offsets:
+            nearby = text[offsets[0]:offsets[0] + 80]
+            amounts = _NEARBY_AMOUNT_RE.findall(nearby)
             if amounts:
                 normalized = _normalize_amount(amounts[0])
                 if normalized:
@@ -620,28 +856,30 @@ def _extract_labeled_amount(text: str, labels: list) -> tuple:
     return None, 0.0
 
 
-def _extract_labeled_value(text: str, labels: list) -> tuple:
+def _extract_labeled_value(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
     """Extract a generic labeled value (text after a label)."""
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
-        pattern = rf"(?:{re.escape(label)})\s*[:\s]\s*(.{{2,60}}?)(?:\n|$)"
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            value = match.group(1).strip().rstrip(".")
+        value = scanner.get("value", label)
+        if value is not None:
+            value = value.strip().rstrip(".")
             if value and len(value) > 1:
                 return value, 0.80
     return None, 0.0
 
 
-def _extract_entity_name(text: str, labels: list) -> tuple:
+def _extract_entity_name(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
     """Extract a company/person name near a label."""
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
         # \b word boundaries prevent "to" matching inside "Fakturadato", etc.
-        pattern = rf"\b{re.escape(label)}\b\s*[:\s]\s*(.+?)(?:\n|$)"
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            name = match.group(1).strip()
+        name = scanner.get("entity", label)
+        if name is not None:
+            name = name.strip()
             # Clean up common suffixes
-            name = re.sub(r"\s*(AS|A/S|Ltd|LLC|Inc|GmbH|AB|Oy|ApS)\s*$", r" \1", name, flags=re.IGNORECASE)
+            name = _COMPANY_SUFFIX_RE.sub(r" \1", name)
             if name and len(name) > 1 and not name.isdigit():
                 return name.strip(), 0.85
 
@@ -650,91 +888,115 @@ def _extract_entity_name(text: str, labels: list) -> tuple:
     if lines and len(lines[0].strip()) > 2:
         first_line = lines[0].strip()
         # Check if it looks like a company name
-        if not re.match(r"^\d", first_line) and len(first_line) < 60:
+        if not _LEADING_DIGIT_RE.match(first_line) and len(first_line) < 60:
             return first_line, 0.50
 
     return None, 0.0
 
 
+# Typical address patterns (street + number, postal code + city)
+_ADDRESS_RE = re.compile(
+    r"((?:\d+\s+\w+\s+(?:Street|St|Ave|Road|Rd|Blvd|Way|Drive|Dr|Lane|Ln|vei|veien|gate|gaten|plass)"
+    r"|[\w\s]+\d+[A-Za-z]?)"
+    r"[\s,]*(?:\d{4,5}\s+\w+)?)",
+    re.IGNORECASE,
+)
+# Every address match starts at the beginning of a run of word/space chars
+_WORD_SPACE_RUN_RE = re.compile(r"[\w\s]+")
+_DIGIT_RE = re.compile(r"\d")
+
+
 def _extract_address(text: str, entity_type: str) -> tuple:
     """Extract an address block."""
-    # Look for typical address patterns (street + number, postal code + city)
-    address_pattern = (
-        r"((?:\d+\s+\w+\s+(?:Street|St|Ave|Road|Rd|Blvd|Way|Drive|Dr|Lane|Ln|vei|veien|gate|gaten|plass)"
-        r"|[\w\s]+\d+[A-Za-z]?)"
-        r"[\s,]*(?:\d{4,5}\s+\w+)?)"
-    )
-    match = re.search(address_pattern, text, re.IGNORECASE)
-    if match:
-        return match.group(1).strip(), 0.60
+    # _ADDRESS_RE.search() would retry the greedy [\w\s]+ branch from every
+    # offset of a long word/space run (quadratic on digit-free prose). A
+    # match exists in a run only if the run holds a digit, and then it
+    # starts at the run's first character, so try exactly those offsets.
+    for run in _WORD_SPACE_RUN_RE.finditer(text):
+        if _DIGIT_RE.search(text, run.start(), run.end()):
+            match = _ADDRESS_RE.match(text, run.start())
+            if match:
+                return match.group(1).strip(), 0.60
     return None, 0.0
 
 
-def _extract_tax_id(text: str, labels: list) -> tuple:
+def _extract_tax_id(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
     """Extract tax ID / org number."""
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
-        # Allow "." separator (e.g. "Org.nr. 932 814 569") and optional "NO" prefix
-        pattern = rf"(?:{re.escape(label)})\s*[.:\s]{{0,3}}\s*((?:NO\s*)?\d[\d\s\-]{{5,15}}\d)"
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip(), 0.90
+        value = scanner.get("tax_id", label)
+        if value is not None:
+            return value.strip(), 0.90
     return None, 0.0
 
 
+_TAX_RATE_RES = [re.compile(p, re.IGNORECASE) for p in [
+    r"(?:vat|mva|tax|gst|moms)\s*(?:rate)?\s*[:\s]?\s*(\d{1,2}(?:[.,]\d{1,2})?)\s*%",
+    r"(\d{1,2}(?:[.,]\d{1,2})?)\s*%\s*(?:vat|mva|tax|gst|moms)",
+]]
+
+
 def _extract_tax_rate(text: str) -> tuple:
     """Extract VAT/tax percentage rate."""
-    patterns = [
-        r"(?:vat|mva|tax|gst|moms)\s*(?:rate)?\s*[:\s]?\s*(\d{1,2}(?:[.,]\d{1,2})?)\s*%",
-        r"(\d{1,2}(?:[.,]\d{1,2})?)\s*%\s*(?:vat|mva|tax|gst|moms)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _TAX_RATE_RES:
+        match = pattern.search(text)
         if match:
             return match.group(1).replace(",", ".") + "%", 0.85
     return None, 0.0
 
 
+_PAYMENT_TERMS_RES = [(re.compile(p, re.IGNORECASE), conf) for p, conf in [
+    (r"(?:payment\s+terms?|betalingsbetingelser?|betalingsvilkår)\s*[:\s]\s*(.{5,80}?)(?:\n|$)", 0.90),
+    (r"(net\s+\d+\s*(?:days)?)", 0.85),
+    (r"(?:due\s+in|betaling\s+innen)\s+(\d+\s*(?:days|dager|calendar days))", 0.80),
+    (r"((?:30|45|60|90)\s*(?:days|dager)\s*(?:net|netto)?)", 0.75),
+]]
+
+
 def _extract_payment_terms(text: str) -> tuple:
     """Extract payment terms (net days, payment method, etc.)."""
-    patterns = [
-        (r"(?:payment\s+terms?|betalingsbetingelser?|betalingsvilkår)\s*[:\s]\s*(.{5,80}?)(?:\n|$)", 0.90),
-        (r"(net\s+\d+\s*(?:days)?)", 0.85),
-        (r"(?:due\s+in|betaling\s+innen)\s+(\d+\s*(?:days|dager|calendar days))", 0.80),
-        (r"((?:30|45|60|90)\s*(?:days|dager)\s*(?:net|netto)?)", 0.75),
-    ]
-    for pattern, conf in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, conf in _PAYMENT_TERMS_RES:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip(), conf
     return None, 0.0
 
 
+_BANK_INFO_RES = [(re.compile(p, re.IGNORECASE), conf) for p, conf in [
+    # Use [ ] (literal space) not \s to prevent IBAN from bleeding across newlines
+    (r"(?:IBAN|iban)\s*[:\s]?\s*([A-Z]{2}\d{2}[ ]?[\dA-Z ]{10,30})", 0.95),
+    (r"(?:Account|Konto|Kontonr)\s*[:\s]?\s*([\d .\-]{8,20})", 0.80),
+    (r"(?:SWIFT|BIC)\s*[:\s]?\s*([A-Z]{6}[A-Z0-9]{2,5})", 0.90),
+]]
+
+
 def _extract_bank_info(text: str) -> tuple:
     """Extract bank account / IBAN / payment reference."""
-    patterns = [
-        # Use [ ] (literal space) not \s to prevent IBAN from bleeding across newlines
-        (r"(?:IBAN|iban)\s*[:\s]?\s*([A-Z]{2}\d{2}[ ]?[\dA-Z ]{10,30})", 0.95),
-        (r"(?:Account|Konto|Kontonr)\s*[:\s]?\s*([\d .\-]{8,20})", 0.80),
-        (r"(?:SWIFT|BIC)\s*[:\s]?\s*([A-Z]{6}[A-Z0-9]{2,5})", 0.90),
-    ]
-    for pattern, conf in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, conf in _BANK_INFO_RES:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip(), conf
     return None, 0.0
 
 
-def _detect_currency(text: str) -> tuple:
-    """Detect the primary currency used in the document."""
+def _detect_currency(text: str, text_lower: str = None) -> tuple:
+    """
+    Detect the primary currency used in the document.
+    Pass ``text_lower`` when the caller already has the lowercased text.
+    """
     currency_counts = {}
-    for symbol, code in CURRENCY_SYMBOLS.items():
-        count = text.lower().count(symbol.lower())
+    if text_lower is None:
+        text_lower = text.lower()
+    for symbol, code in _CURRENCY_SYMBOLS_LOWER:
+        count = text_lower.count(symbol)
         if count > 0:
             currency_counts[code] = currency_counts.get(code, 0) + count
 
     # Also look for currency codes
-    for code in ["NOK", "USD", "EUR", "GBP", "SEK", "DKK", "CHF"]:
-        count = len(re.findall(rf"\b{code}\b", text, re.IGNORECASE))
+    code_counts = Counter(_CURRENCY_CODE_KEYS.get(m.casefold()) for m in CURRENCY_CODE_RE.findall(text))
+    for code in CURRENCY_CODES:
+        count = code_counts[code]
         if count > 0:
             currency_counts[code] = currency_counts.get(code, 0) + count
 
@@ -765,9 +1027,16 @@ def _extract_line_items(tables: list, full_text: str) -> list:
         if not col_map:
             continue
 
+        desc_idx = col_map.get("description")
+        amount_idx = col_map.get("amount")
+
         for row_idx, row in enumerate(raw[1:], 1):
             if not row or all(not cell for cell in row):
                 continue
+            # Only include rows with a description or amount; checked on the
+            # raw cells so skipped rows never reach _normalize_amount()
+            if not (_has_cell_text(row, desc_idx) or _has_cell_text(row, amount_idx)):
+                continue
 
             item = {"line_no": row_idx}
 
@@ -779,13 +1048,24 @@ def _extract_line_items(tables: list, full_text: str) -> list:
                     else:
                         item[role] = cell_value
 
-            # Only include if at least a description or amount exists
-            if item.get("description") or item.get("amount"):
-                line_items.append(item)
+            line_items.append(item)
 
     return line_items
 
 
+def _has_cell_text(row: list, col_idx: Optional[int]) -> bool:
+    """True if the row has a non-blank cell at ``col_idx``."""
+    if col_idx is None or col_idx >= len(row) or not row[col_idx]:
+        return False
+    return bool(str(row[col_idx]).strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _header_keyword_re(keyword: str) -> re.Pattern:
+    """Whole-word matcher for a column keyword (the keyword set is fixed)."""
+    return re.compile(rf"(?<![a-zA-Z]){re.escape(keyword)}(?![a-zA-Z])")
+
+
 def _map_line_item_columns(headers: list) -> dict:
     """Map table headers to line-item field roles."""
     col_map = {}
@@ -806,7 +1086,7 @@ def _map_line_item_columns(headers: list) -> dict:
             if header == kw:
                 return True
             # Keyword must not be surrounded by alpha chars (whole-word boundary)
-            if re.search(rf"(?<![a-zA-Z]){re.escape(kw)}(?![a-zA-Z])", header):
+            if _header_keyword_re(kw).search(header):
                 return True
         return False
 
@@ -826,20 +1106,24 @@ def _map_line_item_columns(headers: list) -> dict:
 # Contract-specific helpers
 # ==================================================================
 
+# "between X and Y"
+_BETWEEN_PARTIES_RE = re.compile(r"(?:between|mellom)\s+(.+?)\s+(?:and|og)\s+(.+?)(?:\.|,|\(|\n)", re.IGNORECASE)
+# "Party A: X"
+_PARTY_LABEL_RE = re.compile(r"(?:party\s*[AB12]|part\s*[12])\s*[:\s]\s*(.+?)(?:\n|$)", re.IGNORECASE)
+
+
 def _extract_contract_parties(text: str) -> tuple:
     """Extract parties from a contract."""
     parties = []
 
     # "between X and Y" pattern
-    between_pattern = r"(?:between|mellom)\s+(.+?)\s+(?:and|og)\s+(.+?)(?:\.|,|\(|\n)"
-    match = re.search(between_pattern, text, re.IGNORECASE)
+    match = _BETWEEN_PARTIES_RE.search(text)
     if match:
         parties = [match.group(1).strip(), match.group(2).strip()]
         return parties, 0.90
 
     # "Party A: X" pattern
-    party_pattern = r"(?:party\s*[AB12]|part\s*[12])\s*[:\s]\s*(.+?)(?:\n|$)"
-    matches = re.findall(party_pattern, text, re.IGNORECASE)
+    matches = _PARTY_LABEL_RE.findall(text)
     if matches:
         parties = [m.strip() for m in matches[:2]]
         return parties, 0.85
@@ -847,35 +1131,38 @@ def _extract_contract_parties(text: str) -> tuple:
     return parties, 0.0
 
 
-def _detect_contract_type(text: str) -> tuple:
-    """Detect the type of contract."""
-    type_keywords = {
-        "Service Agreement": ["service agreement", "service contract", "tjenesteavtale"],
-        "Employment Contract": ["employment", "ansettelse", "arbeidsavtale", "employment agreement"],
-        "NDA": ["non-disclosure", "confidentiality agreement", "nda", "konfidensialitetsavtale"],
-        "Sales Agreement": ["sales agreement", "purchase agreement", "kjøpsavtale"],
-        "Lease Agreement": ["lease", "rental", "leieavtale", "husleie"],
-        "Partnership Agreement": ["partnership", "joint venture", "samarbeidsavtale"],
-        "Supply Agreement": ["supply agreement", "leveranseavtale", "transportation"],
-        "Consulting Agreement": ["consulting", "advisory", "konsulentavtale", "rådgivning"],
-    }
+# Keywords are lowercase and matched as plain substrings of the lowercased text
+CONTRACT_TYPE_KEYWORDS = {
+    "Service Agreement": ("service agreement", "service contract", "tjenesteavtale"),
+    "Employment Contract": ("employment", "ansettelse", "arbeidsavtale", "employment agreement"),
+    "NDA": ("non-disclosure", "confidentiality agreement", "nda", "konfidensialitetsavtale"),
+    "Sales Agreement": ("sales agreement", "purchase agreement", "kjøpsavtale"),
+    "Lease Agreement": ("lease", "rental", "leieavtale", "husleie"),
+    "Partnership Agreement": ("partnership", "joint venture", "samarbeidsavtale"),
+    "Supply Agreement": ("supply agreement", "leveranseavtale", "transportation"),
+    "Consulting Agreement": ("consulting", "advisory", "konsulentavtale", "rådgivning"),
+}
+
 
-    text_lower = text.lower()
-    for ctype, keywords in type_keywords.items():
+def _detect_contract_type(text: str, text_lower: str = None) -> tuple:
+    """Detect the type of contract."""
+    if text_lower is None:
+        text_lower = text.lower()
+    for ctype, keywords in CONTRACT_TYPE_KEYWORDS.items():
         if any(kw in text_lower for kw in keywords):
             return ctype, 0.85
 
     return "General Contract", 0.50
 
 
-def _extract_clause(text: str, labels: list) -> tuple:
+def _extract_clause(text: str, labels: list, scanner: LabelScanner = None) -> tuple:
     """Extract a clause summary from the contract text."""
+    if scanner is None:
+        scanner = LabelScanner(text)
     for label in labels:
-        # Find section that starts with the label
-        pattern = rf"(?:\d+\.?\s*)?{re.escape(label)}[:\s.]*\n(.{{20,300}}?)(?:\n\n|\n\d+\.)"
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        if match:
-            clause = match.group(1).strip()
+        clause = scanner.get("clause", label)
+        if clause is not None:
+            clause = clause.strip()
             # Trim to a reasonable summary
             if len(clause) > 200:
                 clause = clause[:200] + "..."
@@ -887,38 +1174,50 @@ def _extract_clause(text: str, labels: list) -> tuple:
 # Financial Statement helpers
 # ==================================================================
 
-def _detect_statement_type(text: str) -> str:
+# Checked in order; lowercase, like CONTRACT_TYPE_KEYWORDS
+STATEMENT_TYPE_KEYWORDS = {
+    "Balance Sheet": ("balance sheet", "balanse", "assets and liabilities"),
+    "Income Statement": ("income statement", "profit and loss", "p&l", "resultat"),
+    "Cash Flow Statement": ("cash flow", "kontantstrøm"),
+}
+
+
+def _detect_statement_type(text: str, text_lower: str = None) -> str:
     """Detect what kind of financial statement this is."""
-    text_lower = text.lower()
-    if any(kw in text_lower for kw in ["balance sheet", "balanse", "assets and liabilities"]):
-        return "Balance Sheet"
-    elif any(kw in text_lower for kw in ["income statement", "profit and loss", "p&l", "resultat"]):
-        return "Income Statement"
-    elif any(kw in text_lower for kw in ["cash flow", "kontantstrøm"]):
-        return "Cash Flow Statement"
+    if text_lower is None:
+        text_lower = text.lower()
+    for statement_type, keywords in STATEMENT_TYPE_KEYWORDS.items():
+        if any(kw in text_lower for kw in keywords):
+            return statement_type
     return "Financial Statement"
 
 
+_PERIOD_RES = [re.compile(p, re.IGNORECASE) for p in [
+    r"(?:period|periode|for the year|for året)\s*[:\s]?\s*(.{5,50}?)(?:\n|$)",
+    r"(\d{4}[-/]\d{1,2}[-/]\d{1,2})\s*[-–to]+\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2})",
+]]
+
+
 def _extract_period(text: str) -> str:
     """Extract the reporting period."""
-    patterns = [
-        r"(?:period|periode|for the year|for året)\s*[:\s]?\s*(.{5,50}?)(?:\n|$)",
-        r"(\d{4}[-/]\d{1,2}[-/]\d{1,2})\s*[-–to]+\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _PERIOD_RES:
+        match = pattern.search(text)
         if match:
             return match.group(0).strip()
     return None
 
 
+# "<label>   <number>" — label and value separated by a run of spaces
+_STATEMENT_LINE_RE = re.compile(r"(.{3,50}?)\s{2,}([\d,.\s]+\d)\s*$")
+
+
 def _extract_statement_from_text(text: str) -> dict:
     """Fallback: parse financial data from text layout when no tables found."""
     lines = text.split("\n")
     items = []
     for line in lines:
         # Look for lines with a label and a number
-        match = re.match(r"(.{3,50}?)\s{2,}([\d,.\s]+\d)\s*$", line)
+        match = _STATEMENT_LINE_RE.match(line)
         if match:
             items.append({
                 "label": match.group(1).strip(),
@@ -933,23 +1232,32 @@ def _extract_statement_from_text(text: str) -> dict:
 # Utilities
 # ==================================================================
 
+_DIGIT_SPACES_RE = re.compile(r"(?<=\d)\s+(?=\d)")
+_EUROPEAN_AMOUNT_RE = re.compile(r"^\d{1,3}(\.\d{3})+,\d{2}$")
+_US_AMOUNT_RE = re.compile(r"^\d{1,3}(,\d{3})+\.\d{2}$")
+_NON_NUMERIC_RE = re.compile(r"[^\d.]")
+
+
+# Pure str -> str, and statements repeat the same amounts ("0.00", totals)
+# across tables and labeled fields, so results are memoized
+@functools.lru_cache(maxsize=4096)
 def _normalize_amount(raw: str) -> str:
     """Normalize a money amount string."""
     if not raw:
         return None
     # Remove spaces between digits
-    cleaned = re.sub(r"(?<=\d)\s+(?=\d)", "", raw.strip())
+    cleaned = _DIGIT_SPACES_RE.sub("", raw.strip())
     # Handle European format: 1.234,56 → 1234.56
-    if re.match(r"^\d{1,3}(\.\d{3})+,\d{2}$", cleaned):
+    if _EUROPEAN_AMOUNT_RE.match(cleaned):
         cleaned = cleaned.replace(".", "").replace(",", ".")
     # Handle format: 1,234.56 (keep as is)
-    elif re.match(r"^\d{1,3}(,\d{3})+\.\d{2}$", cleaned):
+    elif _US_AMOUNT_RE.match(cleaned):
         cleaned = cleaned.replace(",", "")
     # Handle simple comma decimal: 1234,56 → 1234.56
     elif "," in cleaned and "." not in cleaned:
         cleaned = cleaned.replace(",", ".")
     # Remove any remaining non-numeric chars except .
-    cleaned = re.sub(r"[^\d.]", "", cleaned)
+    cleaned = _NON_NUMERIC_RE.sub("", cleaned)
     try:
         float(cleaned)
         return cleaned
@@ -962,15 +1270,12 @@ def _calculate_weighted_confidence(field_confidences: dict, key_fields: list) ->
     if not field_confidences:
         return 0.0
 
-    total_weight = 0
-    weighted_sum = 0
-
-    for field, conf in field_confidences.items():
-        weight = 2.0 if field in key_fields else 1.0
-        weighted_sum += conf * weight
-        total_weight += weight
-
-    return weighted_sum / total_weight if total_weight > 0 else 0.0
+    # Every field counts once, key fields once more: two C-level sums over
+    # the values instead of a per-field weight lookup in Python
+    key_confs = [field_confidences[f] for f in dict.fromkeys(key_fields) if f in field_confidences]
+    weighted_sum = sum(field_confidences.values()) + sum(key_confs)
+    total_weight = len(field_confidences) + len(key_confs)
+    return weighted_sum / total_weight
 
 
 def _validate_invoice_fields(fields: dict) -> list:
@@ -989,9 +1294,9 @@ def _validate_invoice_fields(fields: dict) -> list:
     return warnings
 
 
-def _error_result(error_msg: str, start_time: datetime) -> dict:
+def _error_result(error_msg: str, start_time: float) -> dict:
     """Build a standard error result dict."""
-    processing_time = (datetime.now() - start_time).total_seconds()
+    processing_time = time.perf_counter() - start_time
     return {
         "success": False,
         "data": {},
@@ -5,13 +5,28 @@ Manual export is available from the web dashboard.
 """
 
 import csv
+import functools
 import io
+import itertools
+import json
 import logging
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import Iterable, Optional
 
 from src.database import db
+from src.export.xlsx_stream import build_table_xlsx, write_table_xlsx
+
+# orjson is an optional, several times faster parser. It rejects a few
+# things json.dumps can write (NaN, integers beyond 64 bits), so json.loads
+# stays as the fallback.
+try:
+    from orjson import loads as _orjson_loads
+    _JSON_LOADERS = (_orjson_loads, json.loads)
+except ImportError:
+    _JSON_LOADERS = (json.loads,)
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +86,10 @@ POSTING_HEADERS = [
 ]
 
 
+# Write buffer for export files; large CSVs reach disk in few big writes
+FILE_BUFFER_SIZE = 1 << 20
+
+
 def _ensure_exports_dir() -> Path:
     EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
     return EXPORTS_DIR
@@ -84,18 +103,31 @@ def _ts() -> str:
 # CSV
 # ------------------------------------------------------------------
 
-def export_prospects_csv(filename: str = None) -> Optional[str]:
-    """Export all prospects to CSV file. Returns path or None."""
+def _write_csv(f, columns: list[str], rows) -> int:
+    """Write a header plus ``rows`` (tuples in column order) to ``f``. Returns row count."""
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    # zip() stops pulling from the counter once rows run out, so the
+    # counter's next value is the number of rows written
+    counter = itertools.count()
+    writer.writerows(row for row, _ in zip(rows, counter))
+    return next(counter)
+
+
+def export_prospects_csv(filename: str = None, rows: Iterable[tuple] = None) -> Optional[str]:
+    """
+    Export all prospects to CSV file. Returns path or None.
+    ``rows`` (tuples in PROSPECT_COLUMNS order) are streamed from the
+    database when not passed in.
+    """
     try:
         out_dir = _ensure_exports_dir()
         filepath = out_dir / (filename or f"prospects_{_ts()}.csv")
-        rows = db.get_prospects_for_export()
-        with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=PROSPECT_COLUMNS, extrasaction="ignore")
-            writer.writeheader()
-            for row in rows:
-                writer.writerow(row)
-        logger.info("CSV: exported %d prospects to %s", len(rows), filepath)
+        if rows is None:
+            rows = db.iter_prospects_for_export(columns=PROSPECT_COLUMNS)
+        with open(filepath, "w", newline="", encoding="utf-8-sig", buffering=FILE_BUFFER_SIZE) as f:
+            count = _write_csv(f, PROSPECT_COLUMNS, rows)
+        logger.info("CSV: exported %d prospects to %s", count, filepath)
         return str(filepath)
     except Exception as exc:
         logger.error("CSV export (prospects) failed: %s", exc)
@@ -107,149 +139,166 @@ def export_postings_csv(filename: str = None) -> Optional[str]:
     try:
         out_dir = _ensure_exports_dir()
         filepath = out_dir / (filename or f"postings_{_ts()}.csv")
-        rows = db.get_postings_for_export()
-        with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=POSTING_COLUMNS, extrasaction="ignore")
-            writer.writeheader()
-            for row in rows:
-                writer.writerow(row)
-        logger.info("CSV: exported %d postings to %s", len(rows), filepath)
+        rows = db.iter_postings_for_export(columns=POSTING_COLUMNS)
+        with open(filepath, "w", newline="", encoding="utf-8-sig", buffering=FILE_BUFFER_SIZE) as f:
+            count = _write_csv(f, POSTING_COLUMNS, rows)
+        logger.info("CSV: exported %d postings to %s", count, filepath)
         return str(filepath)
     except Exception as exc:
         logger.error("CSV export (postings) failed: %s", exc)
         return None
 
 
-def stream_prospects_csv():
-    """Yield CSV bytes for streaming HTTP response."""
-    rows = db.get_prospects_for_export()
+# Streamed CSV responses are sent in chunks of about this many characters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _stream_csv(columns: list[str], rows):
+    """
+    Yield CSV bytes as ``rows`` (tuples in column order) arrive, coalesced
+    into ~STREAM_CHUNK_SIZE chunks rather than one tiny chunk per row.
+    Only the first chunk carries the UTF-8 BOM.
+    """
     buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=PROSPECT_COLUMNS, extrasaction="ignore")
-    writer.writeheader()
-    yield buf.getvalue().encode("utf-8-sig")
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    encoding = "utf-8-sig"
     for row in rows:
-        buf.seek(0); buf.truncate()
         writer.writerow(row)
-        yield buf.getvalue().encode("utf-8")
+        if buf.tell() >= STREAM_CHUNK_SIZE:
+            yield buf.getvalue().encode(encoding)
+            encoding = "utf-8"
+            buf.seek(0); buf.truncate()
+    if buf.tell() or encoding == "utf-8-sig":
+        yield buf.getvalue().encode(encoding)
+
+
+def stream_prospects_csv():
+    """Yield CSV bytes for streaming HTTP response."""
+    return _stream_csv(PROSPECT_COLUMNS, db.iter_prospects_for_export(columns=PROSPECT_COLUMNS))
 
 
 def stream_postings_csv():
     """Yield CSV bytes for streaming HTTP response."""
-    rows = db.get_postings_for_export()
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=POSTING_COLUMNS, extrasaction="ignore")
-    writer.writeheader()
-    yield buf.getvalue().encode("utf-8-sig")
-    for row in rows:
-        buf.seek(0); buf.truncate()
-        writer.writerow(row)
-        yield buf.getvalue().encode("utf-8")
+    return _stream_csv(POSTING_COLUMNS, db.iter_postings_for_export(columns=POSTING_COLUMNS))
 
 
 # ------------------------------------------------------------------
 # Excel (.xlsx)
 # ------------------------------------------------------------------
 
-def _style_xlsx_header(ws, columns: list[str]):
-    """Apply header styling to the first row of an openpyxl worksheet."""
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+def _cell_style(ws, name: str, fill=None, font=None, alignment=None, border=None) -> str:
+    """
+    Register a NamedStyle on the worksheet's workbook and return its name.
+    Cells then take the whole style in one assignment; setting Font/Fill/
+    Border objects cell by cell re-hashes every one of them per cell.
+    """
+    from openpyxl.styles import NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
 
-    header_fill = PatternFill("solid", fgColor="1E3A5F")
-    header_font = Font(bold=True, color="FFFFFF", size=10)
-    thin = Side(style="thin", color="CCCCCC")
-    border = Border(bottom=thin)
-
-    for col_idx, col_name in enumerate(columns, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = col_name
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=False)
-        cell.border = border
-
-
-def _style_xlsx_rows(ws, num_cols: int, num_rows: int):
-    """Apply alternating row colours and borders."""
-    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-
-    even_fill = PatternFill("solid", fgColor="F0F4F8")
-    odd_fill  = PatternFill("solid", fgColor="FFFFFF")
-    normal_font = Font(size=9)
-    thin = Side(style="thin", color="E2E8F0")
-    border = Border(bottom=thin)
-
-    for row_idx in range(2, num_rows + 2):
-        fill = even_fill if row_idx % 2 == 0 else odd_fill
-        for col_idx in range(1, num_cols + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.fill = fill
-            cell.font = normal_font
-            cell.alignment = Alignment(vertical="center", wrap_text=False)
-            cell.border = border
-
-
-def build_prospects_xlsx() -> bytes:
-    """Build and return Excel workbook bytes for all prospects."""
-    import openpyxl
-    from openpyxl.utils import get_column_letter
+    # Unlike a plain cell, a NamedStyle has no font unless given one
+    style = NamedStyle(name=name, font=font or DEFAULT_FONT)
+    if fill is not None:
+        style.fill = fill
+    if alignment is not None:
+        style.alignment = alignment
+    if border is not None:
+        style.border = border
+    ws.parent.add_named_style(style)
+    return name
 
-    rows = db.get_prospects_for_export()
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Prospects"
-    ws.freeze_panes = "A2"
 
-    _style_xlsx_header(ws, PROSPECT_HEADERS)
+def _styled_cells(ws, values, style: str) -> list:
+    """Wrap ``values`` as write-only cells carrying the named ``style``."""
+    from openpyxl.cell import WriteOnlyCell
 
-    for row in rows:
-        ws.append([row.get(col, "") or "" for col in PROSPECT_COLUMNS])
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
 
-    _style_xlsx_rows(ws, len(PROSPECT_COLUMNS), len(rows))
 
-    # Column widths
-    widths = [18, 28, 26, 24, 34, 22, 38, 14, 14, 16]
-    for i, w in enumerate(widths, start=1):
-        ws.column_dimensions[get_column_letter(i)].width = w
+PROSPECT_XLSX_WIDTHS = [18, 28, 26, 24, 34, 22, 38, 14, 14, 16]
 
-    ws.row_dimensions[1].height = 18
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
+def build_prospects_xlsx(rows: Iterable[tuple] = None) -> bytes:
+    """Build and return Excel workbook bytes for all prospects (``rows`` as for export_prospects_csv)."""
+    if rows is None:
+        rows = db.iter_prospects_for_export(columns=PROSPECT_COLUMNS)
+    return build_table_xlsx("Prospects", PROSPECT_HEADERS, rows, PROSPECT_XLSX_WIDTHS)
 
 
-def build_postings_xlsx() -> bytes:
-    """Build and return Excel workbook bytes for all job postings."""
-    import openpyxl
-    from openpyxl.utils import get_column_letter
+def export_prospects_xlsx(filename: str = None, rows: Iterable[tuple] = None) -> Optional[str]:
+    """
+    Export all prospects to an .xlsx file, written straight to disk rather
+    than built in memory first. Returns path or None.
+    """
+    try:
+        out_dir = _ensure_exports_dir()
+        filepath = out_dir / (filename or f"prospects_{_ts()}.xlsx")
+        if rows is None:
+            rows = db.iter_prospects_for_export(columns=PROSPECT_COLUMNS)
+        write_table_xlsx(filepath, "Prospects", PROSPECT_HEADERS, rows, PROSPECT_XLSX_WIDTHS)
+        logger.info("XLSX: exported prospects to %s", filepath)
+        return str(filepath)
+    except Exception as exc:
+        logger.error("XLSX export (prospects) failed: %s", exc)
+        return None
 
-    rows = db.get_postings_for_export()
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Job Postings"
-    ws.freeze_panes = "A2"
 
-    _style_xlsx_header(ws, POSTING_HEADERS)
+def build_postings_xlsx() -> bytes:
+    """Build and return Excel workbook bytes for all job postings."""
+    return build_table_xlsx(
+        "Job Postings",
+        POSTING_HEADERS,
+        db.iter_postings_for_export(columns=POSTING_COLUMNS),
+        widths=[10, 14, 38, 28, 26, 20, 14, 20, 20, 50],
+    )
 
-    for row in rows:
-        ws.append([row.get(col, "") or "" for col in POSTING_COLUMNS])
 
-    _style_xlsx_rows(ws, len(POSTING_COLUMNS), len(rows))
+# ------------------------------------------------------------------
+# PDF
+# ------------------------------------------------------------------
 
-    widths = [10, 14, 38, 28, 26, 20, 14, 20, 20, 50]
-    for i, w in enumerate(widths, start=1):
-        ws.column_dimensions[get_column_letter(i)].width = w
+@functools.lru_cache(maxsize=1)
+def _pdf_table_styles() -> SimpleNamespace:
+    """Paragraph styles for _pdf_table, built once on first use."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_LEFT
 
-    ws.row_dimensions[1].height = 18
+    styles = getSampleStyleSheet()
+    return SimpleNamespace(
+        title=ParagraphStyle(
+            "Title",
+            parent=styles["Normal"],
+            fontSize=14,
+            fontName="Helvetica-Bold",
+            textColor=colors.HexColor("#1E3A5F"),
+            spaceAfter=2,
+        ),
+        subtitle=ParagraphStyle(
+            "Subtitle",
+            parent=styles["Normal"],
+            fontSize=8,
+            textColor=colors.HexColor("#64748B"),
+            spaceAfter=6,
+        ),
+        cell=ParagraphStyle(
+            "Cell",
+            parent=styles["Normal"],
+            fontSize=7,
+            leading=9,
+            alignment=TA_LEFT,
+        ),
+    )
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
 
+# Default Table cell padding (left + right), in points
+_PDF_CELL_PADDING = 12
 
-# ------------------------------------------------------------------
-# PDF
-# ------------------------------------------------------------------
 
 def _pdf_table(data: list[list], col_widths: list, title: str, subtitle: str) -> bytes:
     """
@@ -258,10 +307,9 @@ def _pdf_table(data: list[list], col_widths: list, title: str, subtitle: str) ->
     """
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import mm
+    from reportlab.pdfbase.pdfmetrics import stringWidth
     from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.enums import TA_LEFT
 
     buf = io.BytesIO()
     page = landscape(A4)
@@ -274,40 +322,28 @@ def _pdf_table(data: list[list], col_widths: list, title: str, subtitle: str) ->
         bottomMargin=14 * mm,
     )
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "Title",
-        parent=styles["Normal"],
-        fontSize=14,
-        fontName="Helvetica-Bold",
-        textColor=colors.HexColor("#1E3A5F"),
-        spaceAfter=2,
-    )
-    subtitle_style = ParagraphStyle(
-        "Subtitle",
-        parent=styles["Normal"],
-        fontSize=8,
-        textColor=colors.HexColor("#64748B"),
-        spaceAfter=6,
-    )
-    cell_style = ParagraphStyle(
-        "Cell",
-        parent=styles["Normal"],
-        fontSize=7,
-        leading=9,
-        alignment=TA_LEFT,
-    )
+    styles = _pdf_table_styles()
+    cell_style = styles.cell
+    text_widths = [w - _PDF_CELL_PADDING for w in col_widths]
 
-    # Wrap cell text in Paragraphs so long values wrap properly
+    # Wrap cell text in Paragraphs so long values wrap properly. Text that
+    # fits on one line (and has no markup characters) is passed as a plain
+    # string, which skips ReportLab's paragraph parser.
     header_row = data[0]
     body_rows  = data[1:]
 
     table_data = [header_row]
     for row in body_rows:
-        table_data.append([
-            Paragraph(str(cell) if cell else "", cell_style)
-            for cell in row
-        ])
+        cells = []
+        for cell, max_width in zip(row, text_widths):
+            # Only None is blank, so a count of 0 still prints
+            text = cell if type(cell) is str else "" if cell is None else str(cell)
+            if ("<" in text or "&" in text or "\n" in text
+                    or stringWidth(text, cell_style.fontName, cell_style.fontSize) > max_width):
+                cells.append(Paragraph(text, cell_style))
+            else:
+                cells.append(text)
+        table_data.append(cells)
 
     tbl = Table(table_data, colWidths=col_widths, repeatRows=1)
     tbl.setStyle(TableStyle([
@@ -321,6 +357,7 @@ def _pdf_table(data: list[list], col_widths: list, title: str, subtitle: str) ->
         # Body
         ("FONTNAME",    (0, 1), (-1, -1), "Helvetica"),
         ("FONTSIZE",    (0, 1), (-1, -1), 7),
+        ("LEADING",     (0, 1), (-1, -1), 9),
         ("TOPPADDING",    (0, 1), (-1, -1), 3),
         ("BOTTOMPADDING", (0, 1), (-1, -1), 3),
         ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F0F4F8")]),
@@ -330,8 +367,8 @@ def _pdf_table(data: list[list], col_widths: list, title: str, subtitle: str) ->
     ]))
 
     story = [
-        Paragraph(title, title_style),
-        Paragraph(subtitle, subtitle_style),
+        Paragraph(title, styles.title),
+        Paragraph(subtitle, styles.subtitle),
         Spacer(1, 4 * mm),
         tbl,
     ]
@@ -343,12 +380,11 @@ def build_prospects_pdf() -> bytes:
     """Build and return PDF bytes for all prospects."""
     from reportlab.lib.units import mm
 
-    rows = db.get_prospects_for_export()
     ts = datetime.now(timezone.utc).strftime("%d.%m.%Y %H:%M")
 
     data = [PROSPECT_HEADERS]
-    for row in rows:
-        data.append([row.get(col, "") or "" for col in PROSPECT_COLUMNS])
+    for row in db.iter_prospects_for_export(columns=PROSPECT_COLUMNS):
+        data.append(row)
 
     # Column widths in mm (landscape A4 = ~277mm usable)
     col_widths = [22*mm, 34*mm, 28*mm, 28*mm, 38*mm, 26*mm, 42*mm, 16*mm, 18*mm, 20*mm]
@@ -357,7 +393,7 @@ def build_prospects_pdf() -> bytes:
         data,
         col_widths,
         title="Sperton Leads — Prospects",
-        subtitle=f"Exported {ts}  •  {len(rows)} records  •  sperton.com",
+        subtitle=f"Exported {ts}  •  {len(data) - 1} records  •  sperton.com",
     )
 
 
@@ -365,12 +401,11 @@ def build_postings_pdf() -> bytes:
     """Build and return PDF bytes for all job postings."""
     from reportlab.lib.units import mm
 
-    rows = db.get_postings_for_export()
     ts = datetime.now(timezone.utc).strftime("%d.%m.%Y %H:%M")
 
     data = [POSTING_HEADERS]
-    for row in rows:
-        data.append([row.get(col, "") or "" for col in POSTING_COLUMNS])
+    for row in db.iter_postings_for_export(columns=POSTING_COLUMNS):
+        data.append(row)
 
     # Column widths in mm (landscape A4 = ~277mm usable)
     col_widths = [12*mm, 16*mm, 42*mm, 30*mm, 24*mm, 20*mm, 16*mm, 20*mm, 20*mm, 50*mm]
@@ -379,7 +414,7 @@ def build_postings_pdf() -> bytes:
         data,
         col_widths,
         title="Sperton Leads — Job Postings",
-        subtitle=f"Exported {ts}  •  {len(rows)} records  •  sperton.com",
+        subtitle=f"Exported {ts}  •  {len(data) - 1} records  •  sperton.com",
     )
 
 
@@ -389,15 +424,17 @@ def build_postings_pdf() -> bytes:
 
 def auto_export_after_run() -> Optional[str]:
     """Called at the end of a pipeline run. Saves CSV + XLSX."""
-    csv_path = export_prospects_csv()
+    # One query feeds both files
     try:
-        out_dir = _ensure_exports_dir()
-        ts = _ts()
-        xlsx_path = out_dir / f"prospects_{ts}.xlsx"
-        xlsx_path.write_bytes(build_prospects_xlsx())
-        logger.info("Auto-export XLSX saved to %s", xlsx_path)
+        rows = list(db.iter_prospects_for_export(columns=PROSPECT_COLUMNS))
     except Exception as exc:
-        logger.warning("Auto-export XLSX failed: %s", exc)
+        logger.error("Auto-export failed to read prospects: %s", exc)
+        return None
+
+    # Both files get the same timestamp even if the run crosses a second
+    ts = _ts()
+    csv_path = export_prospects_csv(f"prospects_{ts}.csv", rows=rows)
+    export_prospects_xlsx(f"prospects_{ts}.xlsx", rows=rows)
     return csv_path
 
 
@@ -448,25 +485,43 @@ ERA_EXTRACTION_HEADERS = [
 ]
 
 
-def _parse_extraction_data(extraction: dict) -> dict:
-    """Parse extracted_data JSON and flatten to a row."""
-    import json as _json
+# Extracted-data fields that override the extraction row's own columns
+_ERA_OVERLAY_KEYS = (
+    "invoice_number", "invoice_date", "due_date", "vendor_name", "buyer_name",
+    "currency", "subtotal", "tax_amount", "total_amount", "payment_terms",
+)
+
+# _parse_extraction_data rows have every column as a key, so one C-level
+# itemgetter call projects a row instead of a per-column .get() loop
+_era_row_values = itemgetter(*ERA_EXTRACTION_COLUMNS)
 
+
+def _load_extraction_data(extraction: dict) -> dict:
+    """Decode an extraction's extracted_data JSON ({} if missing or invalid)."""
     raw = extraction.get("extracted_data", "{}")
     if isinstance(raw, str):
-        try:
-            data = _json.loads(raw)
-        except Exception:
-            data = {}
-    else:
-        data = raw or {}
+        for loads in _JSON_LOADERS:
+            try:
+                return loads(raw)
+            except Exception:
+                continue
+        return {}
+    return raw or {}
+
+
+def _parse_extraction_data(extraction: dict) -> tuple[dict, dict]:
+    """
+    Parse extracted_data JSON and flatten it to a row.
+    Returns (row, data) so callers can reuse the decoded data.
+    """
+    data = _load_extraction_data(extraction)
 
     row = {col: extraction.get(col, "") for col in ERA_EXTRACTION_COLUMNS}
     # Overlay extracted fields
-    for key in ["invoice_number", "invoice_date", "due_date", "vendor_name", "buyer_name",
-                 "currency", "subtotal", "tax_amount", "total_amount", "payment_terms"]:
-        if data.get(key):
-            row[key] = data[key]
+    for key in _ERA_OVERLAY_KEYS:
+        value = data.get(key)
+        if value:
+            row[key] = value
 
     # Derived counts
     row["line_item_count"] = len(data.get("line_items", []))
@@ -477,112 +532,97 @@ def _parse_extraction_data(extraction: dict) -> dict:
     if conf is not None:
         row["confidence_score"] = f"{float(conf) * 100:.0f}%"
 
-    return row
+    return row, data
 
 
-def export_era_extractions_csv(extractions: list[dict] = None) -> io.StringIO:
+def _era_extraction_rows(extractions):
+    """Flatten extractions into value lists in ERA_EXTRACTION_COLUMNS order."""
+    for extraction in extractions:
+        row, _ = _parse_extraction_data(extraction)
+        yield _era_row_values(row)
+
+
+def stream_era_extractions_csv():
+    """Yield CSV bytes for streaming HTTP response."""
+    return _stream_csv(ERA_EXTRACTION_HEADERS, _era_extraction_rows(db.iter_extractions_for_export()))
+
+
+def export_era_extractions_csv(extractions: Iterable[dict] = None) -> io.StringIO:
     """
     Export ERA Group extractions to CSV with flattened extracted data fields.
+    Rows are streamed from the database when no extractions are passed in.
     """
     if extractions is None:
-        extractions = db.get_all_extractions_for_export()
+        extractions = db.iter_extractions_for_export()
 
     output = io.StringIO()
-    writer = csv.DictWriter(
-        output,
-        fieldnames=ERA_EXTRACTION_COLUMNS,
-        extrasaction="ignore",
-    )
+    count = _write_csv(output, ERA_EXTRACTION_HEADERS, _era_extraction_rows(extractions))
 
-    writer.writerow(dict(zip(ERA_EXTRACTION_COLUMNS, ERA_EXTRACTION_HEADERS)))
+    logger.info("Exported %d ERA extractions to CSV", count)
+    return output
 
-    for extraction in extractions:
-        row = _parse_extraction_data(extraction)
-        writer.writerow(row)
 
-    logger.info(f"Exported {len(extractions)} ERA extractions to CSV")
-    return output
+@functools.lru_cache(maxsize=1)
+def _era_xlsx_styles() -> SimpleNamespace:
+    """Style objects for the ERA workbook, built once on first use."""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    thin = Side(style="thin", color="CBD5E1")
+    return SimpleNamespace(
+        header_fill=PatternFill(start_color="00537F", end_color="00537F", fill_type="solid"),
+        header_font=Font(color="FFFFFF", bold=True, size=10),
+        header_alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        data_fill_light=PatternFill(start_color="F0F6FF", end_color="F0F6FF", fill_type="solid"),
+        data_alignment=Alignment(horizontal="left", vertical="center", wrap_text=True),
+        border=Border(left=thin, right=thin, top=thin, bottom=thin),
+    )
 
 
-def build_era_extractions_xlsx(extractions: list[dict] = None) -> bytes:
+def build_era_extractions_xlsx(extractions: Iterable[dict] = None) -> bytes:
     """
     Build styled Excel workbook for ERA extractions with extracted data fields.
-    Includes a summary sheet + a line items sheet.
+    Includes a summary sheet + a line items sheet, both filled in a single
+    pass; rows are streamed from the database when no extractions are passed in.
     """
     if extractions is None:
-        extractions = db.get_all_extractions_for_export()
+        extractions = db.iter_extractions_for_export()
 
-    import json as _json
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
     from openpyxl.utils import get_column_letter
 
-    wb = Workbook()
+    wb = Workbook(write_only=True)
+    styles = _era_xlsx_styles()
 
     # ── Sheet 1: Summary ──
-    ws = wb.active
-    ws.title = "Extractions"
-
-    header_fill = PatternFill(start_color="00537F", end_color="00537F", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=10)
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    data_fill_light = PatternFill(start_color="F0F6FF", end_color="F0F6FF", fill_type="solid")
-    data_alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin", color="CBD5E1"),
-        right=Side(style="thin", color="CBD5E1"),
-        top=Side(style="thin", color="CBD5E1"),
-        bottom=Side(style="thin", color="CBD5E1"),
-    )
-
-    # Headers
-    for col_idx, header in enumerate(ERA_EXTRACTION_HEADERS, 1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = border
-
-    # Data rows
-    for row_idx, extraction in enumerate(extractions, 2):
-        row = _parse_extraction_data(extraction)
-        for col_idx, column in enumerate(ERA_EXTRACTION_COLUMNS, 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = row.get(column, "")
-            if row_idx % 2 == 0:
-                cell.fill = data_fill_light
-            cell.alignment = data_alignment
-            cell.border = border
-
+    ws = wb.create_sheet("Extractions")
+    header_style = _cell_style(ws, "header", styles.header_fill, styles.header_font, styles.header_alignment, styles.border)
+    even_style = _cell_style(ws, "row_even", styles.data_fill_light, alignment=styles.data_alignment, border=styles.border)
+    odd_style = _cell_style(ws, "row_odd", alignment=styles.data_alignment, border=styles.border)
     ws.freeze_panes = "A2"
     widths = [30, 12, 10, 14, 14, 14, 14, 24, 24, 8, 12, 12, 14, 20, 8, 6]
     for i, w in enumerate(widths, start=1):
         if i <= len(ERA_EXTRACTION_COLUMNS):
             ws.column_dimensions[get_column_letter(i)].width = w
 
+    ws.append(_styled_cells(ws, ERA_EXTRACTION_HEADERS, header_style))
+
     # ── Sheet 2: Line Items ──
+    # Write-only sheets each stream to their own buffer, so both can be
+    # appended to while walking the extractions once
     ws2 = wb.create_sheet("Line Items")
     li_headers = ["Source File", "Line #", "Product Code", "Description", "Qty", "Unit", "Unit Price", "Tax", "Amount"]
+    ws2.freeze_panes = "A2"
+    li_widths = [30, 6, 14, 40, 8, 8, 12, 10, 14]
+    for i, w in enumerate(li_widths, start=1):
+        ws2.column_dimensions[get_column_letter(i)].width = w
 
-    for col_idx, header in enumerate(li_headers, 1):
-        cell = ws2.cell(row=1, column=col_idx)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = border
+    ws2.append(_styled_cells(ws2, li_headers, header_style))
 
+    row_idx = 1
     li_row = 2
-    for extraction in extractions:
-        raw = extraction.get("extracted_data", "{}")
-        if isinstance(raw, str):
-            try:
-                data = _json.loads(raw)
-            except Exception:
-                data = {}
-        else:
-            data = raw or {}
+    for row_idx, extraction in enumerate(extractions, 2):
+        row, data = _parse_extraction_data(extraction)
+        ws.append(_styled_cells(ws, _era_row_values(row), even_style if row_idx % 2 == 0 else odd_style))
 
         for item in data.get("line_items", []):
             values = [
@@ -596,42 +636,35 @@ def build_era_extractions_xlsx(extractions: list[dict] = None) -> bytes:
                 item.get("tax", ""),
                 item.get("amount", ""),
             ]
-            for col_idx, val in enumerate(values, 1):
-                cell = ws2.cell(row=li_row, column=col_idx)
-                cell.value = val
-                if li_row % 2 == 0:
-                    cell.fill = data_fill_light
-                cell.alignment = data_alignment
-                cell.border = border
+            ws2.append(_styled_cells(ws2, values, even_style if li_row % 2 == 0 else odd_style))
             li_row += 1
 
-    ws2.freeze_panes = "A2"
-    li_widths = [30, 6, 14, 40, 8, 8, 12, 10, 14]
-    for i, w in enumerate(li_widths, start=1):
-        ws2.column_dimensions[get_column_letter(i)].width = w
-
     # Save
     output = io.BytesIO()
     wb.save(output)
-    output.seek(0)
 
-    logger.info(f"Built ERA extractions XLSX with {len(extractions)} records")
+    logger.info("Built ERA extractions XLSX with %d records", row_idx - 1)
     return output.getvalue()
+
+
 export_postings = export_postings_csv
 
 
-def build_era_extractions_pdf(extractions: list[dict] = None) -> bytes:
-    """Build a summary PDF for all ERA extractions (one row per invoice)."""
+def build_era_extractions_pdf(extractions: Iterable[dict] = None) -> bytes:
+    """
+    Build a summary PDF for ERA extractions (one row per invoice).
+    Rows are streamed from the database when no extractions are passed in.
+    """
     if extractions is None:
-        extractions = db.get_all_extractions_for_export()
+        extractions = db.iter_extractions_for_export()
 
     from reportlab.lib.units import mm
 
     ts = datetime.now(timezone.utc).strftime("%d.%m.%Y %H:%M")
     data = [ERA_EXTRACTION_HEADERS]
     for extraction in extractions:
-        row = _parse_extraction_data(extraction)
-        data.append([row.get(col, "") or "" for col in ERA_EXTRACTION_COLUMNS])
+        row, _ = _parse_extraction_data(extraction)
+        data.append(_era_row_values(row))
 
     col_widths = [35*mm, 12*mm, 10*mm, 16*mm, 16*mm, 14*mm, 14*mm,
                   28*mm, 28*mm, 8*mm, 14*mm, 12*mm, 14*mm, 22*mm, 8*mm, 6*mm]
@@ -640,13 +673,12 @@ def build_era_extractions_pdf(extractions: list[dict] = None) -> bytes:
         data,
         col_widths,
         title="ERA Group — Invoice Extractions",
-        subtitle=f"Exported {ts}  •  {len(extractions)} record(s)",
+        subtitle=f"Exported {ts}  •  {len(data) - 1} record(s)",
     )
 
 
 def build_era_single_extraction_pdf(extraction: dict) -> bytes:
     """Build a detailed A4 PDF for a single extracted invoice."""
-    import json as _json
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -656,14 +688,7 @@ def build_era_single_extraction_pdf(extraction: dict) -> bytes:
         SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable,
     )
 
-    raw = extraction.get("extracted_data", "{}")
-    if isinstance(raw, str):
-        try:
-            data = _json.loads(raw)
-        except Exception:
-            data = {}
-    else:
-        data = raw or {}
+    data = _load_extraction_data(extraction)
 
     buf = io.BytesIO()
     usable_w = A4[0] - 40 * mm
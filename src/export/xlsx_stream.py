@@ -0,0 +1,177 @@
+"""
+Minimal streaming .xlsx writer for flat, single-sheet table exports.
+
+The prospects and postings exports are plain tables of strings with one
+header style and two alternating row styles. Writing the sheet XML
+directly skips openpyxl's per-cell objects; rows are encoded in batches
+straight into the deflated zip member as they arrive.
+"""
+
+import io
+import math
+import zipfile
+from typing import Iterable
+
+# Rows encoded per write to the zip member
+ROW_BATCH_SIZE = 1000
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+# Cell formats (s="…"): 0 default, 1 header, 2 even data row, 3 odd data row.
+# Matches the look of the previous openpyxl exports.
+HEADER_STYLE, EVEN_ROW_STYLE, ODD_ROW_STYLE = 1, 2, 3
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><color theme="1"/><name val="Calibri"/><family val="2"/><scheme val="minor"/></font>'
+    '<font><b val="1"/><sz val="10"/><color rgb="00FFFFFF"/></font>'
+    '<font><sz val="9"/></font>'
+    "</fonts>"
+    '<fills count="5">'
+    '<fill><patternFill/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="001E3A5F"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00F0F4F8"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00FFFFFF"/></patternFill></fill>'
+    "</fills>"
+    '<borders count="3">'
+    "<border><left/><right/><top/><bottom/><diagonal/></border>"
+    '<border><left/><right/><top/><bottom style="thin"><color rgb="00CCCCCC"/></bottom><diagonal/></border>'
+    '<border><left/><right/><top/><bottom style="thin"><color rgb="00E2E8F0"/></bottom><diagonal/></border>'
+    "</borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" '
+    'applyBorder="1" applyAlignment="1"><alignment horizontal="left" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="3" borderId="2" xfId="0" applyFont="1" applyFill="1" '
+    'applyBorder="1" applyAlignment="1"><alignment vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="4" borderId="2" xfId="0" applyFont="1" applyFill="1" '
+    'applyBorder="1" applyAlignment="1"><alignment vertical="center"/></xf>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+# Escapes for text nodes; control characters other than tab/newline/CR are
+# not allowed in XML at all and are dropped
+_TEXT_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;",
+     **{chr(c): None for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)}}
+)
+_ATTR_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+def _column_letter(idx: int) -> str:
+    """Spreadsheet column name for 1-based ``idx`` (1 → A, 27 → AA)."""
+    letters = ""
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _row_xml(row_num: int, letters: list[str], values, style: int, row_attrs: str = "") -> str:
+    cells = []
+    for letter, value in zip(letters, values):
+        ref = f"{letter}{row_num}"
+        if value is None or value == "":
+            cells.append(f'<c r="{ref}" s="{style}"/>')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            cells.append(f'<c r="{ref}" s="{style}"><v>{value}</v></c>')
+        else:
+            text = str(value).translate(_TEXT_ESCAPES)
+            cells.append(
+                f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+            )
+    return f'<row r="{row_num}"{row_attrs}>{"".join(cells)}</row>'
+
+
+def build_table_xlsx(title: str, headers: list[str], rows: Iterable, widths: list[int]) -> bytes:
+    """Return the workbook written by write_table_xlsx as bytes."""
+    buf = io.BytesIO()
+    write_table_xlsx(buf, title, headers, rows, widths)
+    return buf.getvalue()
+
+
+def write_table_xlsx(dest, title: str, headers: list[str], rows: Iterable, widths: list[int]) -> None:
+    """
+    Write a one-sheet workbook to ``dest`` (a path or a writable binary
+    file): a frozen, styled header row followed by ``rows`` (value
+    sequences in header order) with alternating row fills. Values are
+    written as inline strings, numbers, or empty cells; NaN and infinite
+    floats, which a <v> element cannot hold, become strings ("nan", "inf").
+    """
+    letters = [_column_letter(i) for i in range(1, len(headers) + 1)]
+
+    with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+            f'<sheet name="{title.translate(_ATTR_ESCAPES)}" sheetId="1" r:id="rId1"/>'
+            "</sheets></workbook>",
+        )
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            cols = "".join(
+                f'<col min="{i}" max="{i}" width="{w}" customWidth="1"/>'
+                for i, w in enumerate(widths, start=1)
+            )
+            header = _row_xml(1, letters, headers, HEADER_STYLE, ' ht="18" customHeight="1"')
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+                '<sheetViews><sheetView workbookViewId="0">'
+                '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+                "</sheetView></sheetViews>"
+                f"<cols>{cols}</cols><sheetData>"
+                + header
+            ).encode("utf-8"))
+
+            batch = []
+            for row_num, values in enumerate(rows, start=2):
+                style = EVEN_ROW_STYLE if row_num % 2 == 0 else ODD_ROW_STYLE
+                batch.append(_row_xml(row_num, letters, values, style))
+                if len(batch) >= ROW_BATCH_SIZE:
+                    sheet.write("".join(batch).encode("utf-8"))
+                    batch.clear()
+            sheet.write(("".join(batch) + "</sheetData></worksheet>").encode("utf-8"))
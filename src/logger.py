@@ -1,39 +1,55 @@
 """
 Centralised logging configuration.
-Logs to both console (coloured) and a rotating file.
+Logs to both console (coloured when attached to a terminal) and a rotating file.
 """
 
 import logging
 import os
+import sys
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
-import colorlog
-
 
 def setup_logging(level: str = "INFO") -> None:
     log_dir = Path(__file__).parent.parent / "logs"
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / "leads_generator.log"
 
+    # No format below uses the thread/process fields, so skip looking them
+    # up for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    # Console handler with colours
-    console = colorlog.StreamHandler()
-    console.setFormatter(
-        colorlog.ColoredFormatter(
-            "%(log_color)s%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%H:%M:%S",
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "green",
-                "WARNING": "yellow",
-                "ERROR": "red",
-                "CRITICAL": "bold_red",
-            },
+    # Console handler; colours only when a terminal will render them
+    # (journald, Docker logs and redirects get plain lines)
+    console = logging.StreamHandler()
+    if sys.stderr.isatty():
+        import colorlog
+
+        console.setFormatter(
+            colorlog.ColoredFormatter(
+                "%(log_color)s%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+                datefmt="%H:%M:%S",
+                log_colors={
+                    "DEBUG": "cyan",
+                    "INFO": "green",
+                    "WARNING": "yellow",
+                    "ERROR": "red",
+                    "CRITICAL": "bold_red",
+                },
+            )
+        )
+    else:
+        console.setFormatter(
+            logging.Formatter(
+                "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+                datefmt="%H:%M:%S",
+            )
         )
-    )
     root.addHandler(console)
 
     # Rotating file handler (5 MB max, keep 3 backups)
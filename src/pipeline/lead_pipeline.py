@@ -6,10 +6,15 @@ Auto-exports CSV and tracks pipeline runs in the database.
 
 import logging
 import os
+import queue
+import re
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Optional
+from functools import partial
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from dotenv import load_dotenv
 
@@ -40,9 +45,138 @@ TARGET_POSITIONS = [
     "Personalsjef",
 ]
 
+# Snov.io list name -> id, resolved once per process (the scheduler and the
+# web app build a new LeadPipeline for every run)
+_snov_list_ids: dict[str, str] = {}
+_snov_list_lock = threading.Lock()
+
+# Rows a _WriteBuffer collects before writing them in one commit
+WRITE_BATCH_SIZE = 256
+
+# Postings processed concurrently. Each worker drives its own browser, since
+# Playwright's sync API only works on the thread that started it.
+POSTING_WORKERS = 4
+# Keywords each finn/nav source thread scrapes at once when running in
+# parallel (each on its own browser, too)
+KEYWORD_WORKERS = 2
+
+# Scraped postings waiting to be stored while scraping and processing
+# overlap. The stored postings waiting for a posting worker are capped too
+# (WORK_QUEUE_PER_WORKER each), so when the workers fall behind, storing
+# waits, this queue fills up and the scrapers wait in turn.
+SCRAPE_QUEUE_SIZE = 500
+WORK_QUEUE_PER_WORKER = 2
+# Seconds between checks that a posting worker is still alive while
+# waiting for room in the work queue
+_WORK_POLL_SECONDS = 1.0
+# Streamed postings stored per transaction (fewer when fewer are waiting)
+STORE_BATCH_SIZE = 100
+
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "msclkid", "ref", "referrer"})
+_WHITESPACE_RE = re.compile(r"\s+")
+# Legal-form suffixes _clean_company_name strips, uppercased for comparison
+_LEGAL_SUFFIXES = tuple(s.upper() for s in (" HF", " AS", " ASA", " KF", " SF", " IKS", ", Norway"))
+
+
+def _normalize_url(url: str) -> str:
+    """
+    URL with tracking parameters, the fragment and a trailing slash removed,
+    so the same ad reached through different links compares equal. Other
+    query parameters are kept (legacy finn.no URLs carry the ad id there).
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), "",
+    ))
+
+
+def _posting_key(posting: dict) -> Optional[tuple]:
+    """
+    Case- and whitespace-insensitive (company, title, location) of a posting,
+    identifying the same job mirrored on several sites; None when the
+    posting has no company or title to compare.
+    """
+    fields = tuple(
+        _WHITESPACE_RE.sub(" ", posting.get(name) or "").strip().casefold()
+        for name in ("company_name", "title", "location")
+    )
+    return fields if fields[0] and fields[1] else None
+
+
+def _first_sighting(posting: dict, seen_urls: set, seen_jobs: set) -> bool:
+    """
+    Record a posting's normalized URL and _posting_key; False if either was
+    already seen (a cross-source duplicate), True the first time.
+    """
+    url = _normalize_url(posting["url"])
+    job = _posting_key(posting)
+    if url in seen_urls or job in seen_jobs:
+        logger.debug("Duplicate posting skipped: %s", posting["url"])
+        return False
+    seen_urls.add(url)
+    if job is not None:
+        seen_jobs.add(job)
+    return True
+
+
+def _hand_off(work: queue.Queue, item, workers: list) -> bool:
+    """
+    Put ``item`` on the bounded ``work`` queue, waiting for room; False if
+    every worker future has finished, so nothing would ever take it.
+    """
+    while True:
+        try:
+            work.put(item, timeout=_WORK_POLL_SECONDS)
+            return True
+        except queue.Full:
+            if all(future.done() for future in workers):
+                return False
+
+
+class _WriteBuffer:
+    """
+    Rows queued by the posting workers and written WRITE_BATCH_SIZE at a
+    time by ``write`` (one executemany/commit per batch). A failed write
+    is logged and the batch dropped, like the per-row writes it replaces.
+    """
+
+    def __init__(self, write, label: str):
+        self._write = write
+        self._label = label
+        self._rows = []
+        self._lock = threading.Lock()
+
+    def add(self, row) -> None:
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= WRITE_BATCH_SIZE
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            self._write(rows)
+        except Exception as exc:
+            logger.error("Failed to write %d %s: %s", len(rows), self._label, exc)
+
 
 class LeadPipeline:
-    def __init__(self, snov_list_id: Optional[str] = None, sources: list[str] = None):
+    def __init__(
+        self,
+        snov_list_id: Optional[str] = None,
+        sources: list[str] = None,
+        workers: Optional[int] = None,
+    ):
         """
         Initialize lead generation pipeline.
 
@@ -50,11 +184,17 @@ class LeadPipeline:
             snov_list_id: Snov.io campaign list ID
             sources: List of sources to scrape (default: ['finn', 'nav'])
                      Available: 'finn', 'nav'
+            workers: Postings processed in parallel (1 = sequential on the
+                     shared browser; default: PIPELINE_WORKERS env var, else
+                     POSTING_WORKERS)
         """
         self.snov = SnovClient()
         self.brreg = BRREGClient()
         self.snov_list_id = snov_list_id or os.getenv("SNOV_LIST_ID")
         self.sources = sources or ['finn', 'nav']  # Multi-source by default
+        if workers is None:
+            workers = int(os.getenv("PIPELINE_WORKERS", POSTING_WORKERS))
+        self.workers = max(1, workers)
         self._stats = {
             "postings_scraped": 0,
             "postings_new": 0,
@@ -70,15 +210,55 @@ class LeadPipeline:
         }
         self._stats_lock = threading.Lock()
         self._run_id: Optional[int] = None
+        # Per-run API results keyed by cleaned company name (None = no match),
+        # since many postings share an employer
+        self._brreg_api_cache: dict[str, Optional[str]] = {}
+        self._domain_cache: dict[str, Optional[str]] = {}
+        # Final _resolve_domain result per company (casefolded name; None =
+        # every strategy failed), so later postings from it skip the lookups
+        self._company_domains: dict[str, Optional[str]] = {}
+        # Domains whose contacts a posting has already taken on this run;
+        # later postings at the same domain would only find the same emails
+        self._claimed_domains: set[str] = set()
+        self._cache_lock = threading.Lock()
+        # Every local company for fuzzy matching, loaded on first need
+        self._companies: Optional[dict[str, str]] = None
+        # Exact-name BRREG match (or None) per company name in the run's
+        # postings, loaded one query per stored batch by _preload_org_numbers
+        self._org_numbers: Optional[dict[str, Optional[str]]] = None
+        # Prospect emails already in the DB, loaded once by _process_postings
+        # and extended as prospects are inserted
+        self._known_emails: Optional[set[str]] = None
+        # Batched writes: outreach_log rows, (company_domain, org_number, id)
+        # for job_postings whose domain was resolved, and (processed_at, id)
+        # for every posting the pipeline has finished with
+        self._outreach = _WriteBuffer(lambda rows: db.log_outreach_many(rows), "outreach log rows")
+        self._posting_updates = _WriteBuffer(
+            lambda rows: db.update_posting_enrichment_many(rows), "job posting updates",
+        )
+        self._processed = _WriteBuffer(self._mark_processed, "processed postings")
 
     def run(self, keywords: list[str]) -> dict:
         """
         Full pipeline run for a list of keywords.
         Returns stats dict.
+
+        Postings are stored before they are processed, and marked processed
+        (in batches) once done. Postings an interrupted run stored but never
+        finished are picked up again here, ahead of the new ones; after a
+        crash, at most the last unflushed batch is processed a second time.
         """
         logger.info("=== Lead pipeline starting -- %s ===", datetime.now(timezone.utc).isoformat())
         db.init_db()
 
+        # Lookup caches only live for one run
+        self._brreg_api_cache.clear()
+        self._domain_cache.clear()
+        self._company_domains.clear()
+        self._claimed_domains.clear()
+        self._companies = None
+        self._org_numbers = None
+
         # Track this pipeline run
         self._run_id = db.insert_pipeline_run()
 
@@ -87,27 +267,33 @@ class LeadPipeline:
             if not self.snov_list_id:
                 self.snov_list_id = self._ensure_snov_list()
 
-            with BrowserManager() as bm:
-                # Step 1: Collect ALL postings from all sources (shared browser)
-                postings = self._scrape_all_sources(keywords, browser=bm.browser)
-                self._stats["postings_scraped"] = len(postings)
-                logger.info("Scraped %d total postings from %d sources", len(postings), len(self.sources))
-                for source, count in self._stats["postings_by_source"].items():
-                    logger.info("  - %s: %d postings", source, count)
-
-                # Step 2: Process postings (sequential — browser contexts are not thread-safe)
-                for posting in postings:
-                    try:
-                        self._process_posting(posting, browser=bm.browser)
-                    except Exception as exc:
-                        logger.error(
-                            "Error processing posting %s: %s",
-                            posting.get("external_id", "?"), exc,
-                        )
-                        with self._stats_lock:
-                            self._stats["errors"] += 1
-
-            # Step 3: Auto-export CSV
+            # Postings an earlier run stored but didn't get to process
+            leftover = db.get_unprocessed_postings()
+            if leftover:
+                logger.info("Re-queuing %d postings left unprocessed by an earlier run", len(leftover))
+
+            if self.workers > 1:
+                # Steps 1-3 overlapped: postings are stored and processed
+                # as the source threads scrape them
+                self._scrape_and_process(keywords, backlog=leftover)
+            else:
+                with BrowserManager() as bm:
+                    # Step 1: Collect ALL postings from all sources (shared browser)
+                    postings = self._scrape_all_sources(keywords, browser=bm.browser)
+                    self._stats["postings_scraped"] = len(postings)
+
+                    # Step 2: Store all postings in one transaction (one commit, not one per row)
+                    self._store_postings(postings)
+
+                    # Step 3: Process postings one at a time on the shared browser
+                    self._process_postings(leftover + postings, browser=bm.browser)
+            logger.info(
+                "Scraped %d total postings from %d sources", self._stats["postings_scraped"], len(self.sources),
+            )
+            for source, count in self._stats["postings_by_source"].items():
+                logger.info("  - %s: %d postings", source, count)
+
+            # Step 4: Auto-export CSV
             csv_path = auto_export_after_run()
             if csv_path:
                 logger.info("Auto-exported CSV to %s", csv_path)
@@ -137,28 +323,34 @@ class LeadPipeline:
         """Update the pipeline_runs record with final stats."""
         if not self._run_id:
             return
-        data = {
-            "finished_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-            "status": status,
-            "postings_scraped": self._stats["postings_scraped"],
-            "postings_new": self._stats["postings_new"],
-            "domains_resolved": self._stats["domains_resolved"],
-            "prospects_found": self._stats["prospects_found"],
-            "emails_found": self._stats["emails_found"],
-            "emails_verified": self._stats["emails_verified"],
-            "prospects_added": self._stats["prospects_added_to_snov"],
-            "drafts_created": self._stats["drafts_created"],
-            "errors": self._stats["errors"],
-        }
-        if csv_path:
-            data["csv_path"] = csv_path
-        if error_message:
-            data["error_message"] = error_message
+        stats = db.PipelineRunStats(
+            postings_scraped=self._stats["postings_scraped"],
+            postings_new=self._stats["postings_new"],
+            domains_resolved=self._stats["domains_resolved"],
+            prospects_found=self._stats["prospects_found"],
+            emails_found=self._stats["emails_found"],
+            emails_verified=self._stats["emails_verified"],
+            prospects_added=self._stats["prospects_added_to_snov"],
+            drafts_created=self._stats["drafts_created"],
+            errors=self._stats["errors"],
+        )
         try:
-            db.update_pipeline_run(self._run_id, data)
+            db.finish_pipeline_run(
+                self._run_id,
+                status,
+                stats,
+                csv_path=csv_path,
+                error_message=error_message,
+            )
         except Exception as exc:
             logger.warning("Failed to update pipeline run: %s", exc)
 
+        # A run is the bulk of the day's writes — refresh planner stats
+        try:
+            db.optimize()
+        except Exception as exc:
+            logger.debug("PRAGMA optimize failed: %s", exc)
+
         # Send webhook alert
         try:
             send_pipeline_alert(self._stats, status, error_message=error_message)
@@ -172,80 +364,193 @@ class LeadPipeline:
     def _ensure_snov_list(self) -> Optional[str]:
         """Get or create a Snov.io prospect list for this tool."""
         list_name = "Multi-Source Leads"  # Updated name for multi-source
-        lists = self.snov.get_user_lists()
-        for lst in lists:
-            if lst.get("name") == list_name:
-                logger.info("Using existing Snov list '%s' id=%s", list_name, lst["id"])
-                return str(lst["id"])
-        list_id = self.snov.create_list(list_name)
-        return list_id
+        with _snov_list_lock:
+            if list_name in _snov_list_ids:
+                return _snov_list_ids[list_name]
+
+            list_id = None
+            lists = self.snov.get_user_lists()
+            for lst in lists:
+                if lst.get("name") == list_name:
+                    logger.info("Using existing Snov list '%s' id=%s", list_name, lst["id"])
+                    list_id = str(lst["id"])
+                    break
+            else:
+                list_id = self.snov.create_list(list_name)
+
+            if list_id:
+                _snov_list_ids[list_name] = list_id
+            return list_id
 
     def _scrape_all_sources(self, keywords: list[str], browser=None) -> list[dict]:
         """
-        Scrape job postings from all configured sources.
+        Scrape job postings from all configured sources, one after another.
         Uses incremental scraping to skip already-known postings.
-        Returns combined list of postings with source tracking.
+        Returns combined list of postings with source tracking; cross-source
+        duplicates keep the copy from the earliest source in ``self.sources``.
 
         Args:
             keywords: List of search keywords
             browser: Optional shared Playwright browser instance for reuse
         """
         all_postings = []
-        seen_ids = set()  # Cross-source deduplication by URL
+        # Cross-source deduplication by normalized URL, and by company/title/
+        # location for the same ad mirrored on another site
+        seen_urls = set()
+        seen_jobs = set()
 
         for source in self.sources:
-            logger.info("Scraping source: %s", source)
-            source_count = 0
-
-            # Incremental: load known IDs for this source
-            known_ids = db.get_existing_external_ids(source)
-            logger.info("Source %s: %d existing IDs in DB", source, len(known_ids))
-
             try:
-                if source == 'finn':
-                    for posting in scrape_finn(keywords, known_ids=known_ids, browser=browser):
-                        # Check for duplicates by URL
-                        if posting["url"] not in seen_ids:
-                            seen_ids.add(posting["url"])
-                            all_postings.append(posting)
-                            source_count += 1
-
-                elif source == 'nav':
-                    for posting in scrape_nav(keywords, known_ids=known_ids, browser=browser):
-                        if posting["url"] not in seen_ids:
-                            seen_ids.add(posting["url"])
-                            all_postings.append(posting)
-                            source_count += 1
-
-                elif source == 'karrierestart':
-                    from src.scraper.karrierestart_scraper import scrape_all_keywords as scrape_karrierestart
-                    for posting in scrape_karrierestart(keywords, known_ids=known_ids, browser=browser):
-                        if posting["url"] not in seen_ids:
-                            seen_ids.add(posting["url"])
-                            all_postings.append(posting)
-                            source_count += 1
-
-                elif source == 'jobbnorge':
-                    from src.scraper.jobbnorge_scraper import scrape_all_keywords as scrape_jobbnorge
-                    for posting in scrape_jobbnorge(keywords, known_ids=known_ids, browser=browser):
-                        if posting["url"] not in seen_ids:
-                            seen_ids.add(posting["url"])
-                            all_postings.append(posting)
-                            source_count += 1
-
-                else:
-                    logger.warning("Unknown source: %s", source)
-
-                self._stats["postings_by_source"][source] = source_count
-                logger.info("Source %s: %d postings", source, source_count)
-
+                postings = list(self._scrape_source(source, keywords, browser))
             except Exception as exc:
                 logger.error("Error scraping source %s: %s", source, exc)
                 self._stats["errors"] += 1
                 self._stats["postings_by_source"][source] = 0
+                continue
+
+            source_count = 0
+            for posting in postings:
+                if _first_sighting(posting, seen_urls, seen_jobs):
+                    all_postings.append(posting)
+                    source_count += 1
+
+            self._stats["postings_by_source"][source] = source_count
+            logger.info("Source %s: %d postings", source, source_count)
 
         return all_postings
 
+    def _scrape_and_process(self, keywords: list[str], backlog: list[dict] = ()) -> None:
+        """
+        Scrape, store and process postings at the same time.
+
+        Each source is scraped on its own thread and browser into a bounded
+        queue. This thread deduplicates what arrives, stores it in batches of
+        up to STORE_BATCH_SIZE and hands every new posting to the posting
+        workers, so enrichment starts with the first result page instead of
+        after the last one. The hand-off waits while the workers are busy,
+        which keeps the number of stored but unprocessed postings (and
+        memory) bounded. Cross-source duplicates keep whichever copy
+        arrived first. Already-stored ``backlog`` postings are handed to the
+        workers before anything scraped.
+        """
+        scraped = queue.Queue(maxsize=SCRAPE_QUEUE_SIZE)
+        work = queue.Queue(maxsize=self.workers * WORK_QUEUE_PER_WORKER)
+        stop = threading.Event()
+        seen_urls, seen_jobs = set(), set()
+        counts = dict.fromkeys(self.sources, 0)
+        running = len(self.sources)
+        self._known_emails = db.get_prospect_emails()
+
+        logger.info("Scraping %d sources while processing with %d workers", len(self.sources), self.workers)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=len(self.sources) + self.workers, thread_name_prefix="pipeline",
+            ) as pool:
+                for source in self.sources:
+                    pool.submit(self._feed_source, source, keywords, scraped, stop)
+                workers = [pool.submit(self._posting_worker, work) for _ in range(self.workers)]
+                try:
+                    self._preload_org_numbers(backlog)
+                    for posting in backlog:
+                        if not _hand_off(work, posting, workers):
+                            for future in workers:
+                                future.result()
+                            raise RuntimeError("All posting workers stopped")
+                    while running:
+                        batch = [scraped.get()]
+                        while len(batch) < STORE_BATCH_SIZE:
+                            try:
+                                batch.append(scraped.get_nowait())
+                            except queue.Empty:
+                                break
+
+                        postings = []
+                        for source, posting in batch:
+                            if posting is None:
+                                running -= 1
+                            elif _first_sighting(posting, seen_urls, seen_jobs):
+                                counts[source] += 1
+                                postings.append(posting)
+                        if not postings:
+                            continue
+                        self._store_postings(postings)
+                        pending = [p for p in postings if p.get("id")]
+                        self._preload_org_numbers(pending)
+                        for posting in pending:
+                            if not _hand_off(work, posting, workers):
+                                # Every worker is gone (e.g. its browser failed to start)
+                                for future in workers:
+                                    future.result()
+                                raise RuntimeError("All posting workers stopped")
+                finally:
+                    # On failure, stop the scrapers and unblock any waiting on a full queue
+                    stop.set()
+                    while running:
+                        if scraped.get()[1] is None:
+                            running -= 1
+                    for _ in workers:
+                        if not _hand_off(work, None, workers):
+                            break
+            for future in workers:
+                future.result()
+        finally:
+            self._outreach.flush()
+            self._posting_updates.flush()
+            self._processed.flush()
+            self._stats["postings_scraped"] = sum(counts.values())
+            for source, count in counts.items():
+                self._stats["postings_by_source"][source] = count
+
+    def _feed_source(self, source: str, keywords: list[str], out: queue.Queue, stop: threading.Event) -> None:
+        """
+        Put (source, posting) on ``out`` for each posting scraped from
+        ``source`` on this thread's own browser, then (source, None). No
+        browser is launched when the source's keyword threads bring their own.
+        """
+        try:
+            manager = nullcontext() if self._parallel_keywords(source, keywords) else BrowserManager()
+            with manager as bm:
+                for posting in self._scrape_source(source, keywords, bm.browser if bm else None):
+                    if stop.is_set():
+                        break
+                    out.put((source, posting))
+        except Exception as exc:
+            logger.error("Error scraping source %s: %s", source, exc)
+            with self._stats_lock:
+                self._stats["errors"] += 1
+        finally:
+            out.put((source, None))
+
+    def _scrape_source(self, source: str, keywords: list[str], browser=None) -> Iterable[dict]:
+        """Postings from one source (lazily scraped), skipping external IDs already in the DB."""
+        logger.info("Scraping source: %s", source)
+
+        # Incremental: load known IDs for this source
+        known_ids = db.get_existing_external_ids(source)
+        logger.info("Source %s: %d existing IDs in DB", source, len(known_ids))
+
+        if source == 'finn':
+            scrape = partial(scrape_finn, workers=self._keyword_workers())
+        elif source == 'nav':
+            scrape = partial(scrape_nav, workers=self._keyword_workers())
+        elif source == 'karrierestart':
+            from src.scraper.karrierestart_scraper import scrape_all_keywords as scrape
+        elif source == 'jobbnorge':
+            from src.scraper.jobbnorge_scraper import scrape_all_keywords as scrape
+        else:
+            logger.warning("Unknown source: %s", source)
+            return []
+
+        return scrape(keywords, known_ids=known_ids, browser=browser)
+
+    def _keyword_workers(self) -> int:
+        """Keywords scraped at once per source: one on the shared browser when sequential."""
+        return KEYWORD_WORKERS if self.workers > 1 else 1
+
+    def _parallel_keywords(self, source: str, keywords: list[str]) -> bool:
+        """True when ``source`` scrapes ``keywords`` on keyword threads with their own browsers."""
+        return source in ("finn", "nav") and self._keyword_workers() > 1 and len(keywords) > 1
+
     def _enrich_with_brreg(self, company_name: str, posting_id: int) -> Optional[str]:
         """
         Try to match company to BRREG database and get org_number.
@@ -259,30 +564,23 @@ class LeadPipeline:
             Organization number if found, else None
         """
         # Check if we already have this company in our database
-        # (from previous BRREG import)
-        with db.get_connection() as conn:
-            row = conn.execute(
-                "SELECT org_number FROM companies WHERE LOWER(name) = LOWER(?) LIMIT 1",
-                (company_name,),
-            ).fetchone()
-            if row:
-                org_number = row[0]
-                logger.debug("Matched '%s' to BRREG org=%s (from local DB)", company_name, org_number)
-                with self._stats_lock:
-                    self._stats["brreg_matches"] += 1
-                return org_number
+        # (from previous BRREG import) — preloaded for the run's postings
+        if self._org_numbers is not None and company_name in self._org_numbers:
+            org_number = self._org_numbers[company_name]
+        else:
+            org_number = db.get_org_numbers_by_names([company_name]).get(company_name)
+        if org_number:
+            logger.debug("Matched '%s' to BRREG org=%s (from local DB)", company_name, org_number)
+            with self._stats_lock:
+                self._stats["brreg_matches"] += 1
+            return org_number
 
         # Fuzzy match against local companies table
         try:
             from rapidfuzz import fuzz, process
 
-            with db.get_connection() as conn:
-                all_companies = conn.execute(
-                    "SELECT org_number, name FROM companies"
-                ).fetchall()
-
-            if all_companies:
-                company_names = {row["name"]: row["org_number"] for row in all_companies}
+            company_names = self._company_org_numbers()
+            if company_names:
                 match = process.extractOne(
                     company_name,
                     company_names.keys(),
@@ -304,47 +602,133 @@ class LeadPipeline:
         except Exception as exc:
             logger.debug("Fuzzy match error for '%s': %s", company_name, exc)
 
-        # Try BRREG API name search as fallback
+        # Try BRREG API name search as fallback (once per cleaned name per run)
+        cleaned = self._clean_company_name(company_name)
+        with self._cache_lock:
+            cached = cleaned in self._brreg_api_cache
+            org_number = self._brreg_api_cache.get(cleaned)
+        if not cached:
+            org_number = self._brreg_api_lookup(cleaned, company_name)
+            with self._cache_lock:
+                self._brreg_api_cache[cleaned] = org_number
+        if org_number:
+            logger.debug("BRREG API matched '%s' to org=%s", company_name, org_number)
+            with self._stats_lock:
+                self._stats["brreg_matches"] += 1
+            return org_number
+
+        return None
+
+    def _company_org_numbers(self) -> dict[str, str]:
+        """All local companies (name -> org_number), read once per run on first use."""
+        with self._cache_lock:
+            if self._companies is None:
+                self._companies = db.get_company_org_numbers()
+            return self._companies
+
+    def _brreg_api_lookup(self, cleaned: str, company_name: str) -> Optional[str]:
+        """Org number for ``cleaned`` from the BRREG name search, or None."""
         try:
-            cleaned = self._clean_company_name(company_name)
-            import requests as _req
-            resp = _req.get(
-                "https://data.brreg.no/enhetsregisteret/api/enheter",
-                params={"navn": cleaned, "size": 1},
-                headers={"Accept": "application/json"},
-                timeout=15,
-            )
-            if resp.ok:
-                companies = resp.json().get("_embedded", {}).get("enheter", [])
-                if companies:
-                    if len(companies) == 1:
-                        org_number = companies[0].get("organisasjonsnummer")
-                    else:
-                        # Pick best fuzzy match from API results
-                        try:
-                            from rapidfuzz import fuzz
-                            best_score = 0
-                            best_org = None
-                            for c in companies[:5]:  # Check top 5
-                                score = fuzz.token_sort_ratio(cleaned, c.get("navn", ""))
-                                if score > best_score:
-                                    best_score = score
-                                    best_org = c.get("organisasjonsnummer")
-                            if best_score >= 70:
-                                org_number = best_org
-                            else:
-                                org_number = companies[0].get("organisasjonsnummer")
-                        except ImportError:
-                            org_number = companies[0].get("organisasjonsnummer")
-                    if org_number:
-                        logger.debug("BRREG API matched '%s' to org=%s", company_name, org_number)
-                        with self._stats_lock:
-                            self._stats["brreg_matches"] += 1
-                        return org_number
+            # Reuses the client's session, so the TLS connection is kept alive
+            companies = self.brreg.search_companies_by_name(cleaned)
+            if not companies:
+                return None
+            if len(companies) == 1:
+                return companies[0].get("organisasjonsnummer")
+            # Pick best fuzzy match from API results
+            try:
+                from rapidfuzz import fuzz
+                best_score = 0
+                best_org = None
+                for c in companies[:5]:  # Check top 5
+                    score = fuzz.token_sort_ratio(cleaned, c.get("navn", ""))
+                    if score > best_score:
+                        best_score = score
+                        best_org = c.get("organisasjonsnummer")
+                if best_score >= 70:
+                    return best_org
+            except ImportError:
+                pass
+            return companies[0].get("organisasjonsnummer")
         except Exception as exc:
             logger.debug("BRREG API enrichment failed for '%s': %s", company_name, exc)
+            return None
 
-        return None
+    def _store_postings(self, postings: list[dict]) -> None:
+        """
+        Insert all postings that have a company name in a single transaction.
+        Sets posting["id"] to the new row id, or None if it was already in the DB.
+
+        New rows have processed_at NULL until _process_posting_safely has
+        been through them, so a run that dies in between leaves them for
+        the next run (see run()) rather than losing them to incremental
+        scraping, which treats every stored posting as known.
+        """
+        with db.transaction():
+            for posting in postings:
+                if posting.get("company_name", "").strip():
+                    posting["id"] = db.insert_job_posting(posting)
+
+    def _process_postings(self, postings: list[dict], browser=None) -> None:
+        """
+        Run _process_posting, one at a time on ``browser``, over the postings
+        _store_postings inserted. (With more than one worker, run() uses
+        _scrape_and_process instead.)
+        """
+        pending = [p for p in postings if p.get("id")]
+        self._preload_org_numbers(pending)
+        self._known_emails = db.get_prospect_emails()
+        try:
+            for posting in pending:
+                self._process_posting_safely(posting, browser)
+        finally:
+            self._outreach.flush()
+            self._posting_updates.flush()
+            self._processed.flush()
+
+    def _preload_org_numbers(self, postings: list[dict]) -> None:
+        """One IN-style query for every exact BRREG match ``postings`` will need."""
+        names = {p["company_name"].strip() for p in postings if not p.get("org_number")}
+        if not names:
+            return
+        found = db.get_org_numbers_by_names(names)
+        if self._org_numbers is None:
+            self._org_numbers = {}
+        self._org_numbers.update({name: found.get(name) for name in names})
+
+    def _posting_worker(self, work: queue.Queue) -> None:
+        """Process postings from ``work`` on this thread's own browser until a None arrives."""
+        with BrowserManager() as bm:
+            for posting in iter(work.get, None):
+                self._process_posting_safely(posting, bm.browser)
+
+    def _mark_processed(self, rows: list[tuple]) -> None:
+        """Write the postings' pending enrichment first, so none is marked processed without it."""
+        self._posting_updates.flush()
+        self._outreach.flush()
+        db.mark_postings_processed(rows)
+
+    def _log_outreach(self, entry: dict) -> None:
+        """Queue an outreach_log row (stamped now) for the next batched insert."""
+        entry.setdefault("sent_at", datetime.now(timezone.utc).replace(tzinfo=None).isoformat())
+        self._outreach.add(entry)
+
+    def _process_posting_safely(self, posting: dict, browser) -> None:
+        """
+        _process_posting, counting a failure as an error instead of aborting
+        the run. Either way the posting is then queued to be marked processed.
+        """
+        try:
+            self._process_posting(posting, browser=browser)
+        except Exception as exc:
+            logger.error(
+                "Error processing posting %s: %s",
+                posting.get("external_id", "?"), exc,
+            )
+            with self._stats_lock:
+                self._stats["errors"] += 1
+        if posting.get("id"):
+            self._processed.add((datetime.now(timezone.utc).replace(tzinfo=None).isoformat(), posting["id"]))
 
     def _process_posting(self, posting: dict, browser=None) -> None:
         """Process a single job posting through the full pipeline."""
@@ -356,14 +740,21 @@ class LeadPipeline:
             logger.debug("Skipping posting %s from %s -- no company name", external_id, source)
             return
 
-        # 1. Store job posting (skip if already in DB)
-        posting_id = db.insert_job_posting(posting)
+        # 1. Store job posting (skip if already in DB) — normally done in bulk by _store_postings
+        posting_id = posting["id"] if "id" in posting else db.insert_job_posting(posting)
         if posting_id is None:
             logger.debug("Posting %s (%s) already in DB, skipping", external_id, source)
             return
         with self._stats_lock:
             self._stats["postings_new"] += 1
 
+        # Domain resolution already failed for this company earlier in the run
+        if not posting.get("company_domain") and self._company_domains.get(company_name.casefold(), "") is None:
+            logger.debug("Skipping posting %s -- no domain found for '%s' earlier in run", external_id, company_name)
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            return
+
         logger.info("Processing [%s]: %s -- %s", source, company_name, posting.get("title"))
 
         # 2. BRREG Enrichment: Try to match company and get org_number
@@ -381,15 +772,29 @@ class LeadPipeline:
                 self._stats["errors"] += 1
             return
 
-        # Update posting with domain and org_number
-        with db.get_connection() as conn:
-            conn.execute(
-                "UPDATE job_postings SET company_domain = ?, org_number = ? WHERE id = ?",
-                (domain, org_number, posting_id),
-            )
+        # Update posting with domain and org_number (batched)
+        self._posting_updates.add((domain, org_number, posting_id))
         with self._stats_lock:
             self._stats["domains_resolved"] += 1
 
+        # Contact discovery runs once per domain per run: the first posting
+        # to get here scrapes/queries it, the rest would only re-find emails
+        # that are already prospects (and spend Snov.io calls doing so)
+        with self._cache_lock:
+            if domain in self._claimed_domains:
+                logger.debug("Contacts for %s already handled this run", domain)
+                return
+            self._claimed_domains.add(domain)
+        try:
+            self._discover_contacts(domain, posting_id, posting, browser=browser)
+        except Exception:
+            # Let a later posting for this domain try again
+            with self._cache_lock:
+                self._claimed_domains.discard(domain)
+            raise
+
+    def _discover_contacts(self, domain: str, posting_id: int, posting: dict, browser=None) -> None:
+        """Find, verify and store the contacts for a posting's (newly claimed) domain."""
         # 3. Primary: scrape emails directly from the company website
         # Returns list of {"email": str, "title": str, "name": str}
         # Check website cache first
@@ -400,6 +805,19 @@ class LeadPipeline:
         if website_contacts:
             with self._stats_lock:
                 self._stats["prospects_found"] += len(website_contacts)
+            # One Snov.io verification task for every new address on the site
+            new_emails = [
+                email for email in dict.fromkeys(c["email"] for c in website_contacts)
+                if not self._email_known(email)
+            ]
+            try:
+                statuses = self.snov.verify_emails(new_emails)
+            except Exception:
+                statuses = {}
+            # Snov.io may echo an address in different case; addresses it
+            # returned no result for get None, i.e. _process_raw_email's
+            # own per-address verification
+            statuses = {email.casefold(): status for email, status in statuses.items()}
             for contact in website_contacts:
                 self._process_raw_email(
                     contact["email"],
@@ -408,6 +826,7 @@ class LeadPipeline:
                     posting,
                     title=contact.get("title", ""),
                     scraped_name=contact.get("name", ""),
+                    smtp_status=statuses.get(contact["email"].casefold()),
                 )
             return  # done for this posting
 
@@ -432,28 +851,40 @@ class LeadPipeline:
         Strip department prefixes and suffixes from Norwegian company names
         so Snov.io can match them.
         """
-        import re as _re
         name = raw.strip()
 
         # If comma-separated, take the LAST segment (usually the actual company)
         if "," in name:
-            name = name.split(",")[-1].strip()
+            name = name.rpartition(",")[2].strip()
 
-        # Remove legal suffixes
-        for suffix in [" HF", " AS", " ASA", " KF", " SF", " IKS", ", Norway"]:
-            if name.upper().endswith(suffix.upper()):
+        # Remove legal suffixes (in order, so "X AS HF" loses both);
+        # only re-uppercase after a suffix was actually removed
+        upper = name.upper()
+        for suffix in _LEGAL_SUFFIXES:
+            if upper.endswith(suffix):
                 name = name[: -len(suffix)].strip()
+                upper = name.upper()
 
         # Collapse extra whitespace
-        name = _re.sub(r"\s+", " ", name).strip()
-        return name
+        return _WHITESPACE_RE.sub(" ", name).strip()
 
     def _resolve_domain(self, company_name: str, posting: dict, browser=None) -> Optional[str]:
-        """Try multiple strategies to resolve the company domain."""
+        """Try multiple strategies to resolve the company domain (once per company per run)."""
         # Strategy 1: Already in posting data
         if posting.get("company_domain"):
             return posting["company_domain"]
 
+        key = company_name.casefold()
+        with self._cache_lock:
+            if key in self._company_domains:
+                return self._company_domains[key]
+        domain = self._lookup_domain(company_name, posting, browser=browser)
+        with self._cache_lock:
+            self._company_domains[key] = domain
+        return domain
+
+    def _lookup_domain(self, company_name: str, posting: dict, browser=None) -> Optional[str]:
+        """Strategies 2 and 3 of _resolve_domain: the posting page, then Snov.io."""
         # Strategy 2: Scrape the company's homepage link from the finn.no posting page
         posting_url = posting.get("url")
         if posting_url:
@@ -461,14 +892,26 @@ class LeadPipeline:
             if domain:
                 return domain
 
-        # Strategy 3: Snov.io with cleaned company name (fallback)
+        # Strategy 3: Snov.io with cleaned company name (fallback, once per run)
         cleaned = self._clean_company_name(company_name)
-        domain = self.snov.find_domain_by_company_name(cleaned)
+        with self._cache_lock:
+            cached = cleaned in self._domain_cache
+            domain = self._domain_cache.get(cleaned)
+        if not cached:
+            domain = self.snov.find_domain_by_company_name(cleaned)
+            with self._cache_lock:
+                self._domain_cache[cleaned] = domain
         if domain:
             return domain
 
         return None
 
+    def _email_known(self, email: str) -> bool:
+        """db.email_exists, answered from the run's preloaded email set when there is one."""
+        if self._known_emails is not None:
+            return email in self._known_emails
+        return db.email_exists(email)
+
     def _process_raw_email(
         self,
         email: str,
@@ -477,12 +920,14 @@ class LeadPipeline:
         posting: dict,
         title: str = "",
         scraped_name: str = "",
+        smtp_status: str = None,
     ) -> None:
         """
         Handle an email found directly from the company website.
         title and scraped_name come from the website scraper's context parsing.
+        smtp_status is the result of a batch verification, if already done.
         """
-        if db.email_exists(email):
+        if self._email_known(email):
             logger.debug("Email %s already in DB, skipping", email)
             return
 
@@ -490,12 +935,12 @@ class LeadPipeline:
             self._stats["emails_found"] += 1
 
         # Try to verify via Snov.io (uses credits but prevents bounces)
-        smtp_status = "unknown"
-        try:
-            verified = self.snov.verify_email(email)
-            smtp_status = verified or "unknown"
-        except Exception:
-            smtp_status = "unknown"
+        if smtp_status is None:
+            try:
+                verified = self.snov.verify_email(email)
+                smtp_status = verified or "unknown"
+            except Exception:
+                smtp_status = "unknown"
 
         if smtp_status == "not_valid":
             logger.info("Email %s failed verification, skipping", email)
@@ -538,6 +983,8 @@ class LeadPipeline:
         prospect_id = db.insert_prospect(prospect_record)
         if not prospect_id:
             return
+        if self._known_emails is not None:
+            self._known_emails.add(email)
 
         # Auto-draft email campaign for this prospect
         try:
@@ -554,7 +1001,7 @@ class LeadPipeline:
             if added:
                 with self._stats_lock:
                     self._stats["prospects_added_to_snov"] += 1
-                db.log_outreach({
+                self._log_outreach({
                     "prospect_id": prospect_id,
                     "campaign_id": self.snov_list_id,
                     "status": "added_to_snov",
@@ -589,7 +1036,7 @@ class LeadPipeline:
             self._stats["emails_found"] += 1
 
         # 6. Skip if already contacted
-        if db.email_exists(email):
+        if self._email_known(email):
             logger.debug("Email %s already in DB, skipping", email)
             return
 
@@ -626,6 +1073,8 @@ class LeadPipeline:
         prospect_id = db.insert_prospect(prospect_record)
         if not prospect_id:
             return
+        if self._known_emails is not None:
+            self._known_emails.add(email)
 
         # Auto-draft email campaign for this prospect
         try:
@@ -642,7 +1091,7 @@ class LeadPipeline:
             if added:
                 with self._stats_lock:
                     self._stats["prospects_added_to_snov"] += 1
-                db.log_outreach({
+                self._log_outreach({
                     "prospect_id": prospect_id,
                     "campaign_id": self.snov_list_id,
                     "status": "added_to_snov",
@@ -16,6 +16,11 @@ from src.pipeline.lead_pipeline import LeadPipeline
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Longest single sleep between schedule checks. The loop otherwise sleeps
+# until the next job is due; the cap bounds how late a run can start if
+# the wall clock jumps (NTP correction, suspend/resume) during the wait.
+MAX_IDLE_SECONDS = 3600
+
 
 def _get_keywords() -> list[str]:
     raw = os.getenv("FINN_KEYWORDS", "seafood,aquaculture,sjømat,biologi")
@@ -37,7 +42,14 @@ def run_pipeline() -> None:
 def start_scheduler(run_time: str = "09:30") -> None:
     logger.info("Scheduler started. Pipeline will run daily at %s", run_time)
     schedule.every().day.at(run_time).do(run_pipeline)
+    run_schedule_forever()
+
 
+def run_schedule_forever() -> None:
+    """Run due jobs, then sleep until the next one is due (at most MAX_IDLE_SECONDS)."""
     while True:
         schedule.run_pending()
-        time.sleep(30)  # check every 30 seconds
+        idle = schedule.idle_seconds()
+        if idle is None:
+            idle = MAX_IDLE_SECONDS
+        time.sleep(min(max(idle, 1), MAX_IDLE_SECONDS))
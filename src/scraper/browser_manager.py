@@ -4,8 +4,13 @@ Creates ONE Playwright browser instance for the entire pipeline run.
 Supports optional proxy and stealth mode.
 """
 
+import atexit
 import os
 import logging
+import queue
+import threading
+from typing import Callable, Iterator
+
 from playwright.sync_api import sync_playwright
 
 logger = logging.getLogger(__name__)
@@ -79,3 +84,112 @@ class BrowserManager:
     @property
     def browser(self):
         return self._browser
+
+
+# Postings scrape_keywords_in_parallel buffers before its keyword threads
+# wait for the caller to catch up
+KEYWORD_RESULTS_SIZE = 100
+# Seconds a keyword thread waits on a full buffer before rechecking for stop
+_PUT_POLL_SECONDS = 0.5
+
+# The BrowserManager thread_browser() started on each thread
+_thread_local = threading.local()
+
+
+def thread_browser():
+    """
+    Browser for scraper calls made without a shared ``browser``: launched on
+    the calling thread's first call and reused by its later ones, instead of
+    starting Chromium per call. One per thread, since Playwright's sync API
+    only works on the thread that started it — so it must also be closed
+    there: other threads call close_thread_browser() before they end; the
+    main thread's is closed at exit.
+    """
+    manager = getattr(_thread_local, "manager", None)
+    if manager is None:
+        manager = BrowserManager().__enter__()
+        _thread_local.manager = manager
+    return manager.browser
+
+
+def close_thread_browser() -> None:
+    """Close the browser thread_browser() started on the calling thread, if any."""
+    manager = getattr(_thread_local, "manager", None)
+    if manager is not None:
+        _thread_local.manager = None
+        manager.__exit__(None, None, None)
+
+
+# Runs on the main thread, so only closes the main thread's browser
+atexit.register(close_thread_browser)
+
+
+def scrape_keywords_in_parallel(
+    scrape_keyword: Callable[..., Iterator[dict]],
+    keywords: list[str],
+    workers: int,
+    **kwargs,
+) -> Iterator[dict]:
+    """
+    Yield every posting ``scrape_keyword(keyword, browser=..., **kwargs)``
+    produces for ``keywords``, scraping up to ``workers`` keywords at once.
+
+    Each worker thread drives its own BrowserManager and takes the next
+    keyword when it finishes one. Postings are yielded as they arrive, so
+    keywords interleave. At most KEYWORD_RESULTS_SIZE postings are
+    buffered, so the workers slow down with a slow consumer. An exception
+    from scrape_keyword stops the other workers and is re-raised here.
+    """
+    todo = queue.SimpleQueue()
+    for keyword in keywords:
+        todo.put(keyword)
+    results = queue.Queue(maxsize=KEYWORD_RESULTS_SIZE)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item) -> bool:
+        # Once stop is set nobody reads ``results`` any more; give up
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker() -> None:
+        try:
+            with BrowserManager() as bm:
+                while not stop.is_set():
+                    try:
+                        keyword = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    for posting in scrape_keyword(keyword, browser=bm.browser, **kwargs):
+                        if not put(posting):
+                            return
+        except Exception as exc:
+            put(exc)
+        finally:
+            put(finished)
+
+    threads = [
+        threading.Thread(target=worker, name=f"keyword-{i}", daemon=True)
+        for i in range(max(1, min(workers, len(keywords))))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        running = len(threads)
+        while running:
+            item = results.get()
+            if item is finished:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -10,7 +10,9 @@ from typing import Generator
 
 from urllib.parse import urlparse
 
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PWTimeout
+from playwright.sync_api import Page, TimeoutError as PWTimeout
+
+from src.scraper.browser_manager import USER_AGENT, scrape_keywords_in_parallel, thread_browser
 
 logger = logging.getLogger(__name__)
 
@@ -30,46 +32,26 @@ def scrape_company_domain(posting_url: str, browser=None) -> str | None:
     """
     try:
         if browser is None:
-            # Standalone mode — create own browser
-            with sync_playwright() as pw:
-                br = pw.chromium.launch(headless=True)
-                page = br.new_page()
-                page.goto(posting_url, wait_until="domcontentloaded", timeout=20000)
-                try:
-                    page.click("button:has-text('Godta alle')", timeout=2000)
-                except Exception:
-                    pass
-                link_el = page.query_selector("a:has-text('Hjemmeside')")
-                if link_el:
-                    href = link_el.get_attribute("href") or ""
-                    if href:
-                        parsed = urlparse(href)
-                        domain = parsed.netloc.lstrip("www.")
-                        br.close()
-                        logger.debug("Found domain from finn.no posting: %s -> %s", posting_url, domain)
-                        return domain
-                br.close()
-        else:
-            # Shared browser mode — create a context, use it, close it
-            from src.scraper.browser_manager import USER_AGENT
-            ctx = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
-            page = ctx.new_page()
+            # Standalone mode — reuse this thread's browser across calls
+            browser = thread_browser()
+        ctx = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
+        page = ctx.new_page()
+        try:
+            page.goto(posting_url, wait_until="domcontentloaded", timeout=20000)
             try:
-                page.goto(posting_url, wait_until="domcontentloaded", timeout=20000)
-                try:
-                    page.click("button:has-text('Godta alle')", timeout=2000)
-                except Exception:
-                    pass
-                link_el = page.query_selector("a:has-text('Hjemmeside')")
-                if link_el:
-                    href = link_el.get_attribute("href") or ""
-                    if href:
-                        parsed = urlparse(href)
-                        domain = parsed.netloc.lstrip("www.")
-                        logger.debug("Found domain from finn.no posting: %s -> %s", posting_url, domain)
-                        return domain
-            finally:
-                ctx.close()
+                page.click("button:has-text('Godta alle')", timeout=2000)
+            except Exception:
+                pass
+            link_el = page.query_selector("a:has-text('Hjemmeside')")
+            if link_el:
+                href = link_el.get_attribute("href") or ""
+                if href:
+                    parsed = urlparse(href)
+                    domain = parsed.netloc.lstrip("www.")
+                    logger.debug("Found domain from finn.no posting: %s -> %s", posting_url, domain)
+                    return domain
+        finally:
+            ctx.close()
     except Exception as exc:
         logger.debug("scrape_company_domain error for %s: %s", posting_url, exc)
     return None
@@ -272,32 +254,38 @@ def scrape_keyword(keyword: str, max_pages: int = 5, browser=None, known_ids: se
                 break
 
     if browser is None:
-        # Standalone mode — create own browser
-        with sync_playwright() as pw:
-            br = pw.chromium.launch(headless=True)
-            context = br.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/124.0.0.0 Safari/537.36"
-                ),
-                locale="nb-NO",
-            )
-            yield from _scrape_with_context(context)
-            br.close()
-    else:
-        # Shared browser mode
-        from src.scraper.browser_manager import USER_AGENT
-        context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
-        try:
-            yield from _scrape_with_context(context)
-        finally:
-            context.close()
+        # Standalone mode — reuse this thread's browser across calls
+        browser = thread_browser()
+    context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
+    try:
+        yield from _scrape_with_context(context)
+    finally:
+        context.close()
 
     logger.info("Scraped %d postings for keyword '%s'", total, keyword)
 
 
-def scrape_all_keywords(keywords: list[str], max_pages: int = 5, browser=None, known_ids: set = None) -> Generator[dict, None, None]:
+def _scrape_keywords(keywords: list[str], max_pages: int, browser, known_ids: set, workers: int):
+    """scrape_keyword postings for every keyword, in parallel when ``workers`` > 1."""
+    keywords = [keyword.strip() for keyword in keywords]
+    if workers > 1 and len(keywords) > 1:
+        return scrape_keywords_in_parallel(
+            scrape_keyword, keywords, workers, max_pages=max_pages, known_ids=known_ids,
+        )
+    return (
+        posting
+        for keyword in keywords
+        for posting in scrape_keyword(keyword, max_pages=max_pages, browser=browser, known_ids=known_ids)
+    )
+
+
+def scrape_all_keywords(
+    keywords: list[str],
+    max_pages: int = 5,
+    browser=None,
+    known_ids: set = None,
+    workers: int = 1,
+) -> Generator[dict, None, None]:
     """
     Scrape finn.no for all keywords. Deduplicates by finn_id across keywords.
 
@@ -306,14 +294,15 @@ def scrape_all_keywords(keywords: list[str], max_pages: int = 5, browser=None, k
         max_pages: Maximum pages per keyword
         browser: Optional shared Playwright browser instance for reuse
         known_ids: Optional set of external_ids already in DB (for incremental scraping)
+        workers: Keywords scraped at once; above 1 each runs on a worker
+                 thread with its own browser (``browser`` is not used)
     """
     seen_ids: set[str] = set()
-    for keyword in keywords:
-        for posting in scrape_keyword(keyword.strip(), max_pages=max_pages, browser=browser, known_ids=known_ids):
-            finn_id = posting["finn_id"]
-            if finn_id not in seen_ids:
-                seen_ids.add(finn_id)
-                posting["scraped_at"] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
-                yield posting
-            else:
-                logger.debug("Duplicate finn_id=%s skipped", finn_id)
+    for posting in _scrape_keywords(keywords, max_pages, browser, known_ids, workers):
+        finn_id = posting["finn_id"]
+        if finn_id not in seen_ids:
+            seen_ids.add(finn_id)
+            posting["scraped_at"] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+            yield posting
+        else:
+            logger.debug("Duplicate finn_id=%s skipped", finn_id)
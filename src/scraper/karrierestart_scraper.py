@@ -8,7 +8,9 @@ import re
 from datetime import datetime, timezone
 from typing import Generator
 
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PWTimeout
+from playwright.sync_api import Page, TimeoutError as PWTimeout
+
+from src.scraper.browser_manager import USER_AGENT, thread_browser
 
 logger = logging.getLogger(__name__)
 
@@ -134,25 +136,14 @@ def scrape_keyword(keyword: str, max_pages: int = 5, browser=None, known_ids: se
     total = 0
 
     if browser is None:
-        with sync_playwright() as pw:
-            browser_local = pw.chromium.launch(headless=True)
-            context = browser_local.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-                locale="nb-NO",
-            )
-            page = context.new_page()
-            for posting in _scrape_pages(page, keyword, max_pages, known_ids):
-                yield posting
-                total += 1
-            browser_local.close()
-    else:
-        from src.scraper.browser_manager import USER_AGENT
-        context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
-        page = context.new_page()
-        for posting in _scrape_pages(page, keyword, max_pages, known_ids):
-            yield posting
-            total += 1
-        context.close()
+        # Standalone mode — reuse this thread's browser across calls
+        browser = thread_browser()
+    context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
+    page = context.new_page()
+    for posting in _scrape_pages(page, keyword, max_pages, known_ids):
+        yield posting
+        total += 1
+    context.close()
 
     logger.info("Scraped %d postings from karrierestart.no for '%s'", total, keyword)
 
@@ -10,7 +10,9 @@ import logging
 import re
 from datetime import datetime, timezone
 from typing import Generator
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PWTimeout
+from playwright.sync_api import Page, TimeoutError as PWTimeout
+
+from src.scraper.browser_manager import USER_AGENT, scrape_keywords_in_parallel, thread_browser
 
 logger = logging.getLogger(__name__)
 
@@ -69,9 +71,43 @@ def _parse_nav_date(text: str) -> str | None:
     return None
 
 
+# Norwegian counties; a card line naming one is the job's location
+_COUNTIES = (
+    "OSLO", "VIKEN", "ROGALAND", "VESTLAND", "TRØNDELAG",
+    "NORDLAND", "TROMS", "FINNMARK", "MØRE", "AGDER",
+)
+
+# Runs in the page and returns one entry per job link with the text of its
+# card, so a result page costs one round-trip instead of several per card
+_EXTRACT_CARDS_JS = """
+() => Array.from(document.querySelectorAll("a[href*='/stillinger/stilling/']"), (link) => {
+    // Nearest article/section or job data-testid ancestor (max 5 levels up), else the link
+    let card = link;
+    for (let el = link.parentElement, depth = 0; el && depth < 5; el = el.parentElement, depth++) {
+        const testId = (el.getAttribute("data-testid") || "").toLowerCase();
+        if (el.tagName === "ARTICLE" || el.tagName === "SECTION"
+                || testId.includes("job") || testId.includes("stilling")) {
+            card = el;
+            break;
+        }
+    }
+    const heading = card.querySelector("h2, h3, h4, [role='heading']");
+    const time = card.querySelector("time");
+    return {
+        href: link.getAttribute("href") || "",
+        title: heading ? heading.innerText : link.innerText,
+        text: card.innerText,
+        datetime: time ? time.getAttribute("datetime") : null,
+    };
+})
+"""
+
+
 def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
     """
     Parse all job cards on a NAV search result page.
+    The cards are read in one page.evaluate call (_EXTRACT_CARDS_JS);
+    fields are then picked out of each card's text here.
     """
     results = []
 
@@ -82,16 +118,14 @@ def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
         logger.warning("No job listings found for keyword '%s'", keyword)
         return results
 
-    # Find all job posting links
-    job_links = page.query_selector_all("a[href*='/stillinger/stilling/']")
-
-    logger.debug("Found %d job links on page", len(job_links))
+    cards = page.evaluate(_EXTRACT_CARDS_JS)
+    logger.debug("Found %d job links on page", len(cards))
 
     seen_ids = set()
 
-    for link in job_links:
+    for card in cards:
         try:
-            href = link.get_attribute("href") or ""
+            href = card["href"]
             if not href:
                 continue
 
@@ -106,41 +140,14 @@ def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
                 continue
             seen_ids.add(job_id)
 
-            # Get the parent container (job card)
-            # NAV uses various structures, try multiple approaches
-            container = link
-
-            # Try to find a better container (parent article, section, or div with data-testid)
-            for _ in range(5):  # Walk up max 5 levels
-                parent = container.evaluate_handle("el => el.parentElement").as_element()
-                if parent:
-                    tag = parent.evaluate("el => el.tagName").lower()
-                    if tag in ["article", "section"]:
-                        container = parent
-                        break
-                    test_id = parent.get_attribute("data-testid") or ""
-                    if "job" in test_id.lower() or "stilling" in test_id.lower():
-                        container = parent
-                        break
-                else:
-                    break
-
-            # Extract title
-            title = ""
-            # Try h2, h3, heading elements first
-            title_el = container.query_selector("h2, h3, h4, [role='heading']")
-            if title_el:
-                title = title_el.inner_text().strip()
-            else:
-                # Fallback: use link text
-                title = link.inner_text().strip()
-
+            # Heading text of the card, or the link text
+            title = (card["title"] or "").strip()
             if not title:
                 continue
 
             # Extract company name
             # Look for text near "Arbeidsgiver:" or employer-related keywords
-            container_text = container.inner_text()
+            container_text = card["text"] or ""
             company = ""
 
             # Common patterns in NAV
@@ -154,10 +161,7 @@ def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
                     # Skip first line (title), take next non-location line
                     for line in lines[1:]:
                         # Skip if it looks like a location (contains county or "Sted:")
-                        if any(county in line.upper() for county in [
-                            "OSLO", "VIKEN", "ROGALAND", "VESTLAND", "TRØNDELAG",
-                            "NORDLAND", "TROMS", "FINNMARK", "MØRE", "AGDER",
-                        ]):
+                        if any(county in line.upper() for county in _COUNTIES):
                             continue
                         if "Sted:" in line:
                             continue
@@ -172,10 +176,7 @@ def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
             else:
                 # Look for Norwegian county names
                 for line in container_text.split("\n"):
-                    if any(county in line.upper() for county in [
-                        "OSLO", "VIKEN", "ROGALAND", "VESTLAND", "TRØNDELAG",
-                        "NORDLAND", "TROMS", "FINNMARK", "MØRE", "AGDER",
-                    ]):
+                    if any(county in line.upper() for county in _COUNTIES):
                         location = line.strip()
                         break
 
@@ -185,11 +186,9 @@ def _parse_listing_page(page: Page, keyword: str) -> list[dict]:
             if date_match:
                 published_at = _parse_nav_date(date_match.group(1).strip())
             if not published_at:
-                time_el = container.query_selector("time")
-                if time_el:
-                    dt_attr = time_el.get_attribute("datetime")
-                    if dt_attr:
-                        published_at = dt_attr[:10] if len(dt_attr) >= 10 else dt_attr
+                dt_attr = card["datetime"]
+                if dt_attr:
+                    published_at = dt_attr[:10] if len(dt_attr) >= 10 else dt_attr
 
             results.append({
                 "nav_id": job_id,
@@ -312,32 +311,38 @@ def scrape_keyword(keyword: str, max_pages: int = 5, browser=None, known_ids: se
                 break
 
     if browser is None:
-        # Standalone mode — create own browser
-        with sync_playwright() as pw:
-            br = pw.chromium.launch(headless=True)
-            context = br.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/124.0.0.0 Safari/537.36"
-                ),
-                locale="nb-NO",
-            )
-            yield from _scrape_with_context(context)
-            br.close()
-    else:
-        # Shared browser mode
-        from src.scraper.browser_manager import USER_AGENT
-        context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
-        try:
-            yield from _scrape_with_context(context)
-        finally:
-            context.close()
+        # Standalone mode — reuse this thread's browser across calls
+        browser = thread_browser()
+    context = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
+    try:
+        yield from _scrape_with_context(context)
+    finally:
+        context.close()
 
     logger.info("Scraped %d postings from NAV for keyword '%s'", total, keyword)
 
 
-def scrape_all_keywords(keywords: list[str], max_pages: int = 5, browser=None, known_ids: set = None) -> Generator[dict, None, None]:
+def _scrape_keywords(keywords: list[str], max_pages: int, browser, known_ids: set, workers: int):
+    """scrape_keyword postings for every keyword, in parallel when ``workers`` > 1."""
+    keywords = [keyword.strip() for keyword in keywords]
+    if workers > 1 and len(keywords) > 1:
+        return scrape_keywords_in_parallel(
+            scrape_keyword, keywords, workers, max_pages=max_pages, known_ids=known_ids,
+        )
+    return (
+        posting
+        for keyword in keywords
+        for posting in scrape_keyword(keyword, max_pages=max_pages, browser=browser, known_ids=known_ids)
+    )
+
+
+def scrape_all_keywords(
+    keywords: list[str],
+    max_pages: int = 5,
+    browser=None,
+    known_ids: set = None,
+    workers: int = 1,
+) -> Generator[dict, None, None]:
     """
     Scrape NAV for all keywords. Deduplicates by nav_id across keywords.
 
@@ -346,17 +351,18 @@ def scrape_all_keywords(keywords: list[str], max_pages: int = 5, browser=None, k
         max_pages: Maximum pages per keyword
         browser: Optional shared Playwright browser instance for reuse
         known_ids: Optional set of external_ids already in DB (for incremental scraping)
+        workers: Keywords scraped at once; above 1 each runs on a worker
+                 thread with its own browser (``browser`` is not used)
 
     Yields:
         Job posting dicts
     """
     seen_ids: set[str] = set()
 
-    for keyword in keywords:
-        for posting in scrape_keyword(keyword.strip(), max_pages=max_pages, browser=browser, known_ids=known_ids):
-            job_id = posting["nav_id"]
-            if job_id not in seen_ids:
-                seen_ids.add(job_id)
-                yield posting
-            else:
-                logger.debug("Duplicate nav_id=%s skipped", job_id)
+    for posting in _scrape_keywords(keywords, max_pages, browser, known_ids, workers):
+        job_id = posting["nav_id"]
+        if job_id not in seen_ids:
+            seen_ids.add(job_id)
+            yield posting
+        else:
+            logger.debug("Duplicate nav_id=%s skipped", job_id)
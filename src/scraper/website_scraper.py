@@ -17,7 +17,9 @@ import logging
 import re
 from typing import Optional
 
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from src.scraper.browser_manager import USER_AGENT, thread_browser
 
 logger = logging.getLogger(__name__)
 
@@ -303,29 +305,14 @@ def scrape_emails_from_website(domain: str, timeout_sec: int = 20, browser=None)
 
     try:
         if browser is None:
-            # Standalone mode — create own browser
-            with sync_playwright() as pw:
-                br = pw.chromium.launch(headless=True)
-                context = br.new_context(
-                    user_agent=(
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/124.0.0.0 Safari/537.36"
-                    ),
-                    locale="nb-NO",
-                )
-                page = context.new_page()
-                _scrape_pages(page, domain, base_url, timeout_sec, found)
-                br.close()
-        else:
-            # Shared browser mode
-            from src.scraper.browser_manager import USER_AGENT
-            ctx = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
-            page = ctx.new_page()
-            try:
-                _scrape_pages(page, domain, base_url, timeout_sec, found)
-            finally:
-                ctx.close()
+            # Standalone mode — reuse this thread's browser across calls
+            browser = thread_browser()
+        ctx = browser.new_context(user_agent=USER_AGENT, locale="nb-NO")
+        page = ctx.new_page()
+        try:
+            _scrape_pages(page, domain, base_url, timeout_sec, found)
+        finally:
+            ctx.close()
 
     except Exception as exc:
         logger.warning("scrape_emails_from_website failed for %s: %s", domain, exc)
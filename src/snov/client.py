@@ -262,34 +262,52 @@ class SnovClient:
         """
         Verify an email address. Returns 'valid', 'not_valid', or 'unknown'.
         Uses Snov.io v2 async endpoint.
+        """
+        return self.verify_emails([email]).get(email)
+
+    def verify_emails(self, emails: list[str]) -> dict[str, Optional[str]]:
+        """
+        Verify several addresses with one v2 verification task (one start
+        call and one poll loop instead of one of each per address).
+        Returns {email: smtp_status}; addresses without a result are left out.
         Response shape: {"data": [{"email": "...", "result": {"smtp_status": "..."}}]}
         """
+        if not emails:
+            return {}
         try:
             start = self._post(
-                "/v2/email-verification/start", {"emails": [email]}
+                "/v2/email-verification/start", {"emails": list(emails)}
             )
             task_hash = (start.get("data") or {}).get("task_hash") or start.get("task_hash")
             if not task_hash:
-                return None
+                return {}
 
             # Verification can take 5-15s — poll with longer wait
             result = self._poll("/v2/email-verification/result", task_hash, max_wait=60)
             if not result:
-                return None
+                return {}
 
             items = result.get("data") or []
-            if isinstance(items, list) and items:
-                item = items[0]
+            if not isinstance(items, list):
+                return {}
+            if len(emails) == 1:
+                # A single-address task answers for that address
+                items = [{**items[0], "email": emails[0]}] if items else []
+            statuses = {}
+            for item in items:
                 # v2 nests the status under "result" sub-object
                 smtp_status = (
                     (item.get("result") or {}).get("smtp_status")
                     or item.get("smtp_status")
                 )
-                logger.info("Email %s verification: %s", email, smtp_status)
-                return smtp_status
+                email = item.get("email")
+                if email:
+                    logger.info("Email %s verification: %s", email, smtp_status)
+                    statuses[email] = smtp_status
+            return statuses
         except Exception as exc:
             logger.error("verify_email error: %s", exc)
-        return None
+        return {}
 
     # ------------------------------------------------------------------
     # Profile enrichment
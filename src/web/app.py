@@ -6,7 +6,6 @@ Run with: python main.py --web
 import logging
 import os
 import threading
-import time
 
 import schedule
 from flask import Flask
@@ -55,6 +54,7 @@ def create_app() -> Flask:
 def _run_scheduler(run_time: str) -> None:
     """Background thread: runs the pipeline on a daily schedule."""
     from src.pipeline.lead_pipeline import LeadPipeline
+    from src.scheduler.runner import run_schedule_forever
 
     keywords = [
         k.strip()
@@ -73,10 +73,7 @@ def _run_scheduler(run_time: str) -> None:
 
     schedule.every().day.at(run_time).do(_job)
     logger.info("Background scheduler started — pipeline runs daily at %s", run_time)
-
-    while True:
-        schedule.run_pending()
-        time.sleep(30)
+    run_schedule_forever()
 
 
 def start_web(host: str = "127.0.0.1", port: int = 5000, with_scheduler: bool = True) -> None:
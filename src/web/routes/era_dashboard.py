@@ -17,6 +17,7 @@ from src.era.pdf_extractor import (
     extract_contract_data_ml,
     extract_financial_statement_ml,
     extract_generic_data_ml,
+    load_pdf_pages,
 )
 
 logger = logging.getLogger(__name__)
@@ -78,11 +79,11 @@ def upload_pdf():
             thread.start()
 
             uploaded.append({"upload_id": upload_id, "filename": filename})
-            logger.info(f"PDF upload started: {filename} (id={upload_id})")
+            logger.info("PDF upload started: %s (id=%s)", filename, upload_id)
 
         except Exception as exc:
             errors.append({"filename": filename, "error": str(exc)})
-            logger.error(f"PDF upload error for {filename}: {exc}")
+            logger.error("PDF upload error for %s: %s", filename, exc)
 
     total = len(uploaded)
     if total == 0 and not errors:
@@ -173,23 +174,26 @@ def _extract_pdf_background(upload_id: int, pdf_path: str):
         db.init_db()
         db.update_pdf_status(upload_id, "processing")
 
+        # Parse once; the classifier and the extractor share the pages
+        pages = load_pdf_pages(pdf_path)
+
         # Detect document type (invoice, contract, statement, or generic)
-        doc_type = _detect_document_type(pdf_path)
-        logger.info(f"Detected document type: {doc_type}")
+        doc_type = _detect_document_type(pages[0][0] if pages else "")
+        logger.info("Detected document type: %s", doc_type)
 
         # Extract data based on type
         if doc_type == "invoice":
-            result = extract_invoice_data_ml(pdf_path)
+            result = extract_invoice_data_ml(pdf_path, pages=pages)
         elif doc_type == "contract":
-            result = extract_contract_data_ml(pdf_path)
+            result = extract_contract_data_ml(pdf_path, pages=pages)
         elif doc_type == "statement":
-            result = extract_financial_statement_ml(pdf_path)
+            result = extract_financial_statement_ml(pdf_path, pages=pages)
         else:
-            result = extract_generic_data_ml(pdf_path)
+            result = extract_generic_data_ml(pdf_path, pages=pages)
 
         # Store extraction if successful
         if result.get("success"):
-            extraction_data = json.dumps(result.get("data", {}))
+            extraction_data = json.dumps(result.get("data", {}), separators=(",", ":"))
             field_count = _count_extracted_fields(result.get("data", {}))
 
             db.insert_extraction(
@@ -203,39 +207,31 @@ def _extract_pdf_background(upload_id: int, pdf_path: str):
 
             processing_time = int(time.time() - start_time)
             db.update_pdf_status(upload_id, "completed", processing_time=processing_time)
-            logger.info(f"PDF extraction completed for upload {upload_id} ({doc_type}) in {processing_time}s")
+            logger.info("PDF extraction completed for upload %s (%s) in %ds", upload_id, doc_type, processing_time)
         else:
             error_msg = result.get("error", "Unknown error")
             processing_time = int(time.time() - start_time)
             db.update_pdf_status(upload_id, "error", error_message=error_msg, processing_time=processing_time)
-            logger.error(f"PDF extraction failed for upload {upload_id}: {error_msg}")
+            logger.error("PDF extraction failed for upload %s: %s", upload_id, error_msg)
 
     except Exception as exc:
         error_msg = str(exc)
         processing_time = int(time.time() - start_time)
         db.update_pdf_status(upload_id, "error", error_message=error_msg, processing_time=processing_time)
-        logger.error(f"Background extraction error for upload {upload_id}: {exc}", exc_info=True)
-
+        logger.error("Background extraction error for upload %s: %s", upload_id, exc, exc_info=True)
 
-def _detect_document_type(pdf_path: str) -> str:
-    """Detect document type from content."""
-    try:
-        import pdfplumber
 
-        with pdfplumber.open(pdf_path) as pdf:
-            # Get first page text
-            first_page_text = (pdf.pages[0].extract_text() or "").lower() if pdf.pages else ""
+def _detect_document_type(first_page_text: str) -> str:
+    """Detect document type from the first page's text."""
+    first_page_text = first_page_text.lower()
 
-            # Simple heuristics
-            if any(word in first_page_text for word in ["invoice", "invoice no", "inv.", "bill", "faktura", "fakturanr", "fakturanummer"]):
-                return "invoice"
-            elif any(word in first_page_text for word in ["contract", "agreement", "between", "kontrakt", "avtale"]):
-                return "contract"
-            elif any(word in first_page_text for word in ["balance sheet", "income statement", "cash flow", "p&l", "balanse", "resultatregnskap"]):
-                return "statement"
-
-    except Exception as exc:
-        logger.debug(f"Document type detection error: {exc}")
+    # Simple heuristics
+    if any(word in first_page_text for word in ["invoice", "invoice no", "inv.", "bill", "faktura", "fakturanr", "fakturanummer"]):
+        return "invoice"
+    elif any(word in first_page_text for word in ["contract", "agreement", "between", "kontrakt", "avtale"]):
+        return "contract"
+    elif any(word in first_page_text for word in ["balance sheet", "income statement", "cash flow", "p&l", "balanse", "resultatregnskap"]):
+        return "statement"
 
     return "generic"
 
@@ -5,10 +5,11 @@ ERA Group Extractions — View and export extracted data.
 import io
 import logging
 import json
-from flask import Blueprint, render_template, request, send_file, jsonify
+from flask import Blueprint, Response, render_template, request, send_file, jsonify
 from src.database import db
 from src.export.csv_exporter import (
     export_era_extractions_csv,
+    stream_era_extractions_csv,
     build_era_extractions_xlsx,
     build_era_extractions_pdf,
     build_era_single_extraction_pdf,
@@ -66,16 +67,12 @@ def extraction_detail(extraction_id: int):
 
 @era_extractions_bp.route("/extractions/export/csv")
 def export_csv():
-    """Export all extractions to CSV."""
+    """Stream CSV download of all extractions."""
     db.init_db()
-    extractions = db.get_all_extractions_for_export()
-    csv_io = export_era_extractions_csv(extractions)
-    csv_bytes = io.BytesIO(csv_io.getvalue().encode("utf-8-sig"))
-    return send_file(
-        csv_bytes,
+    return Response(
+        stream_era_extractions_csv(),
         mimetype="text/csv",
-        as_attachment=True,
-        download_name="era_extractions.csv",
+        headers={"Content-Disposition": "attachment; filename=era_extractions.csv"},
     )
 
 
@@ -83,8 +80,7 @@ def export_csv():
 def export_xlsx():
     """Export all extractions to Excel."""
     db.init_db()
-    extractions = db.get_all_extractions_for_export()
-    xlsx_bytes = build_era_extractions_xlsx(extractions)
+    xlsx_bytes = build_era_extractions_xlsx()
     return send_file(
         io.BytesIO(xlsx_bytes),
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -97,8 +93,7 @@ def export_xlsx():
 def export_pdf():
     """Export all extractions to PDF."""
     db.init_db()
-    extractions = db.get_all_extractions_for_export()
-    pdf_bytes = build_era_extractions_pdf(extractions)
+    pdf_bytes = build_era_extractions_pdf()
     return send_file(
         io.BytesIO(pdf_bytes),
         mimetype="application/pdf",
@@ -185,7 +180,7 @@ def log_correction(extraction_id: int):
         correction_id = db.log_correction(extraction_id, field_name, original_value, corrected_value)
 
         if correction_id:
-            logger.info(f"Logged correction for extraction {extraction_id}: {field_name}")
+            logger.info("Logged correction for extraction %s: %s", extraction_id, field_name)
             return jsonify({
                 "success": True,
                 "correction_id": correction_id,
@@ -195,5 +190,5 @@ def log_correction(extraction_id: int):
             return jsonify({"success": False, "error": "Failed to log correction"}), 500
 
     except Exception as exc:
-        logger.error(f"Correction error: {exc}")
+        logger.error("Correction error: %s", exc)
         return jsonify({"success": False, "error": str(exc)}), 500
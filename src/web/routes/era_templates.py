@@ -49,7 +49,7 @@ def create_template():
             # Store template (would need db functions for this)
             # template_id = db.insert_extraction_template(template_name, pattern_type, field_mapping)
 
-            logger.info(f"Created template: {template_name} ({pattern_type})")
+            logger.info("Created template: %s (%s)", template_name, pattern_type)
 
             return jsonify({
                 "success": True,
@@ -58,7 +58,7 @@ def create_template():
             }), 200
 
         except Exception as exc:
-            logger.error(f"Template creation error: {exc}")
+            logger.error("Template creation error: %s", exc)
             return jsonify({"success": False, "error": str(exc)}), 500
 
     return render_template("era_template_form.html")
@@ -75,7 +75,7 @@ def template_detail(template_id: int):
         try:
             data = request.get_json()
             # Update template in db
-            logger.info(f"Updated template {template_id}")
+            logger.info("Updated template %s", template_id)
             return jsonify({"success": True, "message": "Template updated"}), 200
         except Exception as exc:
             return jsonify({"success": False, "error": str(exc)}), 500
@@ -83,7 +83,7 @@ def template_detail(template_id: int):
     elif request.method == "DELETE":
         try:
             # Delete template from db
-            logger.info(f"Deleted template {template_id}")
+            logger.info("Deleted template %s", template_id)
             return jsonify({"success": True, "message": "Template deleted"}), 200
         except Exception as exc:
             return jsonify({"success": False, "error": str(exc)}), 500
@@ -2,9 +2,12 @@
 Tests for the BrowserManager shared browser lifecycle manager.
 """
 
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch
 
+import src.scraper.browser_manager as browser_manager
 from src.scraper.browser_manager import BrowserManager, USER_AGENT
 
 
@@ -89,3 +92,36 @@ class TestBrowserManager:
     def test_user_agent_constant_exists(self):
         assert "Mozilla" in USER_AGENT
         assert "Chrome" in USER_AGENT
+
+
+class TestThreadBrowser:
+    """Tests for the per-thread browser used by standalone scraper calls."""
+
+    @patch("src.scraper.browser_manager.sync_playwright")
+    def test_launched_once_per_thread_and_closed_by_its_thread(self, mock_sync_pw):
+        mock_pw = mock_sync_pw.return_value.__enter__.return_value
+        mock_pw.chromium.launch.side_effect = lambda **kw: MagicMock()
+
+        with patch.object(browser_manager, "_thread_local", threading.local()):
+            first = browser_manager.thread_browser()
+            assert browser_manager.thread_browser() is first
+
+            other, closers = [], []
+
+            def worker():
+                other.append(browser_manager.thread_browser())
+                other[0].close.side_effect = lambda: closers.append(threading.get_ident())
+                browser_manager.close_thread_browser()
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert other[0] is not first
+            assert mock_pw.chromium.launch.call_count == 2
+            assert closers == [thread.ident]
+            first.close.assert_not_called()
+
+            browser_manager.close_thread_browser()
+            first.close.assert_called_once()
+            # A later call on the same thread starts a fresh browser
+            assert browser_manager.thread_browser() is not first
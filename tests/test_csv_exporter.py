@@ -0,0 +1,174 @@
+"""
+Tests for the CSV / Excel export module.
+Uses a temporary database and exports directory for each test.
+"""
+
+import csv
+import io
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database.db as db_module
+import src.export.csv_exporter as exporter
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path):
+    """Redirect DB and exports dir to temp paths for each test."""
+    with patch.object(db_module, "DB_PATH", tmp_path / "test_leads.db"), \
+         patch.object(exporter, "EXPORTS_DIR", tmp_path / "exports"):
+        db_module.init_db()
+        yield
+
+
+def _seed():
+    posting_id = db_module.insert_job_posting({
+        "external_id": "1", "source": "finn", "title": "Biolog",
+        "company_name": "AquaCorp AS", "location": "Bergen",
+        "keyword_matched": "seafood", "scraped_at": "2024-01-01T09:00:00",
+    })
+    db_module.insert_prospect({
+        "job_posting_id": posting_id, "first_name": "Ola", "last_name": "Nordmann",
+        "full_name": "Ola Nordmann", "email": "ola@aquacorp.no", "email_status": "valid",
+        "position": "CEO", "company_name": "AquaCorp AS", "company_domain": "aquacorp.no",
+        "linkedin_url": None, "snov_prospect_id": None, "snov_list_id": None,
+    })
+
+
+class TestCsvExport:
+
+    def test_export_prospects_csv(self):
+        _seed()
+        path = exporter.export_prospects_csv("p.csv")
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == exporter.PROSPECT_COLUMNS
+        assert len(rows) == 2
+        record = dict(zip(rows[0], rows[1]))
+        assert record["email"] == "ola@aquacorp.no"
+        assert record["job_posting_title"] == "Biolog"
+        assert record["outreach_status"] == "no_draft"
+
+    def test_export_postings_csv_column_order(self):
+        _seed()
+        path = exporter.export_postings_csv("j.csv")
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        record = dict(zip(rows[0], rows[1]))
+        assert rows[0] == exporter.POSTING_COLUMNS
+        assert record["company_name"] == "AquaCorp AS"
+        assert record["company_domain"] == ""  # NULL written as empty field
+
+    def test_stream_matches_file_export(self):
+        _seed()
+        streamed = b"".join(exporter.stream_prospects_csv()).decode("utf-8-sig")
+        path = exporter.export_prospects_csv("p.csv")
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            assert f.read() == streamed
+
+    def test_stream_coalesces_rows_into_chunks(self):
+        rows = [("x" * 100, i) for i in range(2000)]
+        chunks = list(exporter._stream_csv(["a", "b"], iter(rows)))
+        assert len(chunks) == 4
+        assert all(len(c) >= exporter.STREAM_CHUNK_SIZE for c in chunks[:-1])
+        assert chunks[0].startswith(b"\xef\xbb\xbf") and not chunks[1].startswith(b"\xef\xbb\xbf")
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+        assert parsed[0] == ["a", "b"] and len(parsed) == 2001
+
+    def test_empty_export_has_header_only(self):
+        streamed = b"".join(exporter.stream_postings_csv()).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(streamed)))
+        assert rows == [exporter.POSTING_COLUMNS]
+
+
+class TestAutoExport:
+
+    def test_csv_and_xlsx_share_one_query(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        _seed()
+        with patch.object(db_module, "iter_prospects_for_export",
+                          wraps=db_module.iter_prospects_for_export) as query:
+            csv_path = exporter.auto_export_after_run()
+        assert query.call_count == 1
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            assert list(csv.reader(f))[1][4] == "ola@aquacorp.no"
+        xlsx_path, = (tmp_path / "exports").glob("*.xlsx")
+        assert xlsx_path.stem == Path(csv_path).stem
+        assert openpyxl.load_workbook(xlsx_path).active.cell(row=2, column=5).value == "ola@aquacorp.no"
+
+
+class TestXlsxExport:
+
+    def test_build_prospects_xlsx(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        _seed()
+        wb = openpyxl.load_workbook(io.BytesIO(exporter.build_prospects_xlsx()))
+        ws = wb.active
+        assert ws.max_row == 2
+        assert ws.cell(row=1, column=1).value == exporter.PROSPECT_HEADERS[0]
+        assert ws.cell(row=2, column=5).value == "ola@aquacorp.no"
+        assert ws.freeze_panes == "A2"
+        assert ws.cell(row=2, column=1).fill.fgColor.rgb == "00F0F4F8"
+
+    def test_table_xlsx_escapes_and_keeps_types(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        from src.export.xlsx_stream import build_table_xlsx
+        data = build_table_xlsx("A & B", ["Name", "Count"], [("<Fisk & Co>\x0b", 3), (None, 2.5)], widths=[20, 8])
+        ws = openpyxl.load_workbook(io.BytesIO(data))["A & B"]
+        assert list(ws.iter_rows(values_only=True)) == [("Name", "Count"), ("<Fisk & Co>", 3), (None, 2.5)]
+        assert ws.column_dimensions["A"].width == 20
+
+    def test_table_xlsx_writes_non_finite_floats_as_text(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        from src.export.xlsx_stream import build_table_xlsx
+        data = build_table_xlsx("T", ["A", "B"], [(float("nan"), float("-inf"))], widths=[8, 8])
+        ws = openpyxl.load_workbook(io.BytesIO(data)).active
+        assert list(ws.iter_rows(min_row=2, values_only=True)) == [("nan", "-inf")]
+
+    def test_build_era_extractions_xlsx(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        pdf_id = db_module.insert_pdf_upload("inv.pdf", 100)
+        db_module.insert_extraction(
+            pdf_id, "invoice", '{"invoice_number": "INV-1", "line_items": [{"amount": 5}, {"amount": 7}]}',
+        )
+        wb = openpyxl.load_workbook(io.BytesIO(exporter.build_era_extractions_xlsx()))
+        assert wb.sheetnames == ["Extractions", "Line Items"]
+        assert wb["Extractions"].cell(row=2, column=5).value == "INV-1"
+        assert [r[8] for r in wb["Line Items"].iter_rows(min_row=2, values_only=True)] == [5, 7]
+
+
+class TestPdfExport:
+
+    def test_build_prospects_pdf_streams_rows(self):
+        pytest.importorskip("reportlab")
+        _seed()
+        assert exporter.build_prospects_pdf().startswith(b"%PDF")
+
+    def test_build_era_extractions_pdf_without_argument(self):
+        pytest.importorskip("reportlab")
+        db_module.insert_extraction(db_module.insert_pdf_upload("inv.pdf", 100), "invoice", "{}")
+        assert exporter.build_era_extractions_pdf().startswith(b"%PDF")
+
+
+class TestEraExtractionExport:
+
+    def test_load_extraction_data(self):
+        assert exporter._load_extraction_data({"extracted_data": '{"total": NaN, "n": 1}'})["n"] == 1
+        assert exporter._load_extraction_data({"extracted_data": "not json"}) == {}
+        assert exporter._load_extraction_data({"extracted_data": None}) == {}
+
+    def test_stream_matches_buffered_export(self):
+        pdf_id = db_module.insert_pdf_upload("inv.pdf", 100)
+        db_module.insert_extraction(
+            pdf_id, "invoice", '{"invoice_number": "INV-1", "line_items": [{}, {}]}',
+            confidence_score=0.9,
+        )
+        streamed = b"".join(exporter.stream_era_extractions_csv()).decode("utf-8-sig")
+        assert streamed == exporter.export_era_extractions_csv().getvalue()
+        rows = list(csv.reader(io.StringIO(streamed)))
+        assert rows[0] == exporter.ERA_EXTRACTION_HEADERS
+        record = dict(zip(exporter.ERA_EXTRACTION_COLUMNS, rows[1]))
+        assert record["invoice_number"] == "INV-1"
+        assert record["line_item_count"] == "2"
+        assert record["confidence_score"] == "90%"
@@ -33,6 +33,187 @@ def test_init_db_creates_tables():
     assert "outreach_log" in tables
 
 
+def test_init_db_sets_schema_version():
+    with db_module.get_connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    assert version == db_module.SCHEMA_VERSION
+    # Second call is a no-op on an up-to-date database
+    db_module.init_db()
+
+
+def test_connections_use_wal_and_tuned_pragmas():
+    with db_module.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    with db_module._read() as conn:
+        assert db_module._scalar(conn, "PRAGMA temp_store") == 2  # MEMORY
+
+
+def test_init_db_migrates_legacy_job_postings(tmp_path):
+    legacy_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(legacy_path)
+    conn.execute(
+        "CREATE TABLE job_postings (id INTEGER PRIMARY KEY, finn_id TEXT UNIQUE, "
+        "title TEXT, company_name TEXT, company_domain TEXT, location TEXT, "
+        "url TEXT, keyword_matched TEXT, published_at TEXT, scraped_at TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO job_postings (finn_id, title, scraped_at) VALUES ('42', 'Old', '2024-01-01T00:00:00')")
+    conn.commit()
+    conn.close()
+
+    with patch.object(db_module, "DB_PATH", legacy_path):
+        db_module.init_db()
+        with db_module.get_connection() as conn:
+            row = conn.execute(
+                "SELECT source, external_id, scraped_at_epoch, processed_at FROM job_postings"
+            ).fetchone()
+    assert row["source"] == "finn"
+    assert row["external_id"] == "42"
+    assert row["scraped_at_epoch"] == 1704067200
+    # Postings from before processed_at existed aren't re-queued
+    assert row["processed_at"] == "2024-01-01T00:00:00"
+
+
+def test_hot_queries_use_indexes():
+    with db_module.get_connection() as conn:
+        def plan(sql, params=()):
+            return " ".join(r["detail"] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+        uploads = plan(
+            "SELECT * FROM era_pdf_uploads WHERE status = ? ORDER BY upload_date DESC LIMIT 50",
+            ("completed",),
+        )
+        assert "idx_era_uploads_status_date" in uploads
+        assert "TEMP B-TREE" not in uploads
+        assert "idx_era_extractions_date" in plan(
+            "SELECT * FROM era_extractions ORDER BY extraction_date DESC"
+        )
+        assert "idx_companies_nace_employees" in plan(
+            "SELECT * FROM companies WHERE nace_code GLOB ? ORDER BY employee_count DESC",
+            ("03.2*",),
+        )
+
+
+def test_get_companies_by_nace_prefix():
+    blank = dict.fromkeys(["website", "address", "postal_code", "city", "nace_description", "legal_form"])
+    for org, name, nace, employees in [("1", "A", "03.211", 5), ("2", "B", "03.22", 50), ("3", "C", "03.1", 9)]:
+        db_module.insert_company({**blank, "org_number": org, "name": name,
+                                  "nace_code": nace, "employee_count": employees})
+    names = [c["name"] for c in db_module.get_companies_by_nace("03.2")]
+    assert names == ["B", "A"]
+
+
+def test_reads_not_blocked_by_open_streams():
+    db_module.insert_job_posting({"external_id": "1", "source": "finn", "company_name": "AquaCorp AS"})
+    # Every pooled reader held by a half-read export stream
+    streams = [db_module.iter_postings_for_export() for _ in range(db_module._READER_POOL_SIZE)]
+    for stream in streams:
+        next(stream)
+    with patch.object(db_module, "_READER_WAIT_SECONDS", 0.01):
+        assert db_module.get_existing_external_ids("finn") == {"1"}
+    for stream in streams:
+        stream.close()
+
+
+def test_get_prospect_emails():
+    assert db_module.get_prospect_emails() == set()
+    db_module.insert_prospect({
+        "job_posting_id": None, "first_name": "Ola", "last_name": "Nordmann",
+        "full_name": "Ola Nordmann", "email": "ola@aquacorp.no", "email_status": "valid",
+        "position": "CEO", "company_name": "AquaCorp AS", "company_domain": "aquacorp.no",
+        "linkedin_url": None, "snov_prospect_id": None, "snov_list_id": None,
+    })
+    assert db_module.get_prospect_emails() == {"ola@aquacorp.no"}
+
+
+def test_update_posting_enrichment_many():
+    ids = [
+        db_module.insert_job_posting({"external_id": str(i), "company_name": "AquaCorp AS"})
+        for i in (1, 2)
+    ]
+    db_module.update_posting_enrichment_many([("aquacorp.no", "932814569", ids[0]), ("b.no", None, ids[1])])
+    rows = [db_module.get_job_posting_by_id(i) for i in ids]
+    assert [(r["company_domain"], r["org_number"]) for r in rows] == [("aquacorp.no", "932814569"), ("b.no", None)]
+
+
+def test_unprocessed_postings_until_marked():
+    ids = [
+        db_module.insert_job_posting({"external_id": str(i), "company_name": "AquaCorp AS"})
+        for i in (1, 2, 3)
+    ]
+    assert [p["id"] for p in db_module.get_unprocessed_postings()] == ids
+    db_module.mark_postings_processed([])
+    db_module.mark_postings_processed([("2024-01-01T00:00:00", ids[0]), ("2024-01-01T00:00:00", ids[2])])
+    assert [p["id"] for p in db_module.get_unprocessed_postings()] == [ids[1]]
+
+
+def test_log_outreach_many():
+    db_module.log_outreach_many([])
+    db_module.log_outreach_many([
+        {"prospect_id": None, "campaign_id": "1", "status": "added_to_snov", "notes": "a"},
+        {"prospect_id": None, "campaign_id": "1", "status": "added_to_snov", "notes": "b",
+         "sent_at": "2024-01-01T09:00:00"},
+    ])
+    with db_module.get_connection() as conn:
+        rows = conn.execute("SELECT notes, sent_at FROM outreach_log ORDER BY id").fetchall()
+    assert [r["notes"] for r in rows] == ["a", "b"]
+    assert rows[0]["sent_at"] and rows[1]["sent_at"] == "2024-01-01T09:00:00"
+
+
+def test_get_org_numbers_by_names():
+    blank = dict.fromkeys(["website", "address", "postal_code", "city", "nace_code",
+                           "nace_description", "legal_form", "employee_count"])
+    for org, name in [("1", "AquaCorp AS"), ("2", "aquacorp as"), ("3", "Lerøy AS")]:
+        db_module.insert_company({**blank, "org_number": org, "name": name})
+    with patch.object(db_module, "_MAX_SQL_PARAMS", 2):
+        found = db_module.get_org_numbers_by_names(["AQUACORP AS", "Lerøy AS", "Ukjent AS"])
+    assert found == {"AQUACORP AS": "1", "Lerøy AS": "3"}
+    assert db_module.get_company_org_numbers() == {"AquaCorp AS": "1", "aquacorp as": "2", "Lerøy AS": "3"}
+
+
+def _role(org, name, code):
+    return {"company_id": None, "org_number": org, "person_name": name, "role_code": code,
+            "role_description": None, "birth_date": None}
+
+
+def test_get_company_roles_ordered_by_priority():
+    for name, code in [("Member", "MEDL"), ("Other", "REVI"), ("Chair", "LEDE"), ("CEO", "DAGL")]:
+        db_module.insert_company_role(_role("999", name, code))
+    roles = db_module.get_company_roles("999")
+    assert [r["person_name"] for r in roles] == ["CEO", "Chair", "Member", "Other"]
+    with db_module.get_connection() as conn:
+        plan = " ".join(r["detail"] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM company_roles WHERE org_number = ? ORDER BY role_priority",
+            ("999",),
+        ))
+    assert "idx_company_roles_org_priority" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_init_db_backfills_role_priority(tmp_path):
+    legacy_path = tmp_path / "legacy_roles.db"
+    conn = sqlite3.connect(legacy_path)
+    conn.execute(
+        "CREATE TABLE company_roles (id INTEGER PRIMARY KEY, company_id INTEGER, "
+        "org_number TEXT NOT NULL, person_name TEXT NOT NULL, role_code TEXT NOT NULL, "
+        "role_description TEXT, birth_date TEXT, created_at TEXT NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO company_roles (org_number, person_name, role_code, created_at) VALUES ('1', ?, ?, 'x')",
+        [("Member", "MEDL"), ("CEO", "DAGL"), ("Auditor", "REVI")],
+    )
+    conn.commit()
+    conn.close()
+
+    with patch.object(db_module, "DB_PATH", legacy_path):
+        db_module.init_db()
+        roles = db_module.get_company_roles("1")
+    assert [(r["person_name"], r["role_priority"]) for r in roles] == [
+        ("CEO", 1), ("Member", 4), ("Auditor", 5),
+    ]
+
+
 def test_insert_job_posting():
     data = {
         "finn_id": "12345",
@@ -192,3 +192,267 @@ class TestWebsiteCacheTable:
                 ).fetchall()
             }
         assert "website_cache" in tables
+
+
+class TestPaginatedListings:
+    """Tests for the single-query (rows, total) pagination."""
+
+    def _insert_postings(self, n):
+        for i in range(n):
+            db_module.insert_job_posting({
+                "external_id": str(i), "source": "finn",
+                "title": f"Job {i}", "company_name": "Corp",
+                "scraped_at": f"2024-01-01T00:00:{i:02d}",
+            })
+
+    def test_total_travels_with_page(self):
+        self._insert_postings(5)
+        rows, total = db_module.get_job_postings(limit=2, offset=0)
+        assert total == 5
+        assert [r["external_id"] for r in rows] == ["4", "3"]
+        assert "_total" not in rows[0]
+
+    def test_page_past_end_still_reports_total(self):
+        self._insert_postings(3)
+        rows, total = db_module.get_job_postings(limit=2, offset=10)
+        assert rows == []
+        assert total == 3
+
+    def test_empty_table(self):
+        rows, total = db_module.get_email_drafts()
+        assert rows == []
+        assert total == 0
+
+    def test_two_query_fallback_matches(self):
+        self._insert_postings(4)
+        with patch.object(db_module, "_HAS_WINDOW_FUNCTIONS", False):
+            rows, total = db_module.get_job_postings(search="Job", limit=3)
+        assert total == 4
+        assert len(rows) == 3
+
+
+class TestByDayCharts:
+    """Tests for get_postings_by_day / get_prospects_by_day."""
+
+    def test_postings_grouped_by_day_within_window(self):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stamps = [now, now, now - timedelta(days=1), now - timedelta(days=90)]
+        for i, ts in enumerate(stamps):
+            db_module.insert_job_posting({
+                "external_id": str(i), "source": "finn",
+                "scraped_at": ts.isoformat(),
+            })
+        result = db_module.get_postings_by_day(30)
+        assert result == [
+            {"day": (now - timedelta(days=1)).strftime("%Y-%m-%d"), "count": 1},
+            {"day": now.strftime("%Y-%m-%d"), "count": 2},
+        ]
+
+    def test_prospects_empty(self):
+        assert db_module.get_prospects_by_day(30) == []
+
+
+class TestSharedConnections:
+    """Tests for the shared writer connection and read-only reader pool."""
+
+    def test_failed_write_rolls_back(self):
+        with pytest.raises(RuntimeError):
+            with db_module.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO keywords (keyword, active, created_at) VALUES ('x', 1, 'now')"
+                )
+                raise RuntimeError("boom")
+        assert db_module.get_keyword_list() == []
+        # Writer is usable again afterwards
+        assert db_module.add_keyword("laks") is not None
+
+    def test_readers_are_read_only(self):
+        import sqlite3
+        with db_module._read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute(
+                    "INSERT INTO keywords (keyword, active, created_at) VALUES ('x', 1, 'now')"
+                )
+
+    def test_other_threads_read_committed_during_open_transaction(self):
+        import threading
+        db_module.add_keyword("first")
+        seen = {}
+        with db_module.transaction():
+            db_module.add_keyword("pending")
+            # Same thread reads its own pending row through the writer
+            seen["inside"] = db_module.get_keyword_list()
+            # Another thread isn't blocked and only sees committed rows
+            reader = threading.Thread(
+                target=lambda: seen.update(other=db_module.get_keyword_list())
+            )
+            reader.start()
+            reader.join(timeout=5)
+        assert seen["inside"] == ["first", "pending"]
+        assert seen["other"] == ["first"]
+        assert db_module.get_keyword_list() == ["first", "pending"]
+
+    def test_transaction_batches_helpers_and_rolls_back_together(self):
+        with pytest.raises(RuntimeError):
+            with db_module.transaction():
+                db_module.add_keyword("a")
+                db_module.add_keyword("b")
+                raise RuntimeError("boom")
+        assert db_module.get_keyword_list() == []
+
+
+class TestThreadConnection:
+    """get_connection() hands back one persistent connection per thread."""
+
+    def test_reused_within_thread_and_survives_with_block(self):
+        with db_module.get_connection() as conn:
+            conn.execute("INSERT INTO keywords (keyword, active, created_at) VALUES ('x', 1, 'now')")
+        again = db_module.get_connection()
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM keywords").fetchone()[0] == 1
+
+    def test_other_thread_gets_its_own(self):
+        import threading
+        seen = {}
+        thread = threading.Thread(target=lambda: seen.update(conn=db_module.get_connection()))
+        thread.start()
+        thread.join(timeout=5)
+        assert seen["conn"] is not db_module.get_connection()
+
+    def test_close_all_then_reopen(self):
+        conn = db_module.get_connection()
+        db_module.close_all_connections()
+        with pytest.raises(Exception):
+            conn.execute("SELECT 1")
+        fresh = db_module.get_connection()
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone()[0] == 1
+        # Shared writer / readers reopen lazily too
+        assert db_module.add_keyword("laks")
+
+
+class TestFinishPipelineRun:
+    """Tests for the single-UPDATE finish_pipeline_run."""
+
+    def test_writes_final_counters(self):
+        run_id = db_module.insert_pipeline_run()
+        stats = db_module.PipelineRunStats(postings_scraped=12, postings_new=5, errors=1)
+        db_module.finish_pipeline_run(run_id, "completed", stats, csv_path="/tmp/x.csv")
+
+        run = db_module.get_recent_pipeline_runs(1)[0]
+        assert run["status"] == "completed"
+        assert run["finished_at"] is not None
+        assert run["postings_scraped"] == 12
+        assert run["postings_new"] == 5
+        assert run["drafts_created"] == 0
+        assert run["errors"] == 1
+        assert run["csv_path"] == "/tmp/x.csv"
+        assert run["error_message"] is None
+
+
+class TestSeedKeywords:
+    """Tests for seed_keywords_from_env."""
+
+    def test_seeds_empty_table_once(self):
+        added = db_module.seed_keywords_from_env([" Seafood", "HR ", "", "hr"])
+        assert added == 2
+        assert db_module.get_keyword_list() == ["hr", "seafood"]
+        # Table no longer empty — nothing more is seeded
+        assert db_module.seed_keywords_from_env(["laks"]) == 0
+
+
+class TestAddKeyword:
+    """add_keyword upserts: new rows are inserted, existing ones re-activated."""
+
+    def test_upsert_returns_same_id_and_reactivates(self):
+        kw_id = db_module.add_keyword("  Seafood ")
+        with db_module.get_connection() as conn:
+            conn.execute("UPDATE keywords SET active = 0 WHERE id = ?", (kw_id,))
+        assert db_module.get_keywords(active_only=True) == []
+        assert db_module.add_keyword("seafood") == kw_id
+        assert db_module.get_keyword_list() == ["seafood"]
+        assert len(db_module.get_keywords(active_only=False)) == 1
+
+    def test_blank_keyword_ignored(self):
+        assert db_module.add_keyword("   ") is None
+
+
+class TestKeywordListCache:
+    """get_keyword_list is cached and invalidated by keyword writes."""
+
+    def test_cache_skips_db_until_invalidated(self):
+        db_module.add_keyword("seafood")
+        assert db_module.get_keyword_list() == ["seafood"]
+        with patch.object(db_module, "get_keywords", side_effect=AssertionError("cache miss")):
+            assert db_module.get_keyword_list() == ["seafood"]
+
+        kw_id = db_module.add_keyword("laks")
+        assert db_module.get_keyword_list() == ["laks", "seafood"]
+        db_module.remove_keyword(kw_id)
+        assert db_module.get_keyword_list() == ["seafood"]
+
+    def test_cache_expires(self):
+        db_module.add_keyword("seafood")
+        db_module.get_keyword_list()
+        with db_module.get_connection() as conn:
+            conn.execute("INSERT INTO keywords (keyword, active, created_at) VALUES ('hr', 1, 'x')")
+        assert db_module.get_keyword_list() == ["seafood"]
+        with patch.object(db_module, "_KEYWORD_CACHE_TTL", 0):
+            assert db_module.get_keyword_list() == ["hr", "seafood"]
+
+
+class TestEraDashboardStats:
+    """Tests for the aggregated get_era_dashboard_stats."""
+
+    def test_empty(self):
+        stats = db_module.get_era_dashboard_stats()
+        assert stats == {
+            "total_uploads": 0, "completed_uploads": 0, "processing_uploads": 0,
+            "failed_uploads": 0, "total_extractions": 0,
+            "avg_confidence": 0.0, "avg_processing_time": 0.0,
+        }
+
+    def test_counts_by_status(self):
+        a = db_module.insert_pdf_upload("a.pdf", 10)
+        b = db_module.insert_pdf_upload("b.pdf", 10)
+        db_module.insert_pdf_upload("c.pdf", 10, status="processing")
+        d = db_module.insert_pdf_upload("d.pdf", 10)
+        db_module.update_pdf_status(a, "completed", processing_time=2)
+        db_module.update_pdf_status(b, "completed", processing_time=4)
+        db_module.update_pdf_status(d, "error", error_message="bad")
+        db_module.insert_extraction(a, "invoice", "{}", confidence_score=0.5)
+        db_module.insert_extraction(b, "invoice", "{}", confidence_score=0.9)
+
+        stats = db_module.get_era_dashboard_stats()
+        assert stats["total_uploads"] == 4
+        assert stats["completed_uploads"] == 2
+        assert stats["processing_uploads"] == 1
+        assert stats["failed_uploads"] == 1
+        assert stats["total_extractions"] == 2
+        assert stats["avg_confidence"] == 70.0
+        assert stats["avg_processing_time"] == 3.0
+
+
+class TestExtractionStorage:
+    """Large extracted_data payloads are compressed at rest and inflated on read."""
+
+    def _stored(self, extraction_id):
+        with db_module.get_connection() as conn:
+            return conn.execute(
+                "SELECT extracted_data FROM era_extractions WHERE id = ?", (extraction_id,)
+            ).fetchone()[0]
+
+    def test_small_payload_stored_as_text(self):
+        pdf_id = db_module.insert_pdf_upload("a.pdf", 10)
+        ext_id = db_module.insert_extraction(pdf_id, "invoice", '{"a":1}')
+        assert self._stored(ext_id) == '{"a":1}'
+        assert db_module.get_all_extractions_for_export()[0]["extracted_data"] == '{"a":1}'
+
+    def test_large_payload_round_trips(self):
+        payload = json.dumps({"line_items": [{"description": "Laks", "qty": i} for i in range(200)]})
+        pdf_id = db_module.insert_pdf_upload("a.pdf", 10)
+        ext_id = db_module.insert_extraction(pdf_id, "invoice", payload)
+        stored = self._stored(ext_id)
+        assert isinstance(stored, bytes) and stored[:1] == b"\x1f"
+        assert len(stored) < len(payload)
+        assert db_module.get_all_extractions_for_export()[0]["extracted_data"] == payload
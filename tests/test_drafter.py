@@ -0,0 +1,23 @@
+"""
+Tests for the auto-drafter's template selection.
+"""
+
+import pytest
+
+from src.emails.drafter import _pick_template, DEFAULT_TEMPLATE
+
+
+@pytest.mark.parametrize("position, expected", [
+    ("CEO", "value_proposition"),
+    ("Daglig leder", "value_proposition"),
+    ("Managing Partner", "value_proposition"),
+    ("HR Director", "value_proposition"),  # executive wins over HR
+    ("HR-sjef", "short_intro"),
+    ("Personalsjef", "short_intro"),
+    ("Rekrutteringsansvarlig", "short_intro"),
+    ("Biolog", DEFAULT_TEMPLATE),
+    ("", DEFAULT_TEMPLATE),
+    (None, DEFAULT_TEMPLATE),
+])
+def test_pick_template(position, expected):
+    assert _pick_template({"position": position}) == expected
@@ -0,0 +1,39 @@
+"""
+Tests for the NAV Arbeidsplassen scraper.
+Uses a mocked Playwright page to avoid hitting the live site.
+"""
+
+from unittest.mock import MagicMock
+
+from src.scraper.nav_scraper import _parse_listing_page
+
+
+def test_parse_listing_page_reads_cards_in_one_evaluate():
+    page = MagicMock()
+    page.evaluate.return_value = [
+        {
+            "href": "/stillinger/stilling/abc-123",
+            "title": " Biolog ",
+            "text": "Biolog\nArbeidsgiver: AquaCorp AS\nSted: Bergen\nPublisert: 12. mars 2025",
+            "datetime": None,
+        },
+        # Same job linked twice on the page
+        {"href": "/stillinger/stilling/abc-123", "title": "Biolog", "text": "", "datetime": None},
+        {
+            "href": "https://arbeidsplassen.nav.no/stillinger/stilling/def-456",
+            "title": "Fisker",
+            "text": "Fisker\nNORDLAND\nHavfisk AS",
+            "datetime": "2025-03-01T08:00:00",
+        },
+        {"href": "/stillinger/stilling/0f0", "title": "", "text": "", "datetime": None},
+    ]
+
+    results = _parse_listing_page(page, "laks")
+
+    assert page.evaluate.call_count == 1
+    assert [r["nav_id"] for r in results] == ["abc-123", "def-456"]
+    first, second = results
+    assert first["url"] == "https://arbeidsplassen.nav.no/stillinger/stilling/abc-123"
+    assert (first["title"], first["company_name"], first["location"]) == ("Biolog", "AquaCorp AS", "Bergen")
+    assert first["published_at"] == "2025-03-12"
+    assert (second["company_name"], second["location"], second["published_at"]) == ("Havfisk AS", "NORDLAND", "2025-03-01")
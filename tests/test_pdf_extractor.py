@@ -0,0 +1,173 @@
+"""
+Tests for the PDF extraction text helpers (no PDF parsing involved, except
+for the page cache tests, which read the sample invoice in the repo root).
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.era import pdf_extractor as pe
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "test_invoice.pdf"
+
+
+INVOICE_TEXT = (
+    "Faktura\n"
+    "Subtotal: 1 000,00\n"
+    "MVA 25%: 250,00\n"
+    "Total amount: 1 250,00 NOK\n"
+    "Å betale: 1 250,00 NOK\n"
+)
+
+
+class TestLabelScanner:
+
+    def test_fields_share_one_memo(self):
+        scanner = pe.LabelScanner(INVOICE_TEXT)
+        assert pe._extract_labeled_amount(INVOICE_TEXT, pe.SUBTOTAL_LABELS, scanner) == ("1000.00", 0.90)
+        assert pe._extract_labeled_amount(INVOICE_TEXT, pe.TAX_AMOUNT_LABELS, scanner) == ("250.00", 0.90)
+        assert pe._extract_labeled_amount(INVOICE_TEXT, pe.AMOUNT_DUE_LABELS, scanner) == ("1250.00", 0.90)
+        # "å betale" was already searched for amount_due's labels
+        assert ("amount", "å betale") in scanner._found
+
+    def test_kinds_are_memoized_separately(self):
+        text = "Fakturadato: 15.01.2025\nTil: Kunde AS\nOrg.nr. 932 814 569\nRef: ABC-1\n"
+        scanner = pe.LabelScanner(text)
+        assert pe._extract_labeled_date(text, ["fakturadato"], scanner) == ("15.01.2025", 0.90)
+        # "to" must not match inside "Fakturadato"
+        assert pe._extract_entity_name(text, ["to", "til"], scanner) == ("Kunde AS", 0.85)
+        assert pe._extract_tax_id(text, ["org.nr"], scanner) == ("932 814 569", 0.90)
+        assert pe._extract_labeled_value(text, ["ref"], scanner) == ("ABC-1", 0.80)
+
+    def test_positions_found_once_per_label(self):
+        text = "Date: soon\nInvoice date: 2025-01-15\nDATE 15.01.2025\n"
+        scanner = pe.LabelScanner(text)
+        assert scanner.positions("date") == [0, 19, 36]
+        assert scanner.positions("DATE") is scanner.positions("date")
+        # "date: soon" fails all four date tails; the next occurrence wins
+        assert pe._extract_labeled_date(text, ["date"], scanner) == ("2025-01-15", 0.90)
+
+    def test_label_priority_beats_position(self):
+        text = "Sum: 10\nTotal: 99\n"
+        assert pe._extract_labeled_amount(text, ["total", "sum"]) == ("99", 0.90)
+
+    def test_case_insensitive_and_missing(self):
+        assert pe._extract_labeled_amount("TOTAL: 42", ["total"]) == ("42", 0.90)
+        assert pe._extract_labeled_amount("nothing here", ["total"]) == (None, 0.0)
+
+
+class TestTableRows:
+
+    def test_rows_are_cell_lists_aligned_with_headers(self):
+        table = [["Item", None, "Amount"], ["Salmon ", "kg", "1 000"], ["Cod", None], ["Trout", "kg", "5", "extra"]]
+        headers, rows = pe._table_rows(table)
+        assert headers == ["Item", "Col_1", "Amount", "Col_3"]
+        assert rows == [
+            ["Salmon", "kg", "1 000", ""],
+            ["Cod", "", "", ""],
+            ["Trout", "kg", "5", "extra"],
+        ]
+
+    def test_header_only(self):
+        assert pe._table_rows([["A", "B"]]) == (["A", "B"], [])
+
+
+class TestLineItems:
+
+    def test_rows_without_description_or_amount_are_skipped(self):
+        raw = [
+            ["Beskrivelse", "Antall", "Beløp"],
+            ["Laks", "2", "1 000,00"],
+            [" ", "5", None],
+            [None, None, "250,00"],
+        ]
+        items = pe._extract_line_items([{"page": 1, "table_index": 0, "raw": raw}], "")
+        assert items == [
+            {"line_no": 1, "description": "Laks", "quantity": "2", "amount": "1000.00"},
+            {"line_no": 3, "description": "", "quantity": None, "amount": "250.00"},
+        ]
+
+
+class TestExtractAddress:
+
+    def test_first_run_with_a_digit(self):
+        text = "Faktura: ACME AS, Storgata 12, 0155 Oslo"
+        assert pe._extract_address(text, "vendor") == ("Storgata 12, 0155 Oslo", 0.60)
+
+    def test_long_digit_free_text(self):
+        assert pe._extract_address("lorem ipsum dolor " * 5000, "vendor") == (None, 0.0)
+
+
+class TestFirstMatches:
+
+    def test_matches_chained_findall_prefix(self):
+        text = "Issued 2025-01-15, due 15.02.2025, paid 2025-03-01"
+        expected = [d for date_re in pe.DATE_RES for d in date_re.findall(text)]
+        assert pe._first_matches(pe.DATE_RES, text, 20) == expected
+        assert pe._first_matches(pe.DATE_RES, text, 2) == ["2025-01-15", "2025-03-01"]
+
+    def test_pattern_without_groups_returns_whole_match(self):
+        assert pe._first_matches([pe.GENERIC_AMOUNT_RE], "NOK 100 and $ 5", 5) == ["NOK 100", "$ 5"]
+
+
+class TestFindEmails:
+
+    def test_matches_full_text_findall(self):
+        text = "Kontakt: post@fjørd.no\na@b.com+x@c.no, (faktura@acme.co.uk) @ 5 x@y"
+        assert pe._find_emails(text) == pe.EMAIL_RE.findall(text)
+        assert pe._find_emails(text)[0] == "post@fjørd.no"
+
+
+class TestWeightedConfidence:
+
+    def test_key_fields_count_double(self):
+        confs = {"invoice_number": 1.0, "vendor_name": 0.5, "reference": 0.0}
+        # (1.0*2 + 0.5*2 + 0.0) / 5
+        assert pe._calculate_weighted_confidence(confs, ["invoice_number", "vendor_name", "total_amount"]) == 0.6
+
+    def test_empty(self):
+        assert pe._calculate_weighted_confidence({}, ["invoice_number"]) == 0.0
+
+
+class TestDetectCurrency:
+
+    def test_codes_counted_case_insensitively_on_word_boundaries(self):
+        # "NOKS" is not a code; symbols and codes add up per currency
+        assert pe._detect_currency("Total 100 eur, 20 EUR, 5 NOKS") == ("EUR", 0.85)
+        assert pe._detect_currency("kr 100, NOK 200, € 5") == ("NOK", 0.85)
+
+    def test_none_found(self):
+        assert pe._detect_currency("no money here") == (None, 0.0)
+
+
+class TestPageCache:
+
+    @pytest.fixture
+    def pdf_copy(self, tmp_path):
+        pytest.importorskip("pdfplumber")
+        path = tmp_path / "invoice.pdf"
+        shutil.copy(SAMPLE_PDF, path)
+        return str(path)
+
+    def test_unchanged_file_is_parsed_once(self, pdf_copy):
+        first = pe.load_pdf_pages(pdf_copy)
+        assert pe.load_pdf_pages(pdf_copy) is first
+        assert first and first[0][0]
+
+    def test_modified_file_is_parsed_again(self, pdf_copy):
+        first = pe.load_pdf_pages(pdf_copy)
+        stat = os.stat(pdf_copy)
+        os.utime(pdf_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = pe.load_pdf_pages(pdf_copy)
+        assert second is not first
+        assert second == first
+
+    def test_extractor_uses_given_pages(self, pdf_copy):
+        pages = pe.load_pdf_pages(pdf_copy)
+        os.remove(pdf_copy)  # a second parse would now fail
+        result = pe.extract_invoice_data_ml(pdf_copy, pages=pages)
+        assert result["success"]
+        assert result["data"]["invoice_number"] == "INV-2024-001"
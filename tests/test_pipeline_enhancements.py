@@ -167,3 +167,442 @@ class TestCleanCompanyName:
 
     def test_no_suffix_unchanged(self):
         assert self.clean("AquaCorp") == "AquaCorp"
+
+
+class TestProcessPostings:
+    """Tests for the single-worker posting loop (parallel runs use _scrape_and_process)."""
+
+    @pytest.fixture(autouse=True)
+    def no_preloads(self):
+        with patch("src.pipeline.lead_pipeline.db.get_org_numbers_by_names", return_value={}), \
+             patch("src.pipeline.lead_pipeline.db.get_prospect_emails", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.db.mark_postings_processed"):
+            yield
+
+    def _pipeline(self, workers):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            return LeadPipeline(snov_list_id="1", workers=workers)
+
+    def test_workers_default_from_env(self, monkeypatch):
+        from src.pipeline.lead_pipeline import POSTING_WORKERS
+        monkeypatch.delenv("PIPELINE_WORKERS", raising=False)
+        assert self._pipeline(workers=None).workers == POSTING_WORKERS
+        monkeypatch.setenv("PIPELINE_WORKERS", "1")
+        assert self._pipeline(workers=None).workers == 1
+        assert self._pipeline(workers=3).workers == 3
+
+    def test_outreach_rows_written_in_batches(self):
+        pipeline = self._pipeline(workers=1)
+        with patch("src.pipeline.lead_pipeline.WRITE_BATCH_SIZE", 2), \
+             patch("src.pipeline.lead_pipeline.db.log_outreach_many") as write, \
+             patch.object(pipeline, "_process_posting",
+                          side_effect=lambda p, browser=None: pipeline._log_outreach({"prospect_id": p["id"]})):
+            pipeline._process_postings([{"id": i, "company_name": "A"} for i in range(1, 4)])
+        assert [[e["prospect_id"] for e in c.args[0]] for c in write.call_args_list] == [[1, 2], [3]]
+        assert all(e["sent_at"] for c in write.call_args_list for e in c.args[0])
+
+    def test_single_worker_uses_shared_browser(self):
+        pipeline = self._pipeline(workers=1)
+        shared = object()
+        with patch("src.pipeline.lead_pipeline.BrowserManager") as bm, \
+             patch.object(pipeline, "_process_posting") as process:
+            pipeline._process_postings([{"id": 1, "company_name": "A"}, {"id": 2, "company_name": "B"}], browser=shared)
+        assert bm.call_count == 0
+        assert [c.kwargs["browser"] for c in process.call_args_list] == [shared, shared]
+
+    def test_postings_marked_processed_after_enrichment(self):
+        pipeline = self._pipeline(workers=1)
+        calls = []
+
+        def process(posting, browser=None):
+            if posting["id"] == 2:
+                raise RuntimeError("boom")
+            pipeline._posting_updates.add(("a.no", None, posting["id"]))
+
+        with patch("src.pipeline.lead_pipeline.db.update_posting_enrichment_many",
+                   side_effect=lambda rows: calls.append(("enrich", [r[2] for r in rows]))), \
+             patch("src.pipeline.lead_pipeline.db.mark_postings_processed",
+                   side_effect=lambda rows: calls.append(("processed", [r[1] for r in rows]))), \
+             patch.object(pipeline, "_process_posting", side_effect=process):
+            pipeline._process_postings([{"id": 1, "company_name": "A"}, {"id": 2, "company_name": "B"},
+                                        {"id": None, "company_name": "C"}])
+        # A failed posting is still done with; the enrichment lands before the mark
+        assert calls == [("enrich", [1]), ("processed", [1, 2])]
+
+
+class TestScrapeAllSources:
+    """Tests for merging per-source scrape results in the single-worker run."""
+
+    def _pipeline(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            return LeadPipeline(snov_list_id="1", sources=["finn", "nav", "bogus"], workers=1)
+
+    def test_sources_merged_in_order_with_url_dedup(self):
+        pipeline = self._pipeline()
+        finn = [{"url": "https://a/1"}, {"url": "https://a/2"}]
+        nav = [{"url": "https://a/2"}, {"url": "https://b/1"}]
+        with patch("src.pipeline.lead_pipeline.BrowserManager"), \
+             patch("src.pipeline.lead_pipeline.db.get_existing_external_ids", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.scrape_finn", return_value=iter(finn)), \
+             patch("src.pipeline.lead_pipeline.scrape_nav", side_effect=lambda *a, **k: iter(nav)):
+            postings = pipeline._scrape_all_sources(["laks"])
+        assert [p["url"] for p in postings] == ["https://a/1", "https://a/2", "https://b/1"]
+        assert pipeline._stats["postings_by_source"] == {"finn": 2, "nav": 1, "bogus": 0}
+
+    def test_failed_source_counts_as_error(self):
+        pipeline = self._pipeline()
+        with patch("src.pipeline.lead_pipeline.BrowserManager"), \
+             patch("src.pipeline.lead_pipeline.db.get_existing_external_ids", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.scrape_finn", side_effect=RuntimeError("down")), \
+             patch("src.pipeline.lead_pipeline.scrape_nav", return_value=iter([{"url": "u"}])):
+            postings = pipeline._scrape_all_sources(["laks"])
+        assert postings == [{"url": "u"}]
+        assert pipeline._stats["errors"] == 1
+
+
+class TestScrapeAndProcess:
+    """Streaming mode: postings are processed while the sources are still being scraped."""
+
+    def _pipeline(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            return LeadPipeline(snov_list_id="1", sources=["finn", "nav", "bogus"], workers=2)
+
+    @staticmethod
+    def _store(postings):
+        for posting in postings:
+            posting["id"] = None if posting["url"].endswith("known") else int(posting["url"].rsplit("/", 1)[1])
+
+    def _run(self, pipeline, finn, nav, store=None, process=None, keywords=("laks",), backlog=()):
+        processed = []
+        with patch("src.pipeline.lead_pipeline.BrowserManager") as bm, \
+             patch("src.pipeline.lead_pipeline.SCRAPE_QUEUE_SIZE", 2), \
+             patch("src.pipeline.lead_pipeline.db.get_existing_external_ids", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.db.get_prospect_emails", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.db.get_org_numbers_by_names", return_value={}), \
+             patch("src.pipeline.lead_pipeline.db.mark_postings_processed"), \
+             patch("src.pipeline.lead_pipeline.scrape_finn", return_value=finn), \
+             patch("src.pipeline.lead_pipeline.scrape_nav", return_value=nav), \
+             patch.object(pipeline, "_store_postings", side_effect=store or self._store), \
+             patch.object(pipeline, "_process_posting",
+                          side_effect=process or (lambda p, browser=None: processed.append(p["id"]))):
+            pipeline._scrape_and_process(list(keywords), backlog=list(backlog))
+        return processed, bm
+
+    def test_new_postings_processed_once(self):
+        pipeline = self._pipeline()
+        finn = iter([{"url": f"https://a/{i}", "company_name": "A"} for i in range(1, 21)])
+        nav = iter([{"url": "https://a/3", "company_name": "A"}, {"url": "https://b/known", "company_name": "B"},
+                    {"url": "https://b/30", "company_name": "B"}])
+        processed, bm = self._run(pipeline, finn, nav)
+        assert sorted(processed) == list(range(1, 21)) + [30]
+        assert pipeline._stats["postings_scraped"] == 22
+        assert sum(pipeline._stats["postings_by_source"].values()) == 22
+        assert bm.call_count == 5  # one browser per source and per worker
+
+    def test_backlog_processed_with_new_postings(self):
+        pipeline = self._pipeline()
+        backlog = [{"id": 100, "company_name": "Old"}, {"id": 101, "company_name": "Old"}]
+        processed, _ = self._run(pipeline, iter([{"url": "https://a/1", "company_name": "A"}]), iter([]),
+                                 backlog=backlog)
+        assert sorted(processed) == [1, 100, 101]
+        assert pipeline._stats["postings_scraped"] == 1
+
+    def test_posting_errors_counted_on_worker_threads(self):
+        import threading
+        pipeline = self._pipeline()
+        seen, threads = [], set()
+
+        def process(posting, browser=None):
+            seen.append(posting["id"])
+            threads.add(threading.get_ident())
+            if posting["id"] == 5:
+                raise RuntimeError("boom")
+
+        finn = iter([{"url": f"https://a/{i}", "company_name": "A"} for i in range(1, 11)])
+        self._run(pipeline, finn, iter([]), process=process)
+        assert sorted(seen) == list(range(1, 11))
+        assert pipeline._stats["errors"] == 1
+        assert threading.get_ident() not in threads and len(threads) <= pipeline.workers
+
+    def test_no_source_browser_when_keywords_run_in_parallel(self):
+        pipeline = self._pipeline()
+        processed, bm = self._run(
+            pipeline, iter([{"url": "https://a/1", "company_name": "A"}]), iter([]), keywords=("laks", "sjømat"),
+        )
+        assert processed == [1]
+        assert bm.call_count == 3  # "bogus" source and the two posting workers
+
+    def test_stored_but_unprocessed_postings_stay_bounded(self):
+        import threading
+        import time
+        pipeline = self._pipeline()
+        lock = threading.Lock()
+        stored, processed, backlog = [0], [0], []
+
+        def store(postings):
+            self._store(postings)
+            with lock:
+                stored[0] += len(postings)
+
+        def process(posting, browser=None):
+            time.sleep(0.001)
+            with lock:
+                processed[0] += 1
+                backlog.append(stored[0] - processed[0])
+
+        finn = iter([{"url": f"https://a/{i}", "company_name": "A"} for i in range(1, 301)])
+        with patch("src.pipeline.lead_pipeline.STORE_BATCH_SIZE", 5), \
+             patch("src.pipeline.lead_pipeline.WORK_QUEUE_PER_WORKER", 2):
+            self._run(pipeline, finn, iter([]), store=store, process=process)
+        assert processed[0] == 300
+        # queued (2 per worker) + in the workers' hands + one stored batch
+        assert max(backlog) <= 2 * 2 + 2 + 5
+
+    def test_dead_workers_stop_the_run(self):
+        pipeline = self._pipeline()
+        finn = iter([{"url": f"https://a/{i}", "company_name": "A"} for i in range(1, 50)])
+        with patch.object(pipeline, "_posting_worker", side_effect=RuntimeError("no browser")), \
+             patch("src.pipeline.lead_pipeline._WORK_POLL_SECONDS", 0.01):
+            with pytest.raises(RuntimeError, match="no browser"):
+                self._run(pipeline, finn, iter([]))
+
+    def test_failed_source_counts_as_error(self):
+        pipeline = self._pipeline()
+
+        def down():
+            yield {"url": "https://a/1", "company_name": "A"}
+            raise RuntimeError("down")
+
+        processed, _ = self._run(pipeline, down(), iter([{"url": "https://b/2", "company_name": "B"}]))
+        assert sorted(processed) == [1, 2]
+        assert pipeline._stats["errors"] == 1
+
+    def test_store_failure_stops_scrapers(self):
+        pipeline = self._pipeline()
+        finn = iter([{"url": f"https://a/{i}", "company_name": "A"} for i in range(1, 1000)])
+        with pytest.raises(RuntimeError):
+            self._run(pipeline, finn, iter([]), store=MagicMock(side_effect=RuntimeError("db")))
+
+
+class TestBrregPreload:
+    """Exact BRREG name matches are loaded once per run."""
+
+    def test_org_numbers_loaded_in_one_query(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id="1", workers=1)
+        postings = [
+            {"id": 1, "company_name": " AquaCorp AS "},
+            {"id": 2, "company_name": "Ukjent AS"},
+            {"id": 3, "company_name": "Ukjent AS"},
+        ]
+        with patch("src.pipeline.lead_pipeline.db.get_org_numbers_by_names",
+                   return_value={"AquaCorp AS": "932814569"}) as query, \
+             patch("src.pipeline.lead_pipeline.db.get_prospect_emails", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.db.mark_postings_processed"), \
+             patch.object(pipeline, "_process_posting"):
+            pipeline._process_postings(postings)
+            assert pipeline._enrich_with_brreg("AquaCorp AS", 1) == "932814569"
+        assert query.call_count == 1
+        assert query.call_args.args[0] == {"AquaCorp AS", "Ukjent AS"}
+        assert pipeline._org_numbers == {"AquaCorp AS": "932814569", "Ukjent AS": None}
+
+
+class TestLookupCaches:
+    """BRREG and Snov.io name lookups are made once per cleaned name per run."""
+
+    def _pipeline(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id="1", workers=1)
+        # No exact local match for the names used below
+        pipeline._org_numbers = {"AquaCorp AS": None, "AquaCorp ASA": None}
+        return pipeline
+
+    def test_domain_search_cached_by_cleaned_name(self):
+        pipeline = self._pipeline()
+        pipeline.snov.find_domain_by_company_name.side_effect = ["aquacorp.no", None]
+        assert pipeline._resolve_domain("AquaCorp AS", {}) == "aquacorp.no"
+        assert pipeline._resolve_domain("AquaCorp", {}) == "aquacorp.no"
+        assert pipeline._resolve_domain("Ukjent AS", {}) is None
+        assert pipeline._resolve_domain("Ukjent AS", {}) is None
+        assert pipeline.snov.find_domain_by_company_name.call_count == 2
+
+    def test_domain_resolved_once_per_company(self):
+        pipeline = self._pipeline()
+        pipeline.snov.find_domain_by_company_name.return_value = None
+        with patch("src.pipeline.lead_pipeline.scrape_company_domain",
+                   side_effect=["aquacorp.no", None]) as scrape:
+            assert pipeline._resolve_domain("AquaCorp AS", {"url": "https://a/1"}) == "aquacorp.no"
+            assert pipeline._resolve_domain("AQUACORP AS", {"url": "https://a/2"}) == "aquacorp.no"
+            assert pipeline._resolve_domain("Ukjent AS", {"url": "https://a/3"}) is None
+            assert pipeline._resolve_domain("Ukjent AS", {"url": "https://a/4"}) is None
+        assert scrape.call_count == 2
+
+    def test_posting_skipped_after_company_failed(self):
+        pipeline = self._pipeline()
+        pipeline._company_domains["ukjent as"] = None
+        with patch.object(pipeline, "_enrich_with_brreg") as enrich:
+            pipeline._process_posting({"id": 3, "company_name": "Ukjent AS"})
+        assert enrich.call_count == 0
+        assert pipeline._stats["errors"] == 1
+
+    def test_contacts_discovered_once_per_domain(self):
+        pipeline = self._pipeline()
+        pipeline._known_emails = set()
+        pipeline.snov.get_domain_email_count.return_value = 0
+        postings = [{"id": i, "company_name": "AquaCorp AS", "company_domain": "aquacorp.no", "org_number": "1"}
+                    for i in (1, 2)]
+        with patch("src.pipeline.lead_pipeline.db.get_cached_contacts", return_value=None), \
+             patch("src.pipeline.lead_pipeline.db.cache_contacts"), \
+             patch("src.pipeline.lead_pipeline.scrape_emails_from_website", return_value=[]) as scrape:
+            for posting in postings:
+                pipeline._process_posting(posting)
+        assert scrape.call_count == 1
+        assert pipeline.snov.get_domain_email_count.call_count == 1
+        assert pipeline._stats["domains_resolved"] == 2
+        with patch("src.pipeline.lead_pipeline.db.update_posting_enrichment_many") as update:
+            pipeline._posting_updates.flush()
+        update.assert_called_once_with([("aquacorp.no", "1", 1), ("aquacorp.no", "1", 2)])
+
+    def test_failed_discovery_releases_domain(self):
+        pipeline = self._pipeline()
+        pipeline._known_emails = set()
+        pipeline.snov.get_domain_email_count.return_value = 0
+        postings = [{"id": i, "company_name": "AquaCorp AS", "company_domain": "aquacorp.no", "org_number": "1"}
+                    for i in (1, 2, 3)]
+        with patch("src.pipeline.lead_pipeline.db.get_cached_contacts", return_value=None), \
+             patch("src.pipeline.lead_pipeline.db.cache_contacts"), \
+             patch("src.pipeline.lead_pipeline.scrape_emails_from_website",
+                   side_effect=[RuntimeError("timeout"), []]) as scrape:
+            with pytest.raises(RuntimeError):
+                pipeline._process_posting(postings[0])
+            pipeline._process_posting(postings[1])
+            pipeline._process_posting(postings[2])
+        assert scrape.call_count == 2
+
+    def test_addresses_missing_from_batch_verified_one_by_one(self):
+        pipeline = self._pipeline()
+        pipeline._known_emails = set()
+        contacts = [{"email": "Ola@AquaCorp.no"}, {"email": "kari@aquacorp.no"}]
+        pipeline.snov.verify_emails.return_value = {"ola@aquacorp.no": "valid"}
+        posting = {"id": 1, "company_name": "AquaCorp AS", "company_domain": "aquacorp.no", "org_number": "1"}
+        with patch("src.pipeline.lead_pipeline.db.get_cached_contacts", return_value=contacts), \
+             patch.object(pipeline, "_process_raw_email") as raw:
+            pipeline._process_posting(posting)
+        assert [(c.args[0], c.kwargs["smtp_status"]) for c in raw.call_args_list] == \
+            [("Ola@AquaCorp.no", "valid"), ("kari@aquacorp.no", None)]
+
+    def test_brreg_api_search_cached_by_cleaned_name(self):
+        pipeline = self._pipeline()
+        pipeline.brreg.search_companies_by_name.return_value = [{"organisasjonsnummer": "932814569"}]
+        with patch.dict("sys.modules", {"rapidfuzz": None}):
+            assert pipeline._enrich_with_brreg("AquaCorp AS", 1) == "932814569"
+            assert pipeline._enrich_with_brreg("AquaCorp ASA", 2) == "932814569"
+        pipeline.brreg.search_companies_by_name.assert_called_once_with("AquaCorp")
+        assert pipeline._stats["brreg_matches"] == 2
+
+
+class TestPostingDedup:
+    """Tests for cross-source posting deduplication keys."""
+
+    def test_normalize_url_drops_tracking_only(self):
+        from src.pipeline.lead_pipeline import _normalize_url
+        assert _normalize_url("https://WWW.finn.no/job/ad/123/?utm_source=x&fbclid=y#top") == \
+            "https://www.finn.no/job/ad/123"
+        # Legacy finn.no ads are identified by a query parameter
+        assert _normalize_url("https://www.finn.no/job/fulltime/ad.html?finnkode=1") != \
+            _normalize_url("https://www.finn.no/job/fulltime/ad.html?finnkode=2")
+
+    def test_posting_key_ignores_case_and_spacing(self):
+        from src.pipeline.lead_pipeline import _posting_key
+        a = {"company_name": "AquaCorp AS", "title": "Fiskehelse  Biolog", "location": "Bergen"}
+        b = {"company_name": "aquacorp as", "title": "Fiskehelse biolog ", "location": "BERGEN"}
+        assert _posting_key(a) == _posting_key(b)
+        assert _posting_key({**a, "location": "Tromsø"}) != _posting_key(a)
+        assert _posting_key({"company_name": "", "title": "Biolog"}) is None
+
+    def test_mirrored_posting_kept_once(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id="1", sources=["finn", "nav"], workers=1)
+        job = {"company_name": "AquaCorp AS", "title": "Biolog", "location": "Bergen"}
+        finn = [{**job, "url": "https://www.finn.no/job/ad/1?utm_source=feed"}, {**job, "url": "https://www.finn.no/job/ad/1"}]
+        nav = [{**job, "url": "https://arbeidsplassen.nav.no/stillinger/stilling/abc"}]
+        with patch("src.pipeline.lead_pipeline.db.get_existing_external_ids", return_value=set()), \
+             patch("src.pipeline.lead_pipeline.scrape_finn", return_value=iter(finn)), \
+             patch("src.pipeline.lead_pipeline.scrape_nav", return_value=iter(nav)):
+            postings = pipeline._scrape_all_sources(["laks"])
+        assert postings == [finn[0]]
+        assert pipeline._stats["postings_by_source"] == {"finn": 1, "nav": 0}
+
+
+class TestKnownEmails:
+    """Email existence checks use the run's preloaded set."""
+
+    def test_known_email_skipped_without_query(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id="1", workers=1)
+        pipeline._known_emails = {"ola@aquacorp.no"}
+        with patch("src.pipeline.lead_pipeline.db.email_exists") as exists:
+            pipeline._process_raw_email("ola@aquacorp.no", "aquacorp.no", 1, {})
+        assert exists.call_count == 0
+        assert pipeline.snov.verify_email.call_count == 0
+        assert pipeline._stats["emails_found"] == 0
+
+    def test_inserted_email_becomes_known(self):
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id=None, workers=1)
+        pipeline._known_emails = set()
+        pipeline.snov.verify_email.return_value = "valid"
+        with patch("src.pipeline.lead_pipeline.db.insert_prospect", return_value=7), \
+             patch("src.pipeline.lead_pipeline.auto_draft_for_new_prospect", return_value=None):
+            pipeline._process_raw_email("kari@aquacorp.no", "aquacorp.no", 1, {})
+        assert pipeline._known_emails == {"kari@aquacorp.no"}
+
+
+class TestSnovListCache:
+    """The Snov.io list id is resolved once per process."""
+
+    def test_list_id_reused_by_later_pipelines(self):
+        from src.pipeline import lead_pipeline
+        with patch.dict(lead_pipeline._snov_list_ids, clear=True), \
+             patch("src.pipeline.lead_pipeline.SnovClient") as snov_cls, \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            snov_cls.return_value.get_user_lists.return_value = [{"name": "Multi-Source Leads", "id": 42}]
+            first = lead_pipeline.LeadPipeline(workers=1)
+            second = lead_pipeline.LeadPipeline(workers=1)
+            first.snov_list_id = second.snov_list_id = None
+            assert first._ensure_snov_list() == "42"
+            assert second._ensure_snov_list() == "42"
+        assert snov_cls.return_value.get_user_lists.call_count == 1
+
+
+class TestFuzzyCompanyMatch:
+    """The companies table is read once per run for fuzzy matching."""
+
+    def test_companies_loaded_once(self):
+        pytest.importorskip("rapidfuzz")
+        from src.pipeline.lead_pipeline import LeadPipeline
+        with patch("src.pipeline.lead_pipeline.SnovClient"), \
+             patch("src.pipeline.lead_pipeline.BRREGClient"):
+            pipeline = LeadPipeline(snov_list_id="1", workers=1)
+        pipeline._org_numbers = {"Lerøy Seafood Group": None, "Lerøy Seafood Grup": None}
+        with patch("src.pipeline.lead_pipeline.db.get_company_org_numbers",
+                   return_value={"Lerøy Seafood Group ASA": "975350940"}) as load:
+            assert pipeline._enrich_with_brreg("Lerøy Seafood Group", 1) == "975350940"
+            assert pipeline._enrich_with_brreg("Lerøy Seafood Grup", 2) == "975350940"
+        assert load.call_count == 1
@@ -0,0 +1,38 @@
+"""
+Tests for the scheduler loop.
+"""
+
+import pytest
+from unittest.mock import patch
+
+import src.scheduler.runner as runner
+
+
+class _Stop(Exception):
+    pass
+
+
+def _run_loop(idle_values):
+    """Run run_schedule_forever until it has slept len(idle_values) times; return the sleeps."""
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == len(idle_values):
+            raise _Stop
+
+    with patch.object(runner.schedule, "run_pending") as run_pending, \
+         patch.object(runner.schedule, "idle_seconds", side_effect=idle_values), \
+         patch.object(runner.time, "sleep", side_effect=fake_sleep):
+        with pytest.raises(_Stop):
+            runner.run_schedule_forever()
+    assert run_pending.call_count == len(idle_values)
+    return sleeps
+
+
+def test_sleeps_until_next_job():
+    assert _run_loop([120.5, -3.0]) == [120.5, 1]
+
+
+def test_sleep_capped_and_no_jobs():
+    assert _run_loop([86000.0, None]) == [runner.MAX_IDLE_SECONDS, runner.MAX_IDLE_SECONDS]
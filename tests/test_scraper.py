@@ -64,3 +64,52 @@ def test_scrape_all_keywords_deduplicates():
     # deduplication should result in exactly 1 item
     assert len(results) == 1
     assert results[0]["finn_id"] == "111"
+
+
+def test_scrape_all_keywords_in_parallel():
+    """With workers > 1 every keyword is scraped on a worker thread's own browser."""
+    def fake_scrape(keyword, browser=None, **kwargs):
+        return iter([
+            {"finn_id": keyword, "keyword_matched": keyword},
+            {"finn_id": "shared", "keyword_matched": keyword},
+        ])
+
+    with patch("src.scraper.finn_scraper.scrape_keyword", side_effect=fake_scrape) as mock_scrape, \
+         patch("src.scraper.browser_manager.BrowserManager") as mock_bm:
+        results = list(scrape_all_keywords(["a", "b", "c"], browser=object(), workers=2))
+
+    assert sorted(r["finn_id"] for r in results) == ["a", "b", "c", "shared"]
+    assert all("scraped_at" in r for r in results)
+    assert mock_bm.call_count == 2
+    browsers = {c.kwargs["browser"] for c in mock_scrape.call_args_list}
+    assert browsers == {mock_bm.return_value.__enter__.return_value.browser}
+
+
+def test_scrape_all_keywords_in_parallel_reraises_errors():
+    with patch("src.scraper.finn_scraper.scrape_keyword", side_effect=RuntimeError("boom")), \
+         patch("src.scraper.browser_manager.BrowserManager"):
+        with pytest.raises(RuntimeError):
+            list(scrape_all_keywords(["a", "b"], workers=2))
+
+
+def test_scrape_keywords_in_parallel_stops_when_consumer_closes():
+    """Keyword threads wait on the bounded buffer and exit once the caller stops reading."""
+    import itertools
+    from src.scraper import browser_manager
+
+    produced = []
+
+    def endless(keyword, browser=None, **kwargs):
+        for i in itertools.count():
+            produced.append(i)
+            yield {"finn_id": f"{keyword}-{i}"}
+
+    with patch("src.scraper.browser_manager.BrowserManager"), \
+         patch.object(browser_manager, "KEYWORD_RESULTS_SIZE", 2), \
+         patch.object(browser_manager, "_PUT_POLL_SECONDS", 0.01):
+        postings = browser_manager.scrape_keywords_in_parallel(endless, ["a", "b"], workers=2)
+        first = [next(postings) for _ in range(3)]
+        postings.close()  # joins the keyword threads
+
+    assert len(first) == 3
+    assert len(produced) <= 3 + 2 + 2  # read, buffered, and one blocked put per thread
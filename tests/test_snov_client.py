@@ -82,6 +82,22 @@ def test_verify_email(client):
         assert status == "valid"
 
 
+def test_verify_emails_uses_one_task(client):
+    with patch("requests.post") as mock_post, patch("requests.get") as mock_get:
+        mock_post.return_value = mock_response({"data": {"task_hash": "ver123"}})
+        mock_get.return_value = mock_response({
+            "status": "complete",
+            "data": [
+                {"email": "a@corp.no", "result": {"smtp_status": "valid"}},
+                {"email": "b@corp.no", "result": {"smtp_status": "not_valid"}},
+            ],
+        })
+        statuses = client.verify_emails(["a@corp.no", "b@corp.no"])
+        assert statuses == {"a@corp.no": "valid", "b@corp.no": "not_valid"}
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs["json"] == {"emails": ["a@corp.no", "b@corp.no"]}
+
+
 def test_get_domain_email_count(client):
     with patch("requests.post") as mock_post:
         mock_post.return_value = mock_response({"data": {"total": 12}})
@@ -99,9 +99,8 @@ class TestScrapeEmailsFromWebsite:
 
     def test_returns_list_of_dicts(self):
         """Result must be list of dicts with email, title, name keys."""
-        with patch("src.scraper.website_scraper.sync_playwright") as mock_pw:
-            mock_browser = MagicMock()
-            mock_pw.return_value.__enter__.return_value.chromium.launch.return_value = mock_browser
+        with patch("src.scraper.website_scraper.thread_browser") as thread_browser:
+            mock_browser = thread_browser.return_value
             mock_ctx = MagicMock()
             mock_browser.new_context.return_value = mock_ctx
             mock_page = MagicMock()
@@ -122,9 +121,8 @@ class TestScrapeEmailsFromWebsite:
                 assert "name" in item
 
     def test_noreply_filtered_out(self):
-        with patch("src.scraper.website_scraper.sync_playwright") as mock_pw:
-            mock_browser = MagicMock()
-            mock_pw.return_value.__enter__.return_value.chromium.launch.return_value = mock_browser
+        with patch("src.scraper.website_scraper.thread_browser") as thread_browser:
+            mock_browser = thread_browser.return_value
             mock_ctx = MagicMock()
             mock_browser.new_context.return_value = mock_ctx
             mock_page = MagicMock()
@@ -139,9 +137,8 @@ class TestScrapeEmailsFromWebsite:
             assert "noreply@testco.no" not in emails
 
     def test_title_captured_from_context(self):
-        with patch("src.scraper.website_scraper.sync_playwright") as mock_pw:
-            mock_browser = MagicMock()
-            mock_pw.return_value.__enter__.return_value.chromium.launch.return_value = mock_browser
+        with patch("src.scraper.website_scraper.thread_browser") as thread_browser:
+            mock_browser = thread_browser.return_value
             mock_ctx = MagicMock()
             mock_browser.new_context.return_value = mock_ctx
             mock_page = MagicMock()